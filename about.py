@@ -22,10 +22,7 @@ import pyexcel
 
 from pprint         import pprint
 
-from music21_globals  import SCORE_DATAPATH
 from music21_globals  import SCORE_LOGPATH
-from music21_globals  import unpickle_it
-from music21_globals  import pickle_it
 from music21_globals  import access_metadata
 from music21_globals  import define_corpus
 
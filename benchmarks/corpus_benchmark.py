@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Song Search Build Benchmark
+written by: Song Search contributors
+created on: 18 October 2026
+
+Time every stage of the build on a synthetic corpus (see synthetic_corpus.py), so runs can be compared on any machine:
+
+    Metadata Cache              build_metadata_cache(), which Music21 does by parsing every score
+    Score File Info             score_file_info()
+    Parse / Walk / Fast Walk    each score's stream, its Music21 walk, and its fast_xml walk, the first time they are asked for
+    <module>.<extractor>        each extractor of analyze_entry(), in its order, over every score (streams and walks already made)
+    Build                       x_load_data.score_dictionary(), with the parse cache emptied first
+    Build (Warm)                the same again, with the parse cache full
+    Pickle / Unpickle           pickle_it() and unpickle_it() of the whole Score Dictionary, without the text log
+    Update (No Change)          update_metadata_cache() with nothing changed
+    Update (Changed)            update_metadata_cache() after rewriting some scores and adding as many new ones
+
+The corpus is written under a scratch home directory which replaces HOME, so score_paths.py (and Music21's settings) point into it and
+the real Score Library is never touched.  That is why the Song Search modules are only imported once it is in place.
+
+The results go to a JSON file (benchmarks/results/ unless --output is given).  --compare prints each timing against an earlier file.
+
+    python benchmarks/corpus_benchmark.py [--scores 50] [--parts 2] [--measures 32] [--ties 0.1] [--slurs 0.1] [--chords 0.5]
+                                          [--lyrics 0.5] [--repeats 0.1] [--seed 1] [--changes 5] [--workers 1]
+                                          [--output results.json] [--compare old.json] [--home directory]
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import contextlib
+
+from pathlib    import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_corpus   import CorpusSettings
+from synthetic_corpus   import generate_corpus
+from synthetic_corpus   import score_xml
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+RESULTS_PATH        = Path(__file__).resolve().parent.joinpath('results')
+
+# The extractors of x_load_data.analyze_entry(), in its order.  key_signature and time_signature also take the metadata.
+EXTRACTORS          = [('other_data', 'number_of_parts'), ('other_data', 'measure_length'), ('other_data', 'repeats'),
+                       ('other_data', 'lyrics'), ('other_data', 'chords_symbols'), ('other_data', 'slurs'),
+                       ('pitch_data', 'key_signature'), ('pitch_data', 'find_clef'), ('pitch_data', 'melody_range'),
+                       ('pitch_data', 'letter_names'), ('pitch_data', 'solfege_names'), ('pitch_data', 'intervals'),
+                       ('rhythm_data', 'time_signature'), ('rhythm_data', 'meter'), ('rhythm_data', 'value_list'),
+                       ('rhythm_data', 'anacrusis'), ('rhythm_data', 'ties')]
+
+METADATA_EXTRACTORS = {'key_signature', 'time_signature'}
+
+# Pickle and unpickle are quick, so take the best of a few runs.
+PICKLE_REPEATS      = 3
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def timed(function, *args, repeat=1, **kwargs):
+    """
+    The best time of repeat calls, in seconds, and the last result.
+    """
+    best, result = None, None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, result
+#
+#-----------------------------------------------------------------------------------------------
+def quietly(function, *args, **kwargs):
+    """
+    Call function with its printing (score_dictionary() pretty prints the whole Score Dictionary) and Music21's warnings thrown away.
+    """
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        return function(*args, **kwargs)
+#
+#-----------------------------------------------------------------------------------------------
+def change_corpus(corpus_path, settings, changes):
+    """
+    Rewrite the first changes scores with new music and add as many new ones, for update_metadata_cache() to find.
+    """
+    rng = random.Random(settings.seed + 1)
+    titles = sorted(Path(corpus_path).glob('*.musicxml'))[:changes]
+
+    for next_path in titles:
+        next_path.write_text(score_xml(rng, next_path.stem, settings), encoding='utf-8')
+
+    for n in range(1, changes + 1):
+        Path(corpus_path).joinpath(f'Synthetic Added {n:04d}.musicxml').write_text(score_xml(rng, f'Synthetic Added {n:04d}', settings),
+                                                                                   encoding='utf-8')
+#
+#-----------------------------------------------------------------------------------------------
+def forget_parsed(parse_path):
+    """
+    Empty the parse cache on disk and every in-process cache of streams and walks, so the next parse is a cold one.
+    """
+    import score_walk
+    from stream_cache import clear_stream_cache
+
+    shutil.rmtree(parse_path, ignore_errors=True)
+    clear_stream_cache()
+    score_walk._LAST_WALK.update({'Stream': None, 'Walk': None})
+    score_walk._LAST_FAST.update({'Key': None, 'Walk': None})
+#
+#-----------------------------------------------------------------------------------------------
+def time_extractors(dictionary, the_metadata):
+    """
+    Run analyze_entry()'s extractors over every score and total the time of each.  Every score is parsed and walked first, on their
+    own clocks, so an extractor's time is only its own work.
+    """
+    import importlib
+    from score_walk     import score_walk
+    from score_walk     import fast_score_walk
+    from stream_cache   import score_stream
+
+    extractors = [(f'{module}.{name}', getattr(importlib.import_module(module), name), name in METADATA_EXTRACTORS)
+                  for module, name in EXTRACTORS]
+    timings = dict.fromkeys(['Parse', 'Walk', 'Fast Walk'] + [label for label, extractor, needs_metadata in extractors], 0.0)
+
+    for next_score in dictionary:
+        dictionary[next_score].update({'Other': {}, 'Pitch': {}, 'Rhythm': {}})
+
+        timings['Parse'] += timed(score_stream, dictionary, next_score)[0]
+        timings['Walk'] += timed(score_walk, dictionary, next_score)[0]
+        timings['Fast Walk'] += timed(fast_score_walk, dictionary[next_score]['File Information']['Path'])[0]
+
+        for label, extractor, needs_metadata in extractors:
+            if needs_metadata:
+                timings[label] += timed(quietly, extractor, dictionary, the_metadata, next_score)[0]
+            else:
+                timings[label] += timed(quietly, extractor, dictionary, next_score)[0]
+
+    return timings
+#
+#-----------------------------------------------------------------------------------------------
+def run_benchmark(settings, workers=1, changes=5):
+    """
+    Time every stage on a corpus made with the given settings.  HOME must already point at the scratch home.  Returns the timings.
+    """
+    import music21_globals
+    import x_load_data
+    from score_paths    import CORPUS_FILEPATH
+    from score_paths    import SCORE_DATAPATH
+    from score_paths    import SCORE_LOGPATH
+    from score_paths    import CACHE_FILEPATH
+    from score_paths    import PARSED_CACHEPATH
+
+    generate_corpus(CORPUS_FILEPATH, settings)
+    for next_directory in (SCORE_DATAPATH.parent, SCORE_LOGPATH.parent, CACHE_FILEPATH):
+        os.makedirs(next_directory, exist_ok=True)
+    timings = {}
+
+    quietly(music21_globals.define_corpus)
+    timings['Metadata Cache'] = timed(quietly, music21_globals.build_metadata_cache)[0]
+    timings['Score File Info'], dictionary = timed(quietly, music21_globals.score_file_info)
+
+    forget_parsed(PARSED_CACHEPATH)
+    timings.update(time_extractors(dictionary, music21_globals.metadata_index()))
+
+    forget_parsed(PARSED_CACHEPATH)
+    timings['Build'], dictionary = timed(quietly, x_load_data.score_dictionary, workers=workers)
+    timings['Build (Warm)'] = timed(quietly, x_load_data.score_dictionary, workers=workers)[0]
+
+    timings['Pickle'] = timed(music21_globals.pickle_it, dictionary, pickle_path=SCORE_DATAPATH, repeat=PICKLE_REPEATS)[0]
+    timings['Unpickle'] = timed(music21_globals.unpickle_it, pickle_path=SCORE_DATAPATH, repeat=PICKLE_REPEATS)[0]
+
+    timings['Update (No Change)'] = timed(quietly, music21_globals.update_metadata_cache, workers=workers)[0]
+    change_corpus(CORPUS_FILEPATH, settings, changes)
+    timings['Update (Changed)'] = timed(quietly, music21_globals.update_metadata_cache, workers=workers)[0]
+
+    return timings
+#
+#-----------------------------------------------------------------------------------------------
+def save_results(timings, settings, workers, changes, output_path=None):
+    """
+    Write the timings, with the settings and the machine they came from, as JSON.  Returns the path written.
+    """
+    import music21
+
+    output_path = Path(output_path or RESULTS_PATH.joinpath(time.strftime('build-%Y%m%d-%H%M%S.json')))
+    os.makedirs(output_path.parent, exist_ok=True)
+
+    results = {'Date':      time.strftime('%Y-%m-%d %H:%M:%S'),
+               'Machine':   platform.platform(),
+               'Python':    platform.python_version(),
+               'Music21':   music21.__version__,
+               'Settings':  dict(settings._asdict(), workers=workers, changes=changes),
+               'Timings':   timings}
+
+    output_path.write_text(json.dumps(results, indent=1), encoding='utf-8')
+
+    return output_path
+#
+#-----------------------------------------------------------------------------------------------
+def print_results(timings, old_timings=None):
+    """
+    One line per timing, with the ratio to an earlier run if there is one (over 1 is slower).
+    """
+    for label, seconds in timings.items():
+        line = f'{label:<32}{seconds * 1e3:>12.1f} ms'
+        if old_timings and old_timings.get(label):
+            line += f'{seconds / old_timings[label]:>10.2f}x'
+        print(line)
+
+#                                           MAIN
+#-----------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Time the Song Search build on a synthetic corpus.')
+    for next_field, default in CorpusSettings._field_defaults.items():
+        parser.add_argument(f'--{next_field}', type=type(default), default=default)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--changes', type=int, default=5, help='scores rewritten (and added) before the second update')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/build-<date>.json)')
+    parser.add_argument('--compare', help='an earlier results file to compare with')
+    parser.add_argument('--home', help='scratch home directory (default: a new temporary one, removed afterwards)')
+    arguments = parser.parse_args()
+
+    settings = CorpusSettings(**{next_field: getattr(arguments, next_field) for next_field in CorpusSettings._fields})
+    scratch_home = arguments.home or tempfile.mkdtemp(prefix='song_search_benchmark_')
+    os.environ['HOME'] = scratch_home
+
+    try:
+        timings = run_benchmark(settings, workers=arguments.workers, changes=arguments.changes)
+    finally:
+        if not arguments.home:
+            shutil.rmtree(scratch_home, ignore_errors=True)
+
+    old_timings = json.loads(Path(arguments.compare).read_text(encoding='utf-8'))['Timings'] if arguments.compare else None
+    print_results(timings, old_timings)
+    print(f'\nSaved to {save_results(timings, settings, arguments.workers, arguments.changes, arguments.output)}')
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Song Search Metadata Lookup Benchmark
+written by: Song Search contributors
+created on: 18 October 2026
+
+Show how the cost of finding one score's metadata grows with the size of the corpus.
+
+    scan:   the old lookup in key_signature() and time_signature(), a loop over range(len(bundle)) comparing sourcePaths
+    index:  find_metadata() against the index from metadata_index()
+
+The bundles are built in memory with empty metadata, so no corpus or metadata cache is needed.
+
+    python benchmarks/metadata_lookup.py [sizes...]
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import sys
+import time
+
+from pathlib    import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from music21            import metadata
+
+from music21_globals    import metadata_index
+from music21_globals    import find_metadata
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+CORPUS_SIZES        = [250, 500, 1000, 2000, 4000]
+
+# The scan is quadratic, so only time a handful of lookups on it.
+SCAN_LOOKUPS        = 5
+INDEX_LOOKUPS       = 10000
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def fake_bundle(size):
+    """
+    Build a MetadataBundle of the given size whose entries only carry a sourcePath.
+    """
+    the_bundle = metadata.bundles.MetadataBundle()
+
+    for n in range(size):
+        score_path = f'/corpus/all_musicxml/Song {n}.musicxml'
+        payload = metadata.RichMetadata()
+        payload.sourcePath = score_path
+        the_bundle._metadataEntries[the_bundle.corpusPathToKey(score_path)] = metadata.bundles.MetadataEntry(sourcePath=score_path,
+                                                                                                              metadataPayload=payload)
+
+    return the_bundle
+#
+#-----------------------------------------------------------------------------------------------
+def scan_lookup(the_bundle, score_path):
+    """
+    The lookup the extractors used to do.
+    """
+    for x in range(len(the_bundle)):
+        if the_bundle[x].metadata.sourcePath == score_path:
+            return the_bundle[x].metadata
+#
+#-----------------------------------------------------------------------------------------------
+def time_lookups(lookup, the_metadata, paths):
+    """
+    Average seconds per lookup.
+    """
+    start = time.perf_counter()
+    for next_path in paths:
+        lookup(the_metadata, next_path)
+
+    return (time.perf_counter() - start) / len(paths)
+#
+#-----------------------------------------------------------------------------------------------
+def run_benchmark(sizes=CORPUS_SIZES):
+    """
+    Time both lookups for each corpus size and return one row per size.
+    """
+    results = []
+
+    for size in sizes:
+        the_bundle = fake_bundle(size)
+
+        # Look up scores from the end of the bundle, the worst case for the scan.
+        paths = [f'/corpus/all_musicxml/Song {size - 1 - n % size}.musicxml' for n in range(INDEX_LOOKUPS)]
+
+        start = time.perf_counter()
+        the_index = metadata_index(the_bundle)
+        build_time = time.perf_counter() - start
+
+        results.append({'Scores': size,
+                        'Scan': time_lookups(scan_lookup, the_bundle, paths[:SCAN_LOOKUPS]),
+                        'Index': time_lookups(find_metadata, the_index, paths),
+                        'Index Build': build_time})
+
+    return results
+
+#                                           MAIN
+#-----------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    sizes = [int(n) for n in sys.argv[1:]] or CORPUS_SIZES
+
+    print(f"{'Scores':>8}  {'scan / lookup':>14}  {'index / lookup':>15}  {'index build':>12}  {'full build, scan':>17}")
+    for row in run_benchmark(sizes):
+        # A full build looks up every score twice (key_signature and time_signature).
+        print(f"{row['Scores']:>8}  {row['Scan'] * 1e3:>11.3f} ms  {row['Index'] * 1e6:>12.3f} us  {row['Index Build'] * 1e3:>9.2f} ms"
+              f"  {row['Scan'] * row['Scores'] * 2:>15.1f} s")
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Song Search Synthetic Corpus
+written by: Song Search contributors
+created on: 18 October 2026
+
+Write a corpus of made-up MusicXML scores, so the build can be measured without the Score Library.  The same settings and seed always
+give the same files.
+
+    CorpusSettings(scores=100, parts=2, measures=32, ties=0.1, slurs=0.1, chords=0.5, lyrics=0.5, repeats=0.1, seed=1)
+    generate_corpus(directory, settings)            -> [paths written]
+
+The densities are probabilities: ties, slurs, and lyrics per note (lyrics only in the first part), chords (chord symbols) per measure,
+and repeats per measure, where a section ends in a repeat barline.  Each score gets a random key, time signature (2/4, 3/4, 4/4, or
+6/8), and tonic-centred random-walk melody in every part, with some rests.
+
+    python benchmarks/synthetic_corpus.py directory [scores]
+
+Standard library only.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import sys
+import random
+
+from collections    import namedtuple
+from xml.sax.saxutils import escape
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+CorpusSettings      = namedtuple('CorpusSettings', 'scores parts measures ties slurs chords lyrics repeats seed',
+                                 defaults=(100, 2, 32, 0.1, 0.1, 0.5, 0.5, 0.1, 1))
+
+# Divisions per quarter note.  A sixteenth is the shortest value.
+DIVISIONS           = 4
+
+# Note values as (duration in divisions, type, dotted).
+NOTE_VALUES         = [(16, 'whole', False), (12, 'half', True), (8, 'half', False), (6, 'quarter', True), (4, 'quarter', False),
+                       (3, 'eighth', True), (2, 'eighth', False), (1, '16th', False)]
+
+# How often each value is picked, when it fits in the measure.
+VALUE_WEIGHTS       = {16: 1, 12: 1, 8: 3, 6: 2, 4: 8, 3: 1, 2: 6, 1: 2}
+
+TIME_SIGNATURES     = [(2, 4), (3, 4), (4, 4), (6, 8)]
+
+STEPS               = ['C', 'D', 'E', 'F', 'G', 'A', 'B']
+SHARP_ORDER         = ['F', 'C', 'G', 'D', 'A', 'E', 'B']
+
+# (clef sign, line, middle of the part's range as a diatonic step number, octave * 7 + step).
+TREBLE              = ('G', 2, 4 * 7 + 6)
+BASS                = ('F', 4, 3 * 7 + 1)
+
+CHORD_KINDS         = ['major', 'minor', 'dominant', 'major-seventh', 'minor-seventh']
+
+SYLLABLES           = ['la', 'lu', 'do', 're', 'mi', 'so', 'ti', 'hey', 'oh', 'sing', 'the', 'night']
+
+REST_CHANCE         = 0.08
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def key_alters(fifths):
+    """
+    The alteration of each letter in a major key with the given number of sharps (or flats if negative).
+    """
+    alters = dict.fromkeys(STEPS, 0)
+
+    for next_step in (SHARP_ORDER[:fifths] if fifths > 0 else SHARP_ORDER[::-1][:-fifths]):
+        alters[next_step] = 1 if fifths > 0 else -1
+
+    return alters
+#
+#-----------------------------------------------------------------------------------------------
+def measure_values(rng, measure_length):
+    """
+    Random note values which fill one measure exactly.
+    """
+    values, remaining = [], measure_length
+
+    while remaining:
+        fitting = [next_value for next_value in NOTE_VALUES if next_value[0] <= remaining]
+        values.append(rng.choices(fitting, weights=[VALUE_WEIGHTS[next_value[0]] for next_value in fitting])[0])
+        remaining -= values[-1][0]
+
+    return values
+#
+#-----------------------------------------------------------------------------------------------
+def note_xml(value, pitch, alters, tie=(), slur=None, lyric=None, rest=False):
+    """
+    One <note>.  pitch is a diatonic step number (octave * 7 + step); tie holds 'stop' and/or 'start'; slur is 'start' or 'stop'.
+    """
+    duration, note_type, dotted = value
+    lines = ['<note>']
+
+    if rest:
+        lines.append('<rest/>')
+    else:
+        step = STEPS[pitch % 7]
+        alter = f'<alter>{alters[step]}</alter>' if alters[step] else ''
+        lines.append(f'<pitch><step>{step}</step>{alter}<octave>{pitch // 7}</octave></pitch>')
+
+    lines.append(f'<duration>{duration}</duration>')
+    lines.extend(f'<tie type="{next_tie}"/>' for next_tie in tie)
+    lines.append('<voice>1</voice>')
+    lines.append(f'<type>{note_type}</type>')
+    if dotted:
+        lines.append('<dot/>')
+
+    notations = [f'<tied type="{next_tie}"/>' for next_tie in tie]
+    if slur:
+        notations.append(f'<slur type="{slur}" number="1"/>')
+    if notations:
+        lines.append(f'<notations>{"".join(notations)}</notations>')
+
+    if lyric:
+        lines.append(f'<lyric number="1"><syllabic>single</syllabic><text>{escape(lyric)}</text></lyric>')
+
+    lines.append('</note>')
+    return ''.join(lines)
+#
+#-----------------------------------------------------------------------------------------------
+def harmony_xml(rng, fifths):
+    """
+    A <harmony> chord symbol on a random degree of the key.
+    """
+    root = rng.randrange(7)
+    step = STEPS[(STEPS.index(tonic_step(fifths)) + root) % 7]
+    alter = key_alters(fifths)[step]
+    root_alter = f'<root-alter>{alter}</root-alter>' if alter else ''
+
+    return f'<harmony><root><root-step>{step}</root-step>{root_alter}</root><kind>{rng.choice(CHORD_KINDS)}</kind></harmony>'
+#
+#-----------------------------------------------------------------------------------------------
+def tonic_step(fifths):
+    """
+    The letter of the tonic of the major key with the given number of sharps or flats.
+    """
+    return STEPS[(4 * fifths) % 7]
+#
+#-----------------------------------------------------------------------------------------------
+def part_xml(rng, part_number, settings, fifths, time_signature, repeat_ends):
+    """
+    One <part>: a random walk around the part's clef, with the ties, slurs, chord symbols, lyrics, and repeats of the settings.
+    """
+    clef_sign, clef_line, centre = TREBLE if part_number == 0 or part_number % 2 == 0 and part_number != settings.parts - 1 else BASS
+    alters = key_alters(fifths)
+    measure_length = time_signature[0] * DIVISIONS * 4 // time_signature[1]
+    tonic = STEPS.index(tonic_step(fifths))
+
+    pitch = centre - (centre % 7) + tonic
+    tie_open, slur_left = False, 0
+    measures = []
+
+    for number in range(1, settings.measures + 1):
+        lines = [f'<measure number="{number}">']
+
+        if number == 1:
+            lines.append(f'<attributes><divisions>{DIVISIONS}</divisions><key><fifths>{fifths}</fifths><mode>major</mode></key>'
+                         f'<time><beats>{time_signature[0]}</beats><beat-type>{time_signature[1]}</beat-type></time>'
+                         f'<clef><sign>{clef_sign}</sign><line>{clef_line}</line></clef></attributes>')
+
+        # A section starts the score or follows a repeat, and is repeated if a repeat ends it.
+        if (number == 1 or number - 1 in repeat_ends) and any(end >= number for end in repeat_ends):
+            lines.append('<barline location="left"><bar-style>heavy-light</bar-style><repeat direction="forward"/></barline>')
+
+        if part_number == 0 and rng.random() < settings.chords:
+            lines.append(harmony_xml(rng, fifths))
+
+        values = measure_values(rng, measure_length)
+        for i, next_value in enumerate(values):
+            last_note = number == settings.measures and i == len(values) - 1
+
+            # A tied or slurred note is never a rest, and a tied one keeps its pitch.
+            tie = ('stop',) if tie_open else ()
+            rest = not tie_open and not slur_left and rng.random() < REST_CHANCE
+            if not tie_open:
+                pitch = min(max(pitch + rng.choice([-2, -1, -1, 0, 1, 1, 2]), centre - 6), centre + 6)
+
+            tie_open = not rest and not last_note and rng.random() < settings.ties
+            if tie_open:
+                tie += ('start',)
+
+            slur = None
+            if slur_left:
+                slur_left -= 1
+                if slur_left == 0 or last_note:
+                    slur, slur_left = 'stop', 0
+            elif not rest and not last_note and rng.random() < settings.slurs:
+                slur, slur_left = 'start', rng.randint(1, 3)
+
+            lyric = rng.choice(SYLLABLES) if part_number == 0 and not rest and 'stop' not in tie and rng.random() < settings.lyrics else None
+
+            lines.append(note_xml(next_value, pitch, alters, tie, slur, lyric, rest))
+
+        if number in repeat_ends:
+            lines.append('<barline location="right"><bar-style>light-heavy</bar-style><repeat direction="backward"/></barline>')
+
+        lines.append('</measure>')
+        measures.append(''.join(lines))
+
+    return f'<part id="P{part_number + 1}">' + '\n'.join(measures) + '</part>'
+#
+#-----------------------------------------------------------------------------------------------
+def score_xml(rng, title, settings):
+    """
+    The text of one synthetic score.
+    """
+    fifths = rng.randint(-4, 4)
+    time_signature = rng.choice(TIME_SIGNATURES)
+    repeat_ends = {number for number in range(2, settings.measures + 1) if rng.random() < settings.repeats}
+
+    part_list = ''.join(f'<score-part id="P{n + 1}"><part-name>Part {n + 1}</part-name></score-part>' for n in range(settings.parts))
+    parts = '\n'.join(part_xml(rng, n, settings, fifths, time_signature, repeat_ends) for n in range(settings.parts))
+
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<!DOCTYPE score-partwise PUBLIC "-//Recordare//DTD MusicXML 3.1 Partwise//EN" '
+            '"http://www.musicxml.org/dtds/partwise.dtd">\n'
+            f'<score-partwise version="3.1"><work><work-title>{escape(title)}</work-title></work>'
+            '<identification><creator type="composer">Synthetic Corpus</creator></identification>'
+            f'<part-list>{part_list}</part-list>\n{parts}\n</score-partwise>\n')
+#
+#-----------------------------------------------------------------------------------------------
+def generate_corpus(directory, settings=None):
+    """
+    Write settings.scores synthetic scores ('Synthetic 0001.musicxml', ...) into directory.  Returns their paths.
+    """
+    settings = settings or CorpusSettings()
+    rng = random.Random(settings.seed)
+    os.makedirs(directory, exist_ok=True)
+
+    paths = []
+    for n in range(1, settings.scores + 1):
+        title = f'Synthetic {n:04d}'
+        paths.append(os.path.join(directory, f'{title}.musicxml'))
+        with open(paths[-1], 'w', encoding='utf-8') as the_file:
+            the_file.write(score_xml(rng, title, settings))
+
+    return paths
+
+#                                           MAIN
+#-----------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+
+    written = generate_corpus(sys.argv[1], CorpusSettings(scores=int(sys.argv[2]) if len(sys.argv) > 2 else 100))
+    print(f'{len(written)} scores written to {sys.argv[1]}')
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Song Search Corpus Scanner
+written by: Song Search contributors
+created on: 18 October 2026
+
+List and stat the score files of the corpus quickly, even on a network-synced (Dropbox) folder where every stat is a round trip.
+Directories are listed with os.scandir, a level of the tree at a time, and the files are stat'ed by a pool of STAT_WORKERS threads.
+DirEntry keeps each stat, so nothing is stat'ed twice.  Scores are .xml and .musicxml files (SCORE_SUFFIXES).
+
+    scan_corpus(corpus_path)        -> {path: os.stat_result} of every score in the tree
+    stat_files(paths)               -> {path: os.stat_result} of some files, skipping any which have gone
+
+Every full scan also saves a path index, {file name: [paths]}, in PATH_INDEXPATH, so a file can be found by name without walking the
+tree:
+
+    find_file(file_name, directory_name)    -> [paths]
+    update_path_index(changed_paths)        add or drop a few paths, e.g. those of a corpus_watcher.py batch
+
+Standard library only.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import json
+import tempfile
+
+from concurrent.futures     import ThreadPoolExecutor
+
+from score_paths            import CORPUS_FILEPATH
+from score_paths            import PATH_INDEXPATH
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+# The files the corpus holds.  Names starting with '.' are editors' and Dropbox's temporary files.
+SCORE_SUFFIXES      = ('.xml', '.musicxml')
+
+# Stats are waits on the file system, not work, so more threads than CPUs still help.
+STAT_WORKERS        = 16
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def is_score_name(name):
+    """
+    Whether a file name is a score's.
+    """
+    name = os.path.basename(str(name or ''))
+
+    return name.lower().endswith(SCORE_SUFFIXES) and not name.startswith('.')
+#
+#-----------------------------------------------------------------------------------------------
+def _list_directory(directory):
+    """
+    The score files (as DirEntries) and the folders directly in a directory.  A directory which has gone, or cannot be read, is empty.
+    """
+    files, folders = [], []
+
+    try:
+        with os.scandir(directory) as entries:
+            for next_entry in entries:
+                if next_entry.is_dir(follow_symlinks=False):
+                    folders.append(next_entry.path)
+                elif is_score_name(next_entry.name) and next_entry.is_file():
+                    files.append(next_entry)
+    except OSError:
+        pass
+
+    return files, folders
+#
+#-----------------------------------------------------------------------------------------------
+def _entry_stat(next_entry):
+    """
+    The stat of a DirEntry, or of a path, or None if the file has gone.
+    """
+    try:
+        return next_entry.stat() if isinstance(next_entry, os.DirEntry) else os.stat(next_entry)
+    except OSError:
+        return None
+#
+#-----------------------------------------------------------------------------------------------
+def list_scores(corpus_path=None, workers=STAT_WORKERS):
+    """
+    The DirEntry of every score file in the tree.  The directories of each level of the tree are listed at the same time.
+    """
+    found, level = [], [str(corpus_path or CORPUS_FILEPATH)]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while level:
+            listings = pool.map(_list_directory, level) if len(level) > 1 else map(_list_directory, level)
+            level = []
+            for files, folders in listings:
+                found += files
+                level += folders
+
+    return found
+#
+#-----------------------------------------------------------------------------------------------
+def stat_files(paths, workers=STAT_WORKERS):
+    """
+    {path: os.stat_result} for DirEntries or paths, stat'ed by a pool of threads.  Files which have gone are left out.
+    """
+    paths = list(paths)
+    if len(paths) < 2 or workers == 1:
+        stats = map(_entry_stat, paths)
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            stats = list(pool.map(_entry_stat, paths))
+
+    return {str(getattr(next_path, 'path', next_path)): the_stat for next_path, the_stat in zip(paths, stats) if the_stat is not None}
+#
+#-----------------------------------------------------------------------------------------------
+def scan_corpus(corpus_path=None, workers=STAT_WORKERS, save_index=True):
+    """
+    {path: os.stat_result} of every score in the tree, sorted by path.  Saves the path index of the corpus unless save_index is False.
+    """
+    corpus_path = str(corpus_path or CORPUS_FILEPATH)
+    stats = dict(sorted(stat_files(list_scores(corpus_path, workers), workers).items()))
+
+    if save_index:
+        write_path_index(build_path_index(stats), corpus_path)
+
+    return stats
+#
+#-----------------------------------------------------------------------------------------------
+def build_path_index(paths):
+    """
+    {file name: [paths]} for a list of paths.
+    """
+    path_index = {}
+    for next_path in paths:
+        path_index.setdefault(os.path.basename(str(next_path)), []).append(str(next_path))
+
+    return path_index
+#
+#-----------------------------------------------------------------------------------------------
+def read_path_index(index_path=None):
+    """
+    The saved path index as (root, {file name: [paths]}), or (None, None) if there is none or it cannot be read.
+    """
+    try:
+        with open(index_path or PATH_INDEXPATH, encoding='utf-8') as the_file:
+            the_index = json.load(the_file)
+        return the_index['Root'], the_index['Names']
+
+    except (OSError, ValueError, KeyError):
+        return None, None
+#
+#-----------------------------------------------------------------------------------------------
+def write_path_index(path_index, root=None, index_path=None):
+    """
+    Replace the saved path index.  It is written to a temporary file first, so a reader never sees half of it.
+    """
+    index_path = str(index_path or PATH_INDEXPATH)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(index_path), suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'w', encoding='utf-8') as the_file:
+            json.dump({'Root': str(root or CORPUS_FILEPATH), 'Names': path_index}, the_file, ensure_ascii=False, indent=0)
+        os.replace(temp_path, index_path)
+
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+#
+#-----------------------------------------------------------------------------------------------
+def update_path_index(changed_paths, index_path=None):
+    """
+    Bring the saved path index up to date for some changed paths: those which are scores on disk are added, the others dropped.  With
+    no saved index the whole corpus is scanned instead.
+    """
+    root, path_index = read_path_index(index_path)
+    if path_index is None:
+        scan_corpus()
+        return
+
+    for next_path in map(str, changed_paths):
+        name = os.path.basename(next_path)
+        paths = [p for p in path_index.get(name, []) if p != next_path]
+        if is_score_name(name) and os.path.isfile(next_path):
+            paths.append(next_path)
+
+        if paths:
+            path_index[name] = sorted(paths)
+        else:
+            path_index.pop(name, None)
+
+    write_path_index(path_index, root, index_path)
+#
+#-----------------------------------------------------------------------------------------------
+def _within(next_path, directory):
+    """
+    Whether a path is in a directory or any folder under it.
+    """
+    return os.path.commonpath([os.path.abspath(next_path), directory]) == directory
+#
+#-----------------------------------------------------------------------------------------------
+def _index_is_stale(root, directory, index_path=None):
+    """
+    Whether the saved path index is older than the corpus root, or the directory searched: adding or removing a file changes its
+    folder's mtime.  Files added deeper in the tree are only seen by corpus_watcher.py (update_path_index()) or the next full scan.
+    """
+    try:
+        index_time = os.stat(index_path or PATH_INDEXPATH).st_mtime_ns
+        return any(os.stat(next_directory).st_mtime_ns > index_time for next_directory in {root, directory})
+
+    except OSError:
+        return True
+#
+#-----------------------------------------------------------------------------------------------
+def find_file(file_name, directory_name=None):
+    """
+    The paths of the files called file_name in directory_name (the corpus by default) or any folder under it.  Inside the corpus this
+    is a lookup in the path index; the corpus is only scanned again if a path in it has gone, or the file is not in it and the index
+    is older than the corpus (see _index_is_stale()).  Anywhere else, or for a file which is not a score, the tree is walked.
+    """
+    directory = os.path.abspath(str(directory_name or CORPUS_FILEPATH))
+
+    # Only scores are indexed.
+    if not is_score_name(file_name):
+        return [os.path.join(path, file_name) for path, subdirs, files in os.walk(directory) if file_name in files]
+
+    root, path_index = read_path_index()
+    if path_index is None or not _within(directory, os.path.abspath(root)):
+        if not _within(directory, os.path.abspath(str(CORPUS_FILEPATH))):
+            return [os.path.join(path, file_name) for path, subdirs, files in os.walk(directory) if file_name in files]
+        root, path_index = str(CORPUS_FILEPATH), build_path_index(scan_corpus())
+
+    files_found = [p for p in path_index.get(file_name, []) if _within(p, directory)]
+    if files_found and all(os.path.isfile(p) for p in files_found):
+        return files_found
+
+    # A name which is not in an up-to-date index is not in the corpus.
+    if not files_found and not _index_is_stale(root, directory):
+        return []
+
+    # The index is out of date.
+    path_index = build_path_index(scan_corpus(root))
+    return [p for p in path_index.get(file_name, []) if _within(p, directory)]
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Song Search Corpus Watcher
+written by: Song Search contributors
+created on: 18 October 2026
+
+Keep the Score Dictionary up to date while the corpus changes, without scanning the corpus directory.  The watcher listens for file
+events in CORPUS_FILEPATH and every folder under it:
+
+    Linux:      inotify (through ctypes), one watch per directory
+    Elsewhere:  a poll of the tree every POLL_SECONDS, comparing each file's size, mtime, and inode with the last poll
+
+Events come in bursts (a Dropbox sync can touch hundreds of files in a few seconds), so they are debounced: a batch is handed on once
+the corpus has been quiet for DEBOUNCE_SECONDS, or MAX_BATCH_SECONDS after its first event, whichever comes first.  Events on the same
+path are merged on the way (written then deleted is nothing, deleted then written is modified), and a file moved within the corpus is
+reported as renamed.
+
+The batches go to a queue which a single thread works through, calling update_metadata_cache(paths=...) with just the paths in the
+batch.  Batches which arrive while an update runs are merged and handled together.  If the kernel drops events (inotify's queue
+overflows, or a whole folder is moved), the next update scans the whole corpus instead.
+
+    python corpus_watcher.py [workers]
+
+Standard library only (plus music21_globals for the updates).
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import sys
+import time
+import queue
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+import traceback
+
+from collections    import namedtuple
+
+from score_paths    import CORPUS_FILEPATH
+from corpus_scanner import is_score_name
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+DEBOUNCE_SECONDS    = 2.0
+MAX_BATCH_SECONDS   = 30.0
+POLL_SECONDS        = 5.0
+
+# inotify flags, from <sys/inotify.h>.
+IN_CLOSE_WRITE      = 0x00000008
+IN_MOVED_FROM       = 0x00000040
+IN_MOVED_TO         = 0x00000080
+IN_CREATE           = 0x00000100
+IN_DELETE           = 0x00000200
+IN_DELETE_SELF      = 0x00000400
+IN_MOVE_SELF        = 0x00000800
+IN_Q_OVERFLOW       = 0x00004000
+IN_IGNORED          = 0x00008000
+IN_ONLYDIR          = 0x01000000
+IN_ISDIR            = 0x40000000
+
+WATCH_MASK          = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+                       | IN_ONLYDIR)
+
+# struct inotify_event: wd, mask, cookie, len, then len bytes of name.
+EVENT_HEADER        = struct.Struct('iIII')
+READ_BYTES          = 64 * 1024
+
+# One debounced batch of changes.  renamed is {old path: new path}; full_scan means events were lost and everything must be checked.
+CorpusBatch         = namedtuple('CorpusBatch', 'added modified deleted renamed full_scan', defaults=(False,))
+
+ADDED               = 'Added'
+MODIFIED            = 'Modified'
+DELETED             = 'Deleted'
+RENAMED             = 'Renamed'
+FULL_SCAN           = 'Full Scan'
+
+# How a path's pending change combines with a new event on it.  A missing pair keeps the new event.
+MERGED_KINDS        = {(ADDED, MODIFIED):       ADDED,
+                       (ADDED, DELETED):        None,
+                       (MODIFIED, ADDED):       MODIFIED,
+                       (DELETED, ADDED):        MODIFIED,
+                       (DELETED, MODIFIED):     MODIFIED}
+
+#                                            CLASSES
+#-----------------------------------------------------------------------------------------------
+class InotifyWatcher:
+    """
+    Events from inotify for a directory tree.  events(timeout) waits up to timeout seconds (None = until something happens) and
+    returns [(kind, path, old path)].
+    """
+    def __init__(self, corpus_path):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        self.directories = {}
+        self._moved_from = {}
+        self.watch_tree(str(corpus_path))
+
+    def watch(self, directory):
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {directory}')
+        self.directories[wd] = directory
+
+    def watch_tree(self, directory):
+        """
+        Watch a directory and every directory under it.  Returns the score files already in it.
+        """
+        found = []
+        self.watch(directory)
+        for next_path, subdirectories, files in os.walk(directory):
+            for next_directory in subdirectories:
+                self.watch(os.path.join(next_path, next_directory))
+            found += [os.path.join(next_path, next_file) for next_file in files]
+
+        return found
+
+    def events(self, timeout=None):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self.fd, READ_BYTES)
+        except BlockingIOError:
+            return []
+
+        found, offset = [], 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0'))
+            offset += EVENT_HEADER.size + length
+            found += self._event(wd, mask, cookie, name)
+
+        # A move out of the corpus has no matching move in.
+        found += [(DELETED, old_path, None) for old_path in self._moved_from.values()]
+        self._moved_from.clear()
+
+        return found
+
+    def _event(self, wd, mask, cookie, name):
+        if mask & IN_Q_OVERFLOW:
+            return [(FULL_SCAN, None, None)]
+
+        if mask & IN_IGNORED or wd not in self.directories:
+            self.directories.pop(wd, None)
+            return []
+
+        next_path = os.path.join(self.directories[wd], name)
+
+        if mask & IN_ISDIR:
+            # A new folder may already hold files by the time it is watched.  A folder moved away takes files nobody was told about.
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    return [(ADDED, found, None) for found in self.watch_tree(next_path)]
+                except OSError:
+                    return [(FULL_SCAN, None, None)]
+            if mask & IN_MOVED_FROM:
+                return [(FULL_SCAN, None, None)]
+            return []
+
+        if mask & IN_MOVED_FROM:
+            self._moved_from[cookie] = next_path
+            return []
+
+        if mask & IN_MOVED_TO:
+            old_path = self._moved_from.pop(cookie, None)
+            return [(RENAMED, next_path, old_path) if old_path else (ADDED, next_path, None)]
+
+        if mask & IN_CREATE:
+            return [(ADDED, next_path, None)]
+
+        if mask & IN_CLOSE_WRITE:
+            return [(MODIFIED, next_path, None)]
+
+        if mask & IN_DELETE:
+            return [(DELETED, next_path, None)]
+
+        return []
+
+    def close(self):
+        os.close(self.fd)
+#
+#-----------------------------------------------------------------------------------------------
+class PollingWatcher:
+    """
+    Events from polling a directory tree every poll_seconds, for systems without inotify.  The same interface as InotifyWatcher.
+    """
+    def __init__(self, corpus_path, poll_seconds=POLL_SECONDS):
+        self.corpus_path = str(corpus_path)
+        self.poll_seconds = poll_seconds
+        self.snapshot = self.scan()
+        self.next_poll = time.monotonic() + poll_seconds
+
+    def scan(self):
+        """
+        {path: (size, mtime_ns, inode)} of every file in the tree, from the DirEntry stats.
+        """
+        snapshot, directories = {}, [self.corpus_path]
+        while directories:
+            try:
+                with os.scandir(directories.pop()) as entries:
+                    for next_entry in entries:
+                        if next_entry.is_dir(follow_symlinks=False):
+                            directories.append(next_entry.path)
+                        elif next_entry.is_file():
+                            the_stat = next_entry.stat()
+                            snapshot[next_entry.path] = (the_stat.st_size, the_stat.st_mtime_ns, next_entry.inode())
+            except OSError:
+                continue
+
+        return snapshot
+
+    def events(self, timeout=None):
+        wait = self.next_poll - time.monotonic()
+        if timeout is not None and timeout < wait:
+            time.sleep(max(timeout, 0))
+            return []
+
+        time.sleep(max(wait, 0))
+        self.next_poll = time.monotonic() + self.poll_seconds
+
+        old, self.snapshot = self.snapshot, self.scan()
+        gone = {old[next_path][2]: next_path for next_path in set(old) - set(self.snapshot)}
+        found = []
+
+        for next_path in self.snapshot.keys() - old.keys():
+            old_path = gone.pop(self.snapshot[next_path][2], None)
+            found.append((RENAMED, next_path, old_path) if old_path else (ADDED, next_path, None))
+
+        found += [(DELETED, old_path, None) for old_path in gone.values()]
+        found += [(MODIFIED, next_path, None) for next_path in self.snapshot.keys() & old.keys() if self.snapshot[next_path] != old[next_path]]
+
+        return found
+
+    def close(self):
+        pass
+#
+#-----------------------------------------------------------------------------------------------
+class Debouncer:
+    """
+    Collect events until the corpus has been quiet for quiet_seconds (or max_seconds have passed since the first), merging the events
+    on each path.  ready() says when to flush() a CorpusBatch.
+    """
+    def __init__(self, quiet_seconds=DEBOUNCE_SECONDS, max_seconds=MAX_BATCH_SECONDS):
+        self.quiet_seconds, self.max_seconds = quiet_seconds, max_seconds
+        self._reset()
+
+    def _reset(self):
+        self.pending, self.renamed, self.full_scan = {}, {}, False
+        self.first_event = self.last_event = None
+
+    def _change(self, kind, next_path):
+        merged = MERGED_KINDS.get((self.pending.get(next_path), kind), kind)
+        if merged is None:
+            del self.pending[next_path]
+        else:
+            self.pending[next_path] = merged
+
+    def add(self, kind, next_path, old_path=None):
+        now = time.monotonic()
+        self.first_event = self.first_event or now
+        self.last_event = now
+
+        if kind == FULL_SCAN:
+            self.full_scan = True
+            return
+
+        # A move into or out of score names (e.g. Dropbox's '.tmp' file renamed into place) is an add or a delete.
+        if kind == RENAMED and not is_score_file(old_path):
+            kind, old_path = ADDED, None
+
+        if not is_score_file(next_path):
+            if kind == RENAMED:
+                self._change(DELETED, old_path)
+            return
+
+        if kind == RENAMED:
+            self._change(DELETED, old_path)
+            self._change(ADDED, next_path)
+            self.renamed[old_path] = next_path
+        else:
+            self._change(kind, next_path)
+
+    def time_left(self):
+        """
+        Seconds until the pending batch is due, or None if nothing is pending.
+        """
+        if self.first_event is None:
+            return None
+
+        due = min(self.last_event + self.quiet_seconds, self.first_event + self.max_seconds)
+        return max(due - time.monotonic(), 0)
+
+    def ready(self):
+        return self.first_event is not None and self.time_left() == 0
+
+    def flush(self):
+        kinds = {ADDED: set(), MODIFIED: set(), DELETED: set()}
+        for next_path, kind in self.pending.items():
+            kinds[kind].add(next_path)
+
+        # Only a move whose two ends survived the merging is reported as a rename.
+        renamed = {old_path: new_path for old_path, new_path in self.renamed.items()
+                   if old_path in kinds[DELETED] and new_path in kinds[ADDED]}
+        kinds[DELETED] -= set(renamed)
+        kinds[ADDED] -= set(renamed.values())
+
+        batch = CorpusBatch(kinds[ADDED], kinds[MODIFIED], kinds[DELETED], renamed, self.full_scan)
+        self._reset()
+
+        return batch
+#
+#-----------------------------------------------------------------------------------------------
+class UpdateQueue:
+    """
+    Run update(batch) on a background thread, one batch at a time.  Batches queued while an update runs are merged into one.
+    """
+    def __init__(self, update):
+        self.update = update
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='corpus updates', daemon=True)
+        self._thread.start()
+
+    def put(self, batch):
+        self._queue.put(batch)
+
+    def _run(self):
+        closed = False
+        while not closed:
+            batch = self._queue.get()
+            while batch is not None:
+                try:
+                    newer = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if newer is None:
+                    # close() was called: the batch gathered so far is still applied.
+                    closed = True
+                    break
+                batch = merge_batches(batch, newer)
+
+            if batch is None:
+                return
+
+            try:
+                self.update(batch)
+            except Exception:
+                traceback.print_exc()
+
+    def close(self):
+        """
+        Finish the queued updates, then stop.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def is_score_file(next_path):
+    """
+    Whether a path is a score the corpus holds (not a folder, temporary file, or anything else).
+    """
+    return is_score_name(next_path)
+#
+#-----------------------------------------------------------------------------------------------
+def merge_batches(older, newer):
+    """
+    One batch with the changes of two consecutive ones.
+    """
+    debouncer = Debouncer()
+    for the_batch in (older, newer):
+        for next_path in the_batch.deleted:
+            debouncer.add(DELETED, next_path)
+        for old_path, new_path in the_batch.renamed.items():
+            debouncer.add(RENAMED, new_path, old_path)
+        for next_path in the_batch.added:
+            debouncer.add(ADDED, next_path)
+        for next_path in the_batch.modified:
+            debouncer.add(MODIFIED, next_path)
+
+    merged = debouncer.flush()
+    return merged._replace(full_scan=older.full_scan or newer.full_scan)
+#
+#-----------------------------------------------------------------------------------------------
+def batch_paths(batch):
+    """
+    Every path a batch touches, both ends of a rename included.
+    """
+    return batch.added | batch.modified | batch.deleted | set(batch.renamed) | set(batch.renamed.values())
+#
+#-----------------------------------------------------------------------------------------------
+def corpus_watcher(corpus_path=None, poll_seconds=POLL_SECONDS):
+    """
+    An InotifyWatcher for the corpus, or a PollingWatcher where inotify is not available (or runs out of watches).
+    """
+    corpus_path = str(corpus_path or CORPUS_FILEPATH)
+
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(corpus_path)
+        except (OSError, AttributeError):
+            pass
+
+    return PollingWatcher(corpus_path, poll_seconds)
+#
+#-----------------------------------------------------------------------------------------------
+def apply_batch(batch, workers=1):
+    """
+    Bring the Score Dictionary up to date with one batch: only its paths are checked, or the whole corpus after lost events.
+    """
+    from music21_globals import update_metadata_cache
+
+    paths = None if batch.full_scan else batch_paths(batch)
+    if paths is not None and not paths:
+        return
+
+    start = time.perf_counter()
+    added, deleted, modified = update_metadata_cache(workers=workers, paths=paths)
+    print(f'{time.strftime("%H:%M:%S")}  {len(added)} added, {len(deleted)} deleted, {len(modified)} modified, '
+          f'{len(batch.renamed)} renamed  ({time.perf_counter() - start:.1f} s)', flush=True)
+#
+#-----------------------------------------------------------------------------------------------
+def watch_corpus(corpus_path=None, workers=1, update=None, initial_scan=True, watcher=None, stop=None):
+    """
+    Watch the corpus until interrupted (or until the stop Event is set), handing each debounced batch to update (by default
+    apply_batch()).  initial_scan first catches up with changes made while nothing was watching.
+    """
+    update = update or (lambda batch: apply_batch(batch, workers=workers))
+    watcher = watcher or corpus_watcher(corpus_path)
+    pending = Debouncer()
+    updates = UpdateQueue(update)
+
+    if initial_scan:
+        updates.put(CorpusBatch(set(), set(), set(), {}, True))
+
+    try:
+        while stop is None or not stop.is_set():
+            # Wake up when the pending batch is due, and now and then to check stop.
+            timeout = pending.time_left()
+            if stop is not None:
+                timeout = 0.5 if timeout is None else min(timeout, 0.5)
+
+            for next_event in watcher.events(timeout):
+                pending.add(*next_event)
+
+            if pending.ready():
+                updates.put(pending.flush())
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        if pending.first_event is not None:
+            updates.put(pending.flush())
+        watcher.close()
+        updates.close()
+
+#                                           MAIN
+#-----------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    print(f'Watching {CORPUS_FILEPATH}.  Ctrl-C to stop.', flush=True)
+    watch_corpus(workers=int(sys.argv[1]) if len(sys.argv) > 1 else 1)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Song Search Duplicates
+written by: Song Search contributors
+created on: 18 October 2026
+
+The Score Library holds many copies: 'Santa Lucia copy' is byte for byte 'Santa Lucia', and 'Silent Night Piano copy' differs from
+'Silent Night Piano' in nothing but its title and layout.  Each score carries two fingerprints:
+
+    File Information -> Fingerprint -> Hash     the file's bytes (fingerprint.content_hash())
+    File Information -> Musical Hash            its music, without layout or metadata (fingerprint.musical_hash())
+
+Before the analysis, plan_duplicates() matches every score against the others, on the file hash first and then on the musical hash.
+Only one score of each group is analyzed (one which already has been, if there is one), and the others point at it:
+
+    File Information -> Duplicate Of            the title whose analysis they share
+
+link_duplicates() then gives each duplicate that score's sections.  They are shared, not copied, and shard_store.py writes a
+duplicate's shard without them and links them back in when it is read, so a duplicate costs no parsing, no analysis, and no space.
+
+    duplicate_report(score_dictionary)          -> {original title: [{Title, Kind}]}, Kind is 'Identical File' or 'Same Music'
+
+Standard library only.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import json
+import tempfile
+
+from fingerprint    import musical_hash
+from score_paths    import DUPLICATE_REPORTPATH
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+# The sections a duplicate shares with the score it duplicates.
+DUPLICATE_SECTIONS  = ('Other', 'Pitch', 'Rhythm')
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def _file_hash(entry):
+    """
+    The hash of an entry's file contents, or None if it has not been computed.
+    """
+    return (entry['File Information'].get('Fingerprint') or {}).get('Hash')
+#
+#-----------------------------------------------------------------------------------------------
+def score_hashes(a_dictionary, titles, hash_map=map):
+    """
+    Fill in File Information -> Musical Hash for the given titles.  Files with the same contents are only read once.  hash_map can be
+    a pool's map() to hash the files in parallel.
+    """
+    by_file = {}
+    for next_title in titles:
+        the_key = _file_hash(a_dictionary[next_title]) or ('Title', next_title)
+        by_file.setdefault(the_key, []).append(next_title)
+
+    groups = list(by_file.values())
+    paths = [a_dictionary[group[0]]['File Information']['Path'] for group in groups]
+
+    for group, the_hash in zip(groups, hash_map(musical_hash, paths)):
+        for next_title in group:
+            a_dictionary[next_title]['File Information']['Musical Hash'] = the_hash
+
+    return a_dictionary
+#
+#-----------------------------------------------------------------------------------------------
+def plan_duplicates(a_dictionary, titles):
+    """
+    Decide which of the given titles have to be analyzed.  A title whose file or music matches an analyzed score outside titles, or an
+    earlier title, gets File Information -> Duplicate Of; the others lose any old Duplicate Of.  Returns the titles to analyze, in order.
+    """
+    titles = list(titles)
+    pending = set(titles)
+    by_file, by_music = {}, {}
+
+    # Scores which are already analyzed, and are not duplicates themselves, can be shared straight away.
+    for next_title, entry in a_dictionary.items():
+        if next_title in pending or entry['File Information'].get('Duplicate Of') or DUPLICATE_SECTIONS[0] not in entry:
+            continue
+        if _file_hash(entry):
+            by_file.setdefault(_file_hash(entry), next_title)
+        if entry['File Information'].get('Musical Hash'):
+            by_music.setdefault(entry['File Information']['Musical Hash'], next_title)
+
+    to_analyze = []
+    for next_title in titles:
+        file_information = a_dictionary[next_title]['File Information']
+        file_hash, music_hash = _file_hash(a_dictionary[next_title]), file_information.get('Musical Hash')
+
+        original = (file_hash and by_file.get(file_hash)) or (music_hash and by_music.get(music_hash))
+
+        if original:
+            file_information['Duplicate Of'] = original
+            continue
+
+        file_information.pop('Duplicate Of', None)
+        to_analyze.append(next_title)
+        if file_hash:
+            by_file[file_hash] = next_title
+        if music_hash:
+            by_music[music_hash] = next_title
+
+    return to_analyze
+#
+#-----------------------------------------------------------------------------------------------
+def link_duplicates(a_dictionary, titles=None):
+    """
+    Give each duplicate (of the given titles, or all) the sections of the score it duplicates.
+    """
+    for next_title in a_dictionary if titles is None else titles:
+        original = a_dictionary[next_title]['File Information'].get('Duplicate Of')
+
+        if original in a_dictionary:
+            for next_section in DUPLICATE_SECTIONS:
+                if next_section in a_dictionary[original]:
+                    a_dictionary[next_title][next_section] = a_dictionary[original][next_section]
+
+    return a_dictionary
+#
+#-----------------------------------------------------------------------------------------------
+def without_shared(entry):
+    """
+    The entry as it is stored: a duplicate without the sections it shares.
+    """
+    if not entry['File Information'].get('Duplicate Of'):
+        return entry
+
+    return {next_section: value for next_section, value in entry.items() if next_section not in DUPLICATE_SECTIONS}
+#
+#-----------------------------------------------------------------------------------------------
+def duplicates_of(a_dictionary, titles):
+    """
+    Every title which is a duplicate of one of the given titles.
+    """
+    titles = set(titles)
+
+    return {next_title for next_title, entry in a_dictionary.items() if entry['File Information'].get('Duplicate Of') in titles}
+#
+#-----------------------------------------------------------------------------------------------
+def duplicate_report(a_dictionary):
+    """
+    The duplicates of each analyzed score: {original title: [{'Title': duplicate, 'Kind': 'Identical File' or 'Same Music'}]}.
+    """
+    report = {}
+
+    for next_title, entry in a_dictionary.items():
+        original = entry['File Information'].get('Duplicate Of')
+        if not original or original not in a_dictionary:
+            continue
+
+        same_file = _file_hash(entry) is not None and _file_hash(entry) == _file_hash(a_dictionary[original])
+        report.setdefault(original, []).append({'Title': next_title, 'Kind': 'Identical File' if same_file else 'Same Music'})
+
+    return report
+#
+#-----------------------------------------------------------------------------------------------
+def write_duplicate_report(a_dictionary, report_path=None):
+    """
+    Save duplicate_report() as JSON (DUPLICATE_REPORTPATH).  Returns the number of duplicates.
+    """
+    report_path = str(report_path or DUPLICATE_REPORTPATH)
+    report = duplicate_report(a_dictionary)
+
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(report_path), suffix='.tmp')
+    with os.fdopen(handle, 'w', encoding='utf-8') as the_file:
+        json.dump(report, the_file, ensure_ascii=False, indent=1)
+    os.replace(temp_path, report_path)
+
+    return sum(len(copies) for copies in report.values())
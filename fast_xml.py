@@ -0,0 +1,881 @@
+#!/usr/bin/env python3
+"""
+Song Search Fast XML
+written by: Song Search contributors
+created on: 18 October 2026
+
+A streaming MusicXML reader for the fields which only need the raw note events: letter names, values, ties, clefs, keys, pitch
+classes, chord symbol figures, slurs, repeat barlines, and the part and measure counts.  The file is read once with iterparse (lxml if it is installed,
+otherwise xml.etree), each <note> is turned into a compact NoteEvent, and nothing of Music21's object model is built.
+
+fast_walk() returns a walk in the same shape as score_walk.walk_score(), holding the collectors in FAST_COLLECTORS, so the extractors
+read it without knowing where it came from (see score_walk.score_walk()).  Every value is the one Music21 would give:
+
+    Letter Names    'C#', 'B-'                                  from <step>, <alter> and <accidental>
+    Values          'Quarter Note', 'Dotted Half Rest', ...     Music21's fullName of the duration, see note_value()
+    Ties            'start', 'continue', 'stop'                 from the <tie> elements
+    Clefs           'Treble Clef', 'Bass8vb Clef', ...          Music21's clef class for the sign, line and octave change
+    Keys            'G major', 'e minor'                        only keys with a major or minor <mode>, as Music21 makes Key objects
+    Pitch Classes   (quarter length, pitch classes)             for the key histogram, see key_engine.py
+    Chord Symbols   'G7', 'Fm/A-'                               Music21's figure of the <harmony>
+    Slurs           number of notes under each slur
+    Measures        measure numbers
+    Bar Repeats     'start', 'end'                              from <barline><repeat>
+    Text Repeats    always empty: a score with a segno, coda, or repeat words (D.C. al Fine, ...) is left to Music21
+
+The walk also holds the raw events (EVENT_FIELDS) which the fields Music21's walk cannot give without the whole stream are read from,
+so a score the fast path reads is never parsed (see score_walk.fast_events()):
+
+    Pitches             in each part, the pitches of every note and chord, e.g. ('C#4',) or ('E4', 'G4')     the range
+    Melody              in each part, the pitch of every note, chords left out, e.g. 'B-3'                  the intervals
+    Measure Offsets     in each part, the offset of every measure in quarters, as Music21 places them       the anacrusis
+    Lyrics              on the score, the (text, syllabic) of the first lyric of every note, rest, and      the lyrics
+                        chord, in the order of the flattened score
+
+Anything the fast path cannot read exactly the way Music21 does (several voices or staves, <backup>/<forward>, unusual tuplets and
+durations, microtones, chord symbols with degrees, elided lyrics, empty measures, ...) raises FastPathUnsupported, and the caller
+parses the score with Music21 instead.
+
+Run this file to check the fast path against Music21 on the Score Library (or any files given on the command line).
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import io
+import sys
+import time
+import zipfile
+
+from collections    import namedtuple
+from fractions      import Fraction
+from functools      import lru_cache
+
+try:
+    from lxml.etree import iterparse
+    from lxml.etree import XMLSyntaxError as ParseError
+except ImportError:
+    from xml.etree.ElementTree import iterparse
+    from xml.etree.ElementTree import ParseError
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+# The collectors fast_walk() fills in.  A walk which needs any other collector has to come from Music21.
+FAST_COLLECTORS     = frozenset(['Letter Names', 'Values', 'Ties', 'Clefs', 'Keys', 'Pitch Classes', 'Chord Symbols', 'Slurs', 'Measures',
+                                 'Bar Repeats', 'Text Repeats'])
+
+# The raw events fast_walk() adds to each part, and to the score.  Music21's walk has none of them.
+PART_EVENTS         = frozenset(['Pitches', 'Melody', 'Measure Offsets'])
+SCORE_EVENTS        = frozenset(['Lyrics'])
+EVENT_FIELDS        = PART_EVENTS | SCORE_EVENTS
+
+# MusicXML note types: (Music21's name, quarter length).  Longer types have irregular names in Music21 and are left to it.
+NOTE_TYPES          = {'breve':     ('Breve',   Fraction(8)),
+                       'whole':     ('Whole',   Fraction(4)),
+                       'half':      ('Half',    Fraction(2)),
+                       'quarter':   ('Quarter', Fraction(1)),
+                       'eighth':    ('Eighth',  Fraction(1, 2)),
+                       '16th':      ('16th',    Fraction(1, 4)),
+                       '32nd':      ('32nd',    Fraction(1, 8)),
+                       '64th':      ('64th',    Fraction(1, 16)),
+                       '128th':     ('128th',   Fraction(1, 32)),
+                       '256th':     ('256th',   Fraction(1, 64))}
+
+DOT_NAMES           = ['', 'Dotted ', 'Double Dotted ']
+
+# Music21's name of a duration given only as a length (e.g. a whole-measure rest without a <type>).
+LENGTH_NAMES        = {length * (2 - Fraction(1, 2 ** dots)): DOT_NAMES[dots] + name
+                       for name, length in NOTE_TYPES.values() for dots in range(len(DOT_NAMES))}
+
+PITCH_CLASSES       = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+
+# <accidental> names as (Music21 modifier, alter).  Music21 spells the note with the accidental shown.
+ACCIDENTALS         = {'sharp': ('#', 1), 'flat': ('-', -1), 'natural': ('', 0),
+                       'double-sharp': ('##', 2), 'sharp-sharp': ('##', 2), 'flat-flat': ('--', -2), 'double-flat': ('--', -2)}
+
+# Music21's clef class for (sign, line), with the octave-changing versions of the treble and bass clefs.
+CLEF_CLASSES        = {('G', '1'): 'FrenchViolinClef', ('G', '2'): 'TrebleClef', ('G', '3'): 'GSopranoClef',
+                       ('G', '4'): 'GClef', ('G', '5'): 'GClef',
+                       ('F', '1'): 'FClef', ('F', '2'): 'FClef', ('F', '3'): 'FBaritoneClef', ('F', '4'): 'BassClef',
+                       ('F', '5'): 'SubBassClef',
+                       ('C', '1'): 'SopranoClef', ('C', '2'): 'MezzoSopranoClef', ('C', '3'): 'AltoClef', ('C', '4'): 'TenorClef',
+                       ('C', '5'): 'CBaritoneClef'}
+OCTAVE_CLEFS        = {('TrebleClef', -1): 'Treble8vbClef', ('TrebleClef', 1): 'Treble8vaClef',
+                       ('BassClef', -1): 'Bass8vbClef', ('BassClef', 1): 'Bass8vaClef'}
+SIGN_CLEFS          = {'tab': 'TabClef', 'percussion': 'PercussionClef', 'none': 'NoClef', 'jianpu': 'JianpuClef'}
+
+# Music21's bar.Repeat direction of a <repeat>, and the barline location it belongs on.
+REPEAT_DIRECTIONS   = {'forward': ('start', 'left'), 'backward': ('end', 'right')}
+
+# Words which Music21 turns into a repeat expression (music21.repeat.repeatExpressionReference), written as RepeatExpression.isValidText()
+# compares them: without spaces or dots, in lower case.
+REPEAT_WORDS        = frozenset(['coda', 'tocoda', 'alcoda', 'segno', 'fine', 'dacapo', 'dc', 'dacapoalfine', 'dcalfine', 'dacapoalcoda',
+                                 'dcalcoda', 'alsegno', 'dalsegno', 'ds', 'dalsegnoalfine', 'dsalfine', 'dalsegnoalcoda', 'dsalcoda'])
+
+# The <syllabic> values text.assembleLyrics() handles on a lyric with one <text>.
+SYLLABICS           = frozenset(['begin', 'middle', 'end', 'single'])
+
+# Tonics of the keys with 7 flats to 7 sharps.
+MAJOR_TONICS        = ['C-', 'G-', 'D-', 'A-', 'E-', 'B-', 'F', 'C', 'G', 'D', 'A', 'E', 'B', 'F#', 'C#']
+MINOR_TONICS        = ['a-', 'e-', 'b-', 'f', 'c', 'g', 'd', 'a', 'e', 'b', 'f#', 'c#', 'g#', 'd#', 'a#']
+
+# MusicXML <kind> values as Music21 writes them in a figure (music21.harmony.CHORD_TYPES, first abbreviation).
+CHORD_ALIASES       = {'dominant': 'dominant-seventh', 'major-minor': 'minor-major-seventh', 'half-diminished': 'half-diminished-seventh'}
+CHORD_KINDS         = {'major': '', 'minor': 'm', 'augmented': '+', 'diminished': 'dim',
+                       'dominant-seventh': '7', 'major-seventh': 'maj7', 'minor-major-seventh': 'mM7', 'minor-seventh': 'm7',
+                       'augmented-major-seventh': '+M7', 'augmented-seventh': '7+', 'half-diminished-seventh': 'ø7',
+                       'diminished-seventh': 'o7', 'seventh-flat-five': 'dom7dim5',
+                       'major-sixth': '6', 'minor-sixth': 'm6',
+                       'major-ninth': 'M9', 'dominant-ninth': '9', 'minor-major-ninth': 'mM9', 'minor-ninth': 'm9',
+                       'augmented-major-ninth': '+M9', 'augmented-dominant-ninth': '9#5', 'half-diminished-ninth': 'ø9',
+                       'half-diminished-minor-ninth': 'øb9', 'diminished-ninth': 'o9', 'diminished-minor-ninth': 'ob9',
+                       'dominant-11th': '11', 'major-11th': 'M11', 'minor-major-11th': 'mM11', 'minor-11th': 'm11',
+                       'augmented-major-11th': '+M11', 'augmented-11th': '+11', 'half-diminished-11th': 'ø11', 'diminished-11th': 'o11',
+                       'major-13th': 'M13', 'dominant-13th': '13', 'minor-major-13th': 'mM13', 'minor-13th': 'm13',
+                       'augmented-major-13th': '+M13', 'augmented-dominant-13th': '+13', 'half-diminished-13th': 'ø13',
+                       'suspended-second': 'sus2', 'suspended-fourth': 'sus', 'suspended-fourth-seventh': '7sus',
+                       'Neapolitan': 'N6', 'Italian': 'It+6', 'French': 'Fr+6', 'German': 'Gr+6',
+                       'pedal': 'pedal', 'power': 'power', 'Tristan': 'tristan'}
+
+# One <note> (or a chord of them) as the walk needs it.
+#   kind:           'Note', 'Rest', 'Chord', or 'Unpitched'
+#   names:          letter name of each pitch
+#   pitch_classes:  pitch class of each pitch
+#   value:          the Values entry (None for chords and unpitched notes, as in rhythm_data.note_value())
+#   length:         quarter length as a Fraction (0 for grace notes)
+#   tie:            tie type or None
+#   spelled:        name and octave of each pitch, e.g. 'C#4'
+#   lyric:          (text, syllabic) of the first <lyric>, or None
+#   grace:          True for a grace note
+NoteEvent           = namedtuple('NoteEvent', ['kind', 'names', 'pitch_classes', 'value', 'length', 'tie', 'spelled', 'lyric', 'grace'])
+
+#                                            CLASSES
+#-----------------------------------------------------------------------------------------------
+class FastPathUnsupported(Exception):
+    """
+    The score uses something the fast path does not read exactly as Music21 does.  Parse it with Music21 instead.
+    """
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def _text(element, tag):
+    """
+    The stripped text of a child element, or None.
+    """
+    child = element.find(tag)
+    if child is None or child.text is None:
+        return None
+
+    return child.text.strip() or None
+#
+#-----------------------------------------------------------------------------------------------
+def _whole_number(text, what):
+    """
+    An integer from MusicXML text which may be written as a float ('1.0').  Anything else (e.g. a microtone) is unsupported.
+    """
+    value = float(text)
+    if value != int(value):
+        raise FastPathUnsupported(f'{what} {text}')
+
+    return int(value)
+#
+#-----------------------------------------------------------------------------------------------
+def _mixed_fraction(length):
+    """
+    A quarter length the way Music21 prints it in a duration name: '1/3', '1 1/3', '2'.
+    """
+    whole, part = divmod(length, 1)
+    if not part:
+        return str(whole)
+    if not whole:
+        return str(part)
+
+    return f'{whole} {part}'
+#
+#-----------------------------------------------------------------------------------------------
+def duration_name(mx_note, divisions):
+    """
+    Music21's fullName of a note's duration ('Dotted Quarter', 'Eighth Triplet (1/3 QL)') and its quarter length.
+    """
+    mx_modification = mx_note.find('time-modification')
+    if mx_modification is not None:
+        tuplet = (_text(mx_modification, 'actual-notes'), _text(mx_modification, 'normal-notes'),
+                  _text(mx_modification, 'normal-type'), mx_modification.find('normal-dot') is not None)
+    else:
+        tuplet = None
+
+    return _duration_name(_text(mx_note, 'type'), len(mx_note.findall('dot')), tuplet, _text(mx_note, 'duration'), divisions,
+                          mx_note.find('grace') is not None)
+#
+#-----------------------------------------------------------------------------------------------
+@lru_cache(maxsize=4096)
+def _duration_name(type_text, dots, tuplet, duration_text, divisions, grace):
+    """
+    duration_name() from the parts of a <note> it looks at.  A score only has a handful of different durations, so they are cached.
+    """
+    if duration_text is not None:
+        if divisions is None:
+            raise FastPathUnsupported('duration before divisions')
+        length = Fraction(duration_text) / Fraction(divisions)
+    else:
+        length = Fraction(0)
+
+    # Without a type Music21 names the duration from its length.
+    if type_text is None:
+        if grace or length not in LENGTH_NAMES:
+            raise FastPathUnsupported(f'untyped duration {length}')
+        return LENGTH_NAMES[length], length
+
+    if type_text not in NOTE_TYPES:
+        raise FastPathUnsupported(f'note type {type_text}')
+    if dots >= len(DOT_NAMES):
+        raise FastPathUnsupported(f'{dots} dots')
+
+    type_name, type_length = NOTE_TYPES[type_text]
+    notated = type_length * (2 - Fraction(1, 2 ** dots))
+    name = DOT_NAMES[dots] + type_name
+
+    if tuplet is not None:
+        actual, normal, normal_type, normal_dot = tuplet
+        if (actual, normal) != ('3', '2') or normal_type not in (None, type_text) or normal_dot:
+            raise FastPathUnsupported(f'tuplet {actual}:{normal}')
+        notated = notated * 2 / 3
+        name = f'{name} Triplet ({_mixed_fraction(notated)} QL)'
+
+    # Grace notes keep their notated type but take no time.
+    if grace:
+        return name, Fraction(0)
+
+    # Music21 keeps the notated type apart from a <duration> which does not match it.  Those names are left to Music21.
+    if length != notated:
+        raise FastPathUnsupported(f'{type_text} lasting {length}')
+
+    return name, notated
+#
+#-----------------------------------------------------------------------------------------------
+def pitch_name(mx_pitch, mx_accidental=None):
+    """
+    The letter name ('C#', 'B-') and pitch class of a <pitch>.
+    """
+    step = _text(mx_pitch, 'step')
+    if step not in PITCH_CLASSES:
+        raise FastPathUnsupported(f'step {step}')
+
+    alter_text = _text(mx_pitch, 'alter')
+    alter = 0 if alter_text is None else _whole_number(alter_text, 'alter')
+
+    accidental = None if mx_accidental is None or mx_accidental.text is None else mx_accidental.text.strip()
+    if accidental:
+        if accidental not in ACCIDENTALS:
+            raise FastPathUnsupported(f'accidental {accidental}')
+        modifier, shown = ACCIDENTALS[accidental]
+        if alter_text is not None and shown != alter:
+            raise FastPathUnsupported(f'{accidental} on alter {alter}')
+        alter = shown
+    else:
+        modifier = '#' * alter if alter > 0 else '-' * -alter
+
+    return step + modifier, (PITCH_CLASSES[step] + alter) % 12
+#
+#-----------------------------------------------------------------------------------------------
+def tie_type(mx_note):
+    """
+    The tie type of a note from its <tie> elements, as Music21 reads them: both a stop and a start make 'continue'.
+    """
+    found = [mx_tie.get('type') for mx_tie in mx_note.findall('tie')]
+    if not found:
+        return None
+
+    types = [next_type for next_type in found if next_type is not None]
+    if len(types) == 1:
+        return types[0]
+    if 'start' in types and 'stop' in types:
+        return 'continue'
+
+    return 'start'
+#
+#-----------------------------------------------------------------------------------------------
+def first_lyric(mx_note):
+    """
+    The (text, syllabic) of a note's first <lyric>, as Music21 reads it for text.assembleLyrics(), or None if it has none.  A lyric
+    without text has the text ''.  An elided lyric ('co' <elision/> 'e') is one text joined by its elisions, with the syllabic of its
+    last part, which is what decides whether it ends a word.
+    """
+    mx_lyric = mx_note.find('lyric')
+    if mx_lyric is None:
+        return None
+
+    mx_texts = mx_lyric.findall('text')
+    if not mx_texts:
+        return '', None
+
+    mx_syllabics, mx_elisions = mx_lyric.findall('syllabic'), mx_lyric.findall('elision')
+
+    if len(mx_texts) == 1:
+        if mx_syllabics and (mx_syllabics[0].text or '').strip() not in SYLLABICS:
+            raise FastPathUnsupported(f'syllabic {mx_syllabics[0].text!r}')
+        return (mx_texts[0].text or '').strip(), mx_syllabics[0].text.strip() if mx_syllabics else None
+
+    # Music21 reads the i-th <syllabic> and the elision before the i-th <text> together, see MeasureParser.xmlToLyric().
+    joined, syllabic = '', None
+    for i, mx_text in enumerate(mx_texts):
+        elision, syllabic = ' ', None
+
+        if i < len(mx_syllabics) and mx_syllabics[i].text is not None:
+            syllabic = mx_syllabics[i].text.strip()
+            if syllabic not in SYLLABICS:
+                raise FastPathUnsupported(f'syllabic {syllabic!r}')
+            if 1 <= i <= len(mx_elisions):
+                elision = mx_elisions[i - 1].text or ''
+
+        joined += (elision if i else '') + (mx_text.text or '').strip()
+
+    return joined, syllabic
+#
+#-----------------------------------------------------------------------------------------------
+def note_event(mx_note, divisions):
+    """
+    Turn a <note> into a NoteEvent.
+    """
+    if mx_note.find('cue') is not None:
+        raise FastPathUnsupported('cue note')
+    if (_text(mx_note, 'staff') or '1') != '1':
+        raise FastPathUnsupported('several staves')
+
+    duration_full, length = duration_name(mx_note, divisions)
+    tie = tie_type(mx_note)
+    lyric = first_lyric(mx_note)
+
+    if mx_note.find('rest') is not None:
+        return NoteEvent('Rest', (), (), duration_full + ' Rest', length, tie, (), lyric, False)
+
+    if mx_note.find('unpitched') is not None:
+        return NoteEvent('Unpitched', (), (), None, length, tie, (), lyric, mx_note.find('grace') is not None)
+
+    mx_pitch = mx_note.find('pitch')
+    if mx_pitch is None:
+        raise FastPathUnsupported('note without pitch')
+
+    name, pitch_class = pitch_name(mx_pitch, mx_note.find('accidental'))
+
+    octave = _text(mx_pitch, 'octave')
+    if octave is None:
+        raise FastPathUnsupported('pitch without octave')
+
+    # rhythm_data.note_value() takes the two words after the pitch in 'C-sharp in octave 4 Quarter Note'.
+    value = ' '.join((duration_full.split() + ['Note'])[:2])
+
+    return NoteEvent('Note', (name,), (pitch_class,), value, length, tie, (f'{name}{_whole_number(octave, "octave")}',), lyric,
+                     mx_note.find('grace') is not None)
+#
+#-----------------------------------------------------------------------------------------------
+def add_to_chord(chord, next_note):
+    """
+    Add a <note> carrying <chord/> to the note or chord before it.  A chord takes the length of its first note, and the tie and the
+    lyric of the first note which has one.
+    """
+    if chord.kind not in ('Note', 'Chord') or next_note.kind != 'Note':
+        raise FastPathUnsupported(f'{next_note.kind} in a chord with a {chord.kind}')
+
+    return NoteEvent('Chord', chord.names + next_note.names, chord.pitch_classes + next_note.pitch_classes, None, chord.length,
+                     chord.tie if chord.tie is not None else next_note.tie, chord.spelled + next_note.spelled,
+                     chord.lyric if chord.lyric is not None else next_note.lyric, chord.grace)
+#
+#-----------------------------------------------------------------------------------------------
+def clef_name(mx_clef):
+    """
+    The friendly name of a <clef> (see pitch_data.clef_name()), e.g. 'Treble Clef' or 'Bass8vb Clef'.
+    """
+    if (mx_clef.get('number') or '1') != '1':
+        raise FastPathUnsupported('clef for another staff')
+
+    sign = _text(mx_clef, 'sign') or ''
+
+    if sign.lower() in SIGN_CLEFS:
+        class_name = SIGN_CLEFS[sign.lower()]
+
+    else:
+        line = _text(mx_clef, 'line') or ('2' if sign == 'G' else '4')
+        if (sign, line) not in CLEF_CLASSES:
+            raise FastPathUnsupported(f'clef {sign}{line}')
+
+        octave_text = _text(mx_clef, 'clef-octave-change')
+        try:
+            octave = int(octave_text) if octave_text is not None else 0
+        except ValueError:
+            octave = 0
+
+        class_name = CLEF_CLASSES[(sign, line)]
+        class_name = OCTAVE_CLEFS.get((class_name, octave), class_name)
+
+    # 'Treble8vbClef' -> 'Treble8vb Clef', the same split pitch_data.clef_name() makes.
+    return ''.join(' ' + c if c.isupper() else c for c in class_name).strip()
+#
+#-----------------------------------------------------------------------------------------------
+def key_name(mx_key):
+    """
+    The name of a <key> with a major or minor mode, e.g. 'E- major' or 'c# minor'.  None for a key signature without a mode, which
+    Music21 does not make a Key of.
+    """
+    if mx_key.get('number') not in (None, '1'):
+        raise FastPathUnsupported('key for another staff')
+
+    fifths, mode = _text(mx_key, 'fifths'), _text(mx_key, 'mode')
+    if fifths is None or mode is None:
+        return None
+
+    if mode not in ('major', 'minor') or mx_key.find('key-octave') is not None:
+        raise FastPathUnsupported(f'{mode} key')
+
+    fifths = int(fifths)
+    if not -7 <= fifths <= 7:
+        raise FastPathUnsupported(f'{fifths} fifths')
+
+    return f'{(MAJOR_TONICS if mode == "major" else MINOR_TONICS)[fifths + 7]} {mode}'
+#
+#-----------------------------------------------------------------------------------------------
+def chord_figure(mx_harmony):
+    """
+    Music21's figure of a <harmony>, e.g. 'G7' or 'B-m/D'.
+    """
+    if mx_harmony.find('root') is None or mx_harmony.find('frame') is not None:
+        raise FastPathUnsupported('chord symbol without a root')
+    if mx_harmony.find('degree') is not None or mx_harmony.find('inversion') is not None:
+        raise FastPathUnsupported('altered chord symbol')
+
+    kind = _text(mx_harmony, 'kind') or ''
+    kind = CHORD_ALIASES.get(kind, kind)
+    if kind not in CHORD_KINDS:
+        raise FastPathUnsupported(f'chord kind {kind!r}')
+
+    root = _harmony_pitch(mx_harmony.find('root'), 'root')
+    figure = root + CHORD_KINDS[kind]
+
+    if mx_harmony.find('bass') is not None:
+        bass = _harmony_pitch(mx_harmony.find('bass'), 'bass')
+        if bass != root:
+            figure += '/' + bass
+
+    return figure
+#
+#-----------------------------------------------------------------------------------------------
+def _harmony_pitch(mx_part, prefix):
+    """
+    The name of a chord symbol's <root> or <bass>, from its -step and -alter.
+    """
+    step = _text(mx_part, prefix + '-step')
+    if step not in PITCH_CLASSES:
+        raise FastPathUnsupported(f'{prefix} {step}')
+
+    alter_text = _text(mx_part, prefix + '-alter')
+    alter = 0 if alter_text is None else _whole_number(alter_text, prefix + ' alter')
+
+    return step + ('#' * alter if alter > 0 else '-' * -alter)
+#
+#-----------------------------------------------------------------------------------------------
+def bar_length(mx_time):
+    """
+    The length in quarters of a measure of a <time>, as Music21's TimeSignature.barDuration gives it.  '3+2' beats are added up.
+    """
+    if mx_time.get('number') not in (None, '1'):
+        raise FastPathUnsupported('time signature for another staff')
+
+    beats, beat_types = mx_time.findall('beats'), mx_time.findall('beat-type')
+    if len(beats) != 1 or len(beat_types) != 1 or mx_time.find('senza-misura') is not None:
+        raise FastPathUnsupported('unusual time signature')
+
+    try:
+        return sum(Fraction(next_beats) for next_beats in beats[0].text.split('+')) * 4 / Fraction(beat_types[0].text)
+    except (AttributeError, ValueError, ZeroDivisionError):
+        raise FastPathUnsupported(f'time signature {beats[0].text}/{beat_types[0].text}') from None
+#
+#-----------------------------------------------------------------------------------------------
+def measure_shift(length, bar):
+    """
+    How far the next measure starts after this one, as Music21's PartParser.adjustTimeAttributesFromMeasure() places it: after the
+    notes, unless they overfill the bar by an amount that is not a round one.
+    """
+    overfill = length - bar
+    if overfill <= 0 or overfill > Fraction(1, 2) or (overfill * 16).denominator == 1 or (overfill * 12).denominator == 1:
+        return length
+
+    return bar
+#
+#-----------------------------------------------------------------------------------------------
+def repeat_words(mx_direction):
+    """
+    Refuse a <direction> which Music21 reads as a repeat expression: a segno, a coda, or words such as 'D.C. al Fine'.
+    """
+    for mx_type in mx_direction.iterfind('direction-type'):
+        if mx_type.find('segno') is not None or mx_type.find('coda') is not None:
+            raise FastPathUnsupported('segno or coda')
+
+        for mx_words in mx_type.iterfind('words'):
+            if (mx_words.text or '').replace(' ', '').replace('.', '').lower().strip() in REPEAT_WORDS:
+                raise FastPathUnsupported(f'repeat words {mx_words.text!r}')
+#
+#-----------------------------------------------------------------------------------------------
+def measure_number(mx_measure, last_number):
+    """
+    A measure's number as Music21 reads it (see MeasureParser.parseMeasureNumbers()): its digits ('12a' is 12), or 0.  Finale calls
+    unnumbered measures 'X1', 'X2', ..., and those keep the number of the measure before them.
+    """
+    the_number = mx_measure.get('number') or ''
+    digits = ''.join(c for c in the_number if c in '0123456789')
+    suffix = ''.join(c for c in the_number if c not in '0123456789')
+    number = int(digits) if digits else 0
+
+    if suffix == 'X' and number != last_number + 1:
+        return last_number
+
+    return number
+#
+#-----------------------------------------------------------------------------------------------
+def open_musicxml(score_path):
+    """
+    A binary file of a score's MusicXML.  Compressed .mxl files are opened through their META-INF/container.xml.
+    """
+    if not zipfile.is_zipfile(score_path):
+        return open(score_path, 'rb')
+
+    with zipfile.ZipFile(score_path) as the_archive:
+        names = the_archive.namelist()
+        inner = None
+
+        if 'META-INF/container.xml' in names:
+            for event, element in iterparse(io.BytesIO(the_archive.read('META-INF/container.xml'))):
+                if element.tag.rsplit('}', 1)[-1] == 'rootfile':
+                    inner = element.get('full-path')
+                    break
+
+        if inner is None:
+            inner = next((name for name in names if name.endswith('.xml') and not name.startswith('META-INF')), None)
+        if inner is None:
+            raise FastPathUnsupported('no MusicXML in archive')
+
+        return io.BytesIO(the_archive.read(inner))
+#
+#-----------------------------------------------------------------------------------------------
+def read_events(score_path):
+    """
+    Read a partwise MusicXML file as a stream of (part index, event, value):
+
+        'Part'          None                    a new part starts
+        'Measure'       (measure number, offset in quarters)
+        'Clef'          clef name
+        'Key'           key name
+        'Chord Symbol'  figure
+        'Bar Repeat'    'start' or 'end'        after the measure's notes, the left barline's first
+        'Note'          (offset, NoteEvent)     <chord/> notes are already merged into the note before them
+        'Slur'          number of notes         after the last part, one per slur, in the part the slur started in
+
+    Offsets are Fractions of a quarter from the start of the part.  The file is read one measure at a time, and each measure is thrown
+    away once it has been read.  Raises FastPathUnsupported for anything Music21 would read differently.
+    """
+    part_index = -1
+    part_started = False
+
+    # Kept as text: it is only part of the cache key of _duration_name().
+    divisions = None
+
+    # Where the measure starts, and the length of a full bar (Music21 assumes 4/4 until it meets a time signature).
+    measure_offset = Fraction(0)
+    bar = Fraction(4)
+    last_number = 0
+
+    # Music21 matches a slur's notes by number across the whole score, see MeasureParser.xmlOneSpanner().
+    open_slurs = {}
+    all_slurs = []
+    note_count = 0
+
+    with open_musicxml(score_path) as the_file:
+        for event, element in iterparse(the_file):
+            tag = element.tag
+
+            # Only end events are read, so a part is started by its first measure (or its end, if it has none).
+            if tag == 'part':
+                if not part_started:
+                    part_index += 1
+                    yield part_index, 'Part', None
+                part_started = False
+                divisions = None
+                measure_offset, bar, last_number = Fraction(0), Fraction(4), 0
+                element.clear()
+            if tag != 'measure':
+                continue
+
+            if element.find('part') is not None:
+                raise FastPathUnsupported('timewise score')
+            if not part_started:
+                part_index += 1
+                part_started = True
+                yield part_index, 'Part', None
+
+            last_number = measure_number(element, last_number)
+            yield part_index, 'Measure', (last_number, measure_offset)
+            pending = None
+            position = Fraction(0)
+            has_notes = False
+
+            # A later barline at the same location replaces an earlier one, as Measure.leftBarline and rightBarline do.
+            repeats = {}
+
+            for child in element:
+                child_tag = child.tag
+
+                if child_tag == 'note':
+                    next_note = note_event(child, divisions)
+                    note_count += 1
+
+                    mx_notations = child.find('notations')
+                    for mx_slur in (() if mx_notations is None else mx_notations.iterfind('slur')):
+                        the_slur = open_slurs.get(mx_slur.get('number'))
+                        if the_slur is None:
+                            the_slur = [part_index, set()]
+                            all_slurs.append(the_slur)
+                            open_slurs[mx_slur.get('number')] = the_slur
+                        elif the_slur[0] != part_index:
+                            raise FastPathUnsupported('slur across parts')
+                        the_slur[1].add(note_count)
+                        if mx_slur.get('type') == 'stop':
+                            del open_slurs[mx_slur.get('number')]
+
+                    if child.find('chord') is not None:
+                        if pending is None:
+                            raise FastPathUnsupported('chord note without a first note')
+                        pending = (pending[0], add_to_chord(pending[1], next_note))
+                    else:
+                        if pending is not None:
+                            yield part_index, 'Note', pending
+                        pending = (measure_offset + position, next_note)
+                        position += next_note.length
+                        has_notes = True
+                    continue
+
+                # Anything that is not a note ends the chord being gathered.
+                if pending is not None:
+                    yield part_index, 'Note', pending
+                    pending = None
+
+                if child_tag == 'attributes':
+                    if int(_text(child, 'staves') or 1) > 1:
+                        raise FastPathUnsupported('several staves')
+                    divisions = _text(child, 'divisions') or divisions
+                    for mx_time in child.iterfind('time'):
+                        if has_notes:
+                            raise FastPathUnsupported('time signature inside a measure')
+                        bar = bar_length(mx_time)
+                    for mx_key in child.iterfind('key'):
+                        the_key = key_name(mx_key)
+                        if the_key is not None:
+                            yield part_index, 'Key', the_key
+                    for mx_clef in child.iterfind('clef'):
+                        yield part_index, 'Clef', clef_name(mx_clef)
+
+                elif child_tag == 'harmony':
+                    yield part_index, 'Chord Symbol', chord_figure(child)
+
+                elif child_tag == 'direction':
+                    repeat_words(child)
+
+                elif child_tag == 'barline':
+                    location = child.get('location') or 'right'
+                    mx_repeat = child.find('repeat')
+                    if mx_repeat is None:
+                        repeats[location] = None
+                        continue
+                    direction, side = REPEAT_DIRECTIONS.get(mx_repeat.get('direction'), (None, None))
+                    if side != location:
+                        raise FastPathUnsupported(f'{mx_repeat.get("direction")} repeat on the {location} barline')
+                    repeats[location] = direction
+
+                elif child_tag in ('backup', 'forward'):
+                    raise FastPathUnsupported(f'<{child_tag}>')
+
+            if pending is not None:
+                yield part_index, 'Note', pending
+            element.clear()
+
+            # Music21 fills a measure without notes or rests with a rest of its own.
+            if not has_notes:
+                raise FastPathUnsupported('empty measure')
+
+            for location in ('left', 'right'):
+                if repeats.get(location) is not None:
+                    yield part_index, 'Bar Repeat', repeats[location]
+
+            measure_offset += measure_shift(position, bar)
+
+    for part_index, slur_notes in all_slurs:
+        yield part_index, 'Slur', len(slur_notes)
+#
+#-----------------------------------------------------------------------------------------------
+def fast_walk(score_path):
+    """
+    A walk of a score (see score_walk.walk_score()) read straight from its MusicXML, holding the collectors in FAST_COLLECTORS and
+    the raw events in EVENT_FIELDS.
+    """
+    the_walk = {'Parts': [], 'Score': {name: [] for name in FAST_COLLECTORS | SCORE_EVENTS}}
+    found = None
+
+    # Music21 flattens the score for its lyrics: by offset, grace notes first, then part by part.
+    lyrics = []
+
+    for part_index, event, value in read_events(score_path):
+        if event == 'Part':
+            found = {name: [] for name in FAST_COLLECTORS | PART_EVENTS}
+            the_walk['Parts'].append(found)
+
+        elif event == 'Note':
+            offset, value = value
+            if value.kind == 'Note':
+                found['Letter Names'].append(value.names[0])
+                found['Melody'].append(value.spelled[0])
+            if value.value is not None:
+                found['Values'].append(value.value)
+            if value.kind != 'Rest' and value.tie is not None:
+                found['Ties'].append(value.tie)
+            if value.kind in ('Note', 'Chord'):
+                found['Pitch Classes'].append((float(value.length), value.pitch_classes))
+                found['Pitches'].append(value.spelled)
+            if value.lyric is not None:
+                lyrics.append((offset, not value.grace, part_index, len(lyrics), value.lyric))
+
+        elif event == 'Measure':
+            found['Measures'].append(value[0])
+            found['Measure Offsets'].append(value[1])
+        elif event == 'Clef':
+            found['Clefs'].append(value)
+        elif event == 'Key':
+            found['Keys'].append(value)
+        elif event == 'Chord Symbol':
+            found['Chord Symbols'].append(value)
+        elif event == 'Bar Repeat':
+            found['Bar Repeats'].append(value)
+        elif event == 'Slur':
+            the_walk['Parts'][part_index]['Slurs'].append(value)
+
+    the_walk['Score']['Lyrics'] = [next_lyric[-1] for next_lyric in sorted(lyrics)]
+
+    return the_walk
+#
+#-----------------------------------------------------------------------------------------------
+def walk_differences(score_path):
+    """
+    Compare fast_walk() with the Music21 walk of the same file.  Returns a list of (part, collector, fast value, Music21 value) for
+    every collector that differs, or None if the fast path does not handle the score.  Pitch classes are compared as the key
+    histogram they make, since chord symbols add nothing to it.
+    """
+    from music21        import converter
+    from key_engine     import pitch_class_histogram
+    from score_walk     import walk_score
+
+    import other_data, pitch_data, rhythm_data          # registers the collectors
+
+    try:
+        fast = fast_walk(score_path)
+    except FastPathUnsupported:
+        return None
+
+    slow = walk_score(converter.parse(score_path))
+    differences = []
+
+    if len(fast['Parts']) != len(slow['Parts']):
+        return [(None, 'Parts', len(fast['Parts']), len(slow['Parts']))]
+
+    for i, (fast_part, slow_part) in enumerate(zip(fast['Parts'], slow['Parts'])):
+        for name in sorted(FAST_COLLECTORS):
+            fast_values, slow_values = fast_part[name], slow_part[name]
+            if name == 'Keys':
+                slow_values = [str(k) for k in slow_values]
+            if name == 'Pitch Classes':
+                fast_values = [round(x, 9) for x in pitch_class_histogram(fast_values)]
+                slow_values = [round(x, 9) for x in pitch_class_histogram(slow_values)]
+            if list(fast_values) != list(slow_values):
+                differences.append((i + 1, name, fast_values, slow_values))
+
+    return differences
+#
+#-----------------------------------------------------------------------------------------------
+def field_differences(score_path):
+    """
+    Compare the fields which are read from the raw events (EVENT_FIELDS) with the same fields read from the parsed score.  Returns a
+    list of (section, field, fast value, Music21 value) for every field that differs, or None if the fast path does not handle the
+    score.
+    """
+    import score_walk
+    import other_data, pitch_data, rhythm_data
+
+    try:
+        fast_walk(score_path)
+    except FastPathUnsupported:
+        return None
+
+    extractors = [other_data.repeats, other_data.lyrics, pitch_data.melody_range, pitch_data.intervals, rhythm_data.anacrusis]
+    found = []
+    was_enabled = score_walk.FAST_WALK_ENABLED
+
+    try:
+        for enabled in (True, False):
+            score_walk.FAST_WALK_ENABLED = enabled
+            one_score = {'Score': {'File Information': {'Path': str(score_path)}, 'Other': {}, 'Pitch': {'Key Signature': None},
+                                   'Rhythm': {}}}
+            for next_extractor in extractors:
+                next_extractor(one_score, 'Score')
+            found.append(one_score['Score'])
+    finally:
+        score_walk.FAST_WALK_ENABLED = was_enabled
+
+    fast, slow = found
+    differences = []
+
+    for next_section in ('Other', 'Pitch', 'Rhythm'):
+        for next_field in sorted(set(fast[next_section]) | set(slow[next_section])):
+            fast_value, slow_value = fast[next_section].get(next_field), slow[next_section].get(next_field)
+            if repr(fast_value) != repr(slow_value):
+                differences.append((next_section, next_field, fast_value, slow_value))
+
+    return differences
+#
+#-----------------------------------------------------------------------------------------------
+def time_paths(paths, read):
+    """
+    Seconds taken to read every path with read().
+    """
+    start = time.perf_counter()
+    for next_path in paths:
+        read(next_path)
+
+    return time.perf_counter() - start
+
+#                                           MAIN
+#-----------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    from score_paths    import CORPUS_FILEPATH
+
+    paths = sys.argv[1:] or sorted(str(p) for p in CORPUS_FILEPATH.iterdir() if p.suffix in ('.xml', '.musicxml', '.mxl'))
+    handled, mismatched = [], 0
+
+    for next_path in paths:
+        differences = walk_differences(next_path)
+        if differences is None:
+            print(f'music21 only   {next_path}')
+            continue
+
+        handled.append(next_path)
+        for part, name, fast_values, slow_values in differences:
+            mismatched += 1
+            print(f'MISMATCH       {next_path}  part {part}  {name}\n    fast:    {fast_values}\n    music21: {slow_values}')
+        for section, name, fast_value, slow_value in field_differences(next_path):
+            mismatched += 1
+            print(f'MISMATCH       {next_path}  {section} {name}\n    fast:    {fast_value}\n    music21: {slow_value}')
+
+    print(f'{len(handled)} of {len(paths)} scores read by the fast path, {mismatched} mismatches')
+
+    if handled:
+        from music21        import converter
+        from score_walk     import walk_score
+
+        fast_seconds = time_paths(handled, fast_walk)
+        slow_seconds = time_paths(handled, lambda next_path: walk_score(converter.parse(next_path, forceSource=True)))
+        print(f'fast path {fast_seconds:.2f} s, music21 {slow_seconds:.2f} s ({slow_seconds / max(fast_seconds, 1e-9):.0f}x)')
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Song Search Feature Matrix
+written by: Song Search contributors
+created on: 18 October 2026
+
+A corpus-wide view of the Score Dictionary.  Each 'Types' histogram (Letter Names, Solfege, Intervals, rhythm Values, Chords) becomes
+one scores x features count matrix, and single-valued or list-valued fields (Time Signature, Key Signature, Meter, Clef...) become
+0/1 attribute matrices over the same rows.  Aggregate questions are then answered with NumPy instead of Python loops:
+
+    engine = feature_engine(score_dictionary)
+    six_eight = feature_mask(engine['Time Signature'], '6/8')
+    most_common(engine['Intervals'], mask=six_eight, n=5)                   # most common intervals in 6/8 songs
+    scores_with_top(engine['Solfege'], ['do', 'mi', 'sol'])                  # songs whose top-3 syllables are do/mi/sol
+
+A matrix looks like this:
+
+    { Field:     name of the field,
+      Titles:    [score titles, one per row],           # the same order in every matrix of an engine
+      Features:  [feature values, one per column],
+      Column:    {feature value: column number},
+      Counts:    NumPy array (or SciPy CSR matrix when sparse)
+    }
+
+SciPy is optional.  Without it every matrix is dense.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import numpy
+
+try:
+    from scipy import sparse as scipy_sparse
+except ImportError:
+    scipy_sparse = None
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+# Histogram fields: name: (section, field).  Each field's 'Types' is a {value: count} dictionary.
+TYPE_FIELDS         = {'Letter Names':    ('Pitch', 'Letter Names'),
+                       'Solfege':         ('Pitch', 'Solfege'),
+                       'Intervals':       ('Pitch', 'Intervals'),
+                       'Values':          ('Rhythm', 'Values'),
+                       'Chords':          ('Other', 'Chords')}
+
+# Attribute fields: name: (section, field).  The value is a string, a number, or a list of them.
+ATTRIBUTE_FIELDS    = {'Time Signature':  ('Rhythm', 'Time Signature'),
+                       'Meter':           ('Rhythm', 'Meter'),
+                       'Key Signature':   ('Pitch', 'Key Signature'),
+                       'Clef':            ('Pitch', 'Clef'),
+                       'Parts':           ('Other', 'Parts'),
+                       'Repeats':         ('Other', 'Repeats')}
+
+# With sparse=None a matrix is stored sparse (if SciPy is available) when fewer than this share of its cells are filled.
+SPARSE_DENSITY      = 0.1
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def _matrix(field, titles, rows, columns, features, counts, sparse):
+    """
+    Assemble a matrix from (row, column, count) triples.
+    """
+    shape = (len(titles), len(features))
+    rows = numpy.asarray(rows, dtype=numpy.int64)
+    columns = numpy.asarray(columns, dtype=numpy.int64)
+    counts = numpy.asarray(counts, dtype=numpy.int64)
+
+    if sparse is None:
+        sparse = scipy_sparse is not None and len(counts) < SPARSE_DENSITY * max(1, shape[0] * shape[1])
+
+    if sparse and scipy_sparse is not None:
+        the_counts = scipy_sparse.csr_matrix((counts, (rows, columns)), shape=shape)
+    else:
+        the_counts = numpy.zeros(shape, dtype=numpy.int64)
+        numpy.add.at(the_counts, (rows, columns), counts)
+
+    return {'Field':    field,
+            'Titles':   titles,
+            'Features': features,
+            'Column':   {feature: j for j, feature in enumerate(features)},
+            'Counts':   the_counts}
+#
+#-----------------------------------------------------------------------------------------------
+def build_feature_matrix(score_dictionary, field, titles=None, sparse=None):
+    """
+    Build the scores x features count matrix of one 'Types' field (a name in TYPE_FIELDS).  Scores without the field get a row of zeros.
+    """
+    section, sub_field = TYPE_FIELDS[field]
+    titles = list(score_dictionary) if titles is None else list(titles)
+
+    column = {}
+    rows, columns, counts = [], [], []
+
+    for i, next_title in enumerate(titles):
+        the_types = score_dictionary[next_title].get(section, {}).get(sub_field, {}).get('Types') or {}
+
+        for next_type, next_count in the_types.items():
+            rows.append(i)
+            columns.append(column.setdefault(next_type, len(column)))
+            counts.append(next_count)
+
+    return _matrix(field, titles, rows, columns, list(column), counts, sparse)
+#
+#-----------------------------------------------------------------------------------------------
+def build_attribute_matrix(score_dictionary, field, titles=None, sparse=None):
+    """
+    Build the scores x values 0/1 matrix of one attribute field (a name in ATTRIBUTE_FIELDS).  A list-valued field (e.g. a score with
+    two time signatures) sets one column per value.
+    """
+    section, sub_field = ATTRIBUTE_FIELDS[field]
+    titles = list(score_dictionary) if titles is None else list(titles)
+
+    column = {}
+    rows, columns, counts = [], [], []
+
+    for i, next_title in enumerate(titles):
+        the_value = score_dictionary[next_title].get(section, {}).get(sub_field)
+        values = the_value if isinstance(the_value, (list, tuple)) else [the_value]
+
+        for next_value in set(values):
+            if next_value is not None:
+                rows.append(i)
+                columns.append(column.setdefault(next_value, len(column)))
+                counts.append(1)
+
+    return _matrix(field, titles, rows, columns, list(column), counts, sparse)
+#
+#-----------------------------------------------------------------------------------------------
+def feature_engine(score_dictionary, sparse=None):
+    """
+    Build every feature and attribute matrix of the Score Dictionary over the same rows of titles.
+    """
+    titles = list(score_dictionary)
+    engine = {'Titles': titles}
+
+    for next_field in TYPE_FIELDS:
+        engine[next_field] = build_feature_matrix(score_dictionary, next_field, titles=titles, sparse=sparse)
+
+    for next_field in ATTRIBUTE_FIELDS:
+        engine[next_field] = build_attribute_matrix(score_dictionary, next_field, titles=titles, sparse=sparse)
+
+    return engine
+#
+#-----------------------------------------------------------------------------------------------
+def dense_counts(matrix, mask=None):
+    """
+    The counts of a matrix as a NumPy array, limited to the rows in mask if one is given.
+    """
+    the_counts = matrix['Counts']
+    if mask is not None:
+        the_counts = the_counts[numpy.flatnonzero(mask)]
+
+    if scipy_sparse is not None and scipy_sparse.issparse(the_counts):
+        return the_counts.toarray()
+
+    return numpy.asarray(the_counts)
+#
+#-----------------------------------------------------------------------------------------------
+def dense_counts_columns(matrix, the_columns):
+    """
+    The counts of some columns of a matrix as a NumPy array.
+    """
+    the_counts = matrix['Counts'][:, the_columns]
+
+    if scipy_sparse is not None and scipy_sparse.issparse(the_counts):
+        return the_counts.toarray()
+
+    return numpy.asarray(the_counts)
+#
+#-----------------------------------------------------------------------------------------------
+def feature_mask(matrix, *values):
+    """
+    Boolean mask of the scores which have any of the given values.  Combine masks with &, |, and ~.
+    """
+    mask = numpy.zeros(len(matrix['Titles']), dtype=bool)
+    the_columns = [matrix['Column'][next_value] for next_value in values if next_value in matrix['Column']]
+
+    if the_columns:
+        mask |= dense_counts_columns(matrix, the_columns).sum(axis=1) > 0
+
+    return mask
+#
+#-----------------------------------------------------------------------------------------------
+def totals(matrix, mask=None):
+    """
+    The total count of every feature over the scores in mask (or all scores).
+    """
+    the_counts = matrix['Counts']
+    if mask is not None:
+        the_counts = the_counts[numpy.flatnonzero(mask)]
+
+    return numpy.asarray(the_counts.sum(axis=0)).ravel()
+#
+#-----------------------------------------------------------------------------------------------
+def most_common(matrix, mask=None, n=10):
+    """
+    The n most common features over the scores in mask (or all scores), as [(feature, count)].
+    """
+    the_totals = totals(matrix, mask)
+    order = numpy.argsort(-the_totals, kind='stable')[:n]
+
+    return [(matrix['Features'][j], int(the_totals[j])) for j in order if the_totals[j] > 0]
+#
+#-----------------------------------------------------------------------------------------------
+def top_features(matrix, k, mask=None):
+    """
+    For each score (in mask), the column numbers of its k most frequent features.  Ties keep the order the features were first seen in.
+    Columns with a count of 0 are returned as -1.
+    """
+    the_counts = dense_counts(matrix, mask)
+    order = numpy.argsort(-the_counts, axis=1, kind='stable')[:, :k]
+    top = numpy.where(numpy.take_along_axis(the_counts, order, axis=1) > 0, order, -1)
+
+    return top
+#
+#-----------------------------------------------------------------------------------------------
+def scores_with_top(matrix, features, mask=None):
+    """
+    The titles of the scores whose len(features) most frequent features are exactly the given ones, in any order.
+    """
+    if any(next_feature not in matrix['Column'] for next_feature in features):
+        return []
+
+    k = len(features)
+    wanted = numpy.sort([matrix['Column'][next_feature] for next_feature in features])
+    rows = numpy.arange(len(matrix['Titles'])) if mask is None else numpy.flatnonzero(mask)
+
+    top = numpy.sort(top_features(matrix, k, mask), axis=1)
+    hits = numpy.all(top == wanted, axis=1)
+
+    return [matrix['Titles'][i] for i in rows[hits]]
+#
+#-----------------------------------------------------------------------------------------------
+def proportions(matrix, mask=None):
+    """
+    Each score's counts divided by its total, so long and short scores can be compared.
+    """
+    the_counts = dense_counts(matrix, mask).astype(float)
+    row_totals = the_counts.sum(axis=1, keepdims=True)
+
+    return numpy.divide(the_counts, row_totals, out=numpy.zeros_like(the_counts), where=row_totals > 0)
+
+#                                           MAIN
+#-----------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    from pprint         import pprint
+
+    from shard_store    import unpickle_shards
+
+    score_dictionary = unpickle_shards(be_verbose=False)
+    engine = feature_engine(score_dictionary)
+
+    print('Most common intervals in 6/8:')
+    pprint(most_common(engine['Intervals'], mask=feature_mask(engine['Time Signature'], '6/8'), n=5))
+
+    print('Top 3 solfege syllables are do, mi, sol:')
+    pprint(scores_with_top(engine['Solfege'], ['do', 'mi', 'sol']))
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Song Search File Fingerprints
+written by: Song Search contributors
+created on: 18 October 2026
+
+Cheap, reliable change detection for score files.  Each score's File Information carries a fingerprint in this format:
+
+    { Fingerprint:
+        { Size:      bytes,
+          Mtime NS:  modification time in nanoseconds,
+          Inode:     inode number,
+          Hash:      BLAKE2b of the file contents (None until it is needed)
+        }
+    }
+
+The stat fields are compared first.  The file is only read and hashed when one of them differs, so a Dropbox sync which rewrites
+modification times without changing the music is not mistaken for an edit.
+
+musical_hash() hashes only the music of a score (its parts, without layout), so Family variants which differ from their lead sheet in
+nothing but the title, credits, or engraving can share its analysis.
+
+Standard library only, so tools which never parse a score can import it without Music21.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import hashlib
+
+from xml.etree      import ElementTree
+
+from fast_xml       import open_musicxml
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+HASH_BLOCK_SIZE     = 1 << 20
+
+# The stat fields which must all match for a file to count as unchanged without hashing it.
+STAT_FIELDS         = ('Size', 'Mtime NS', 'Inode')
+
+# MusicXML elements which only change how a score looks.  musical_hash() skips them, and everything in them.
+LAYOUT_TAGS         = frozenset(['print', 'stem', 'beam', 'notehead', 'system-layout', 'staff-layout', 'measure-layout', 'staff-details',
+                                 'measure-numbering', 'footnote', 'level'])
+
+# The only attributes musical_hash() looks at.  The others are positions, colours, fonts and the like.
+MUSICAL_ATTRIBUTES  = ('type', 'number', 'direction', 'location', 'measure', 'times')
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def content_hash(score_path):
+    """
+    Hash the contents of a file.
+    """
+    the_hash = hashlib.blake2b(digest_size=20)
+
+    with open(score_path, 'rb') as the_file:
+        for block in iter(lambda: the_file.read(HASH_BLOCK_SIZE), b''):
+            the_hash.update(block)
+
+    return the_hash.hexdigest()
+#
+#-----------------------------------------------------------------------------------------------
+def file_fingerprint(score_path, file_stat=None, with_hash=False):
+    """
+    Build the fingerprint of a file.  Pass file_stat if the file has already been stat'ed.  The Hash is only computed if with_hash is True.
+    """
+    if file_stat is None:
+        file_stat = os.stat(score_path)
+
+    return {'Size':     file_stat.st_size,
+            'Mtime NS': file_stat.st_mtime_ns,
+            'Inode':    file_stat.st_ino,
+            'Hash':     content_hash(score_path) if with_hash else None}
+#
+#-----------------------------------------------------------------------------------------------
+def file_changed(old_fingerprint, score_path, file_stat=None):
+    """
+    Compare a stored fingerprint with the file on disk.
+
+    Returns (changed, fingerprint) where fingerprint is the file's current fingerprint, with its Hash filled in whenever it had to be
+    computed (or carried over from the old fingerprint when the stat fields match).
+    """
+    new_fingerprint = file_fingerprint(score_path, file_stat=file_stat)
+
+    # Same size, modification time, and inode: unchanged, and the stored hash still holds.
+    if old_fingerprint and all(old_fingerprint.get(field) == new_fingerprint[field] for field in STAT_FIELDS):
+        new_fingerprint['Hash'] = old_fingerprint.get('Hash')
+        return False, new_fingerprint
+
+    # Something differs.  Only the contents can tell whether the file was really edited.
+    new_fingerprint['Hash'] = content_hash(score_path)
+
+    if old_fingerprint and old_fingerprint.get('Hash') == new_fingerprint['Hash']:
+        return False, new_fingerprint
+
+    return True, new_fingerprint
+#
+#-----------------------------------------------------------------------------------------------
+def musical_hash(score_path):
+    """
+    Hash the music of a score file: every <part>, with its notes, attributes, directions, lyrics, and so on, but not the layout
+    elements (LAYOUT_TAGS), the non-musical attributes, or anything outside the parts (title, credits, part names).  Returns None if
+    the file cannot be read.
+    """
+    try:
+        with open_musicxml(score_path) as the_file:
+            root = ElementTree.parse(the_file).getroot()
+
+    except Exception:
+        return None
+
+    the_hash = hashlib.blake2b(digest_size=20)
+
+    for next_part in root.iter('part'):
+        # Depth-first, with each element's depth, so the same elements in a different nesting hash differently.
+        stack = [(next_part, 0)]
+        while stack:
+            element, depth = stack.pop()
+            if element.tag in LAYOUT_TAGS:
+                continue
+
+            attributes = ' '.join(f'{name}={element.get(name)}' for name in MUSICAL_ATTRIBUTES if element.get(name) is not None)
+            the_hash.update(f'{depth}<{element.tag} {attributes}>{(element.text or "").strip()}\n'.encode('utf-8'))
+
+            stack.extend((child, depth + 1) for child in reversed(element))
+
+    return the_hash.hexdigest()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Song Search Key Engine
+written by: Song Search contributors
+created on: 18 October 2026
+
+Key finding without Music21's analyze().  The Krumhansl-Schmuckler family of methods (music21.analysis.discrete) each correlate a
+score's pitch-class histogram (every note's pitch classes, weighted by its length in quarters) with 24 rotated key profiles and pick
+the key with the highest correlation.  The histogram is the same for every method, so it is built once per score (see
+pitch_data.key_signature) and correlated with every profile of every method in a single matrix multiply:
+
+    correlations = centred histograms  @  normalized profiles.T  /  histogram norms          # (scores, methods x 24 keys)
+
+Ties, enharmonic spelling (G# major is A- major; every other tonic keeps Music21's default spelling), and names ('E- major',
+'f# minor') follow Music21, so the answers match parsed.analyze('key.krumhanslschmuckler') and parsed.analyze('key') (Aarden-Essen).
+
+    key_names(histogram)                        -> {method: key name}
+    corpus_keys(score_dictionary)               -> {title: {method: key name}}, from the stored Pitch -> Pitch Classes
+
+Needs NumPy only.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import numpy
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+# Major and minor profiles of each method, tonic first (music21.analysis.discrete).
+KEY_PROFILES        = {'Krumhansl Schmuckler':    ([6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88],
+                                                   [6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17]),
+                       'Aarden Essen':            ([17.7661, 0.145624, 14.9265, 0.160186, 19.8049, 11.3587, 0.291248, 22.062, 0.145624,
+                                                    8.15494, 0.232998, 4.95122],
+                                                   [18.2648, 0.737619, 14.0499, 16.8599, 0.702494, 14.4362, 0.702494, 18.6161, 4.56621,
+                                                    1.93186, 7.37619, 1.75623]),
+                       'Bellman Budge':           ([16.80, 0.86, 12.95, 1.41, 13.49, 11.93, 1.25, 20.28, 1.80, 8.04, 0.62, 10.57],
+                                                   [18.16, 0.69, 12.99, 13.34, 1.07, 11.15, 1.38, 21.07, 7.49, 1.53, 0.92, 10.21]),
+                       'Temperley Kostka Payne':  ([0.748, 0.060, 0.488, 0.082, 0.670, 0.460, 0.096, 0.715, 0.104, 0.366, 0.057, 0.400],
+                                                   [0.712, 0.084, 0.474, 0.618, 0.049, 0.460, 0.105, 0.747, 0.404, 0.067, 0.133, 0.330])}
+
+# Music21's analyze() names for the methods key_signature() uses.
+KRUMHANSL           = 'Krumhansl Schmuckler'        # analyze('key.krumhanslschmuckler')
+AARDEN              = 'Aarden Essen'                # analyze('key')
+
+# Music21's spelling of each pitch class, and the tonics it respells (keysValidMajor / keysValidMinor).
+TONIC_NAMES         = ['C', 'C#', 'D', 'E-', 'E', 'F', 'F#', 'G', 'G#', 'A', 'B-', 'B']
+MAJOR_RESPELLING    = {'G#': 'A-'}
+MINOR_RESPELLING    = {}
+
+# The 24 candidate keys of each method as (pitch class, mode), in the order Music21 prefers them when two correlate equally:
+# the higher pitch class first, then minor before major.  numpy.argmax() returns the first of equal values.
+KEY_ORDER           = [(pc, mode) for pc in range(11, -1, -1) for mode in ('minor', 'major')]
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def key_name(pc, mode):
+    """
+    Music21's name of a key, e.g. (3, 'major') is 'E- major' and (6, 'minor') is 'f# minor'.
+    """
+    tonic = TONIC_NAMES[pc]
+    tonic = (MAJOR_RESPELLING if mode == 'major' else MINOR_RESPELLING).get(tonic, tonic)
+
+    return f'{tonic.lower() if mode == "minor" else tonic} {mode}'
+#
+#-----------------------------------------------------------------------------------------------
+def _profile_matrix():
+    """
+    Every key of every method as a centred, unit-length row: (methods x 24, 12).  The row of a key with tonic pc holds the profile
+    rotated so that its first weight falls on pc.
+    """
+    rows = []
+    for major, minor in KEY_PROFILES.values():
+        for pc, mode in KEY_ORDER:
+            weights = numpy.asarray(major if mode == 'major' else minor, dtype=float)
+            rotated = numpy.roll(weights, pc)
+            centred = rotated - rotated.mean()
+            rows.append(centred / numpy.sqrt((centred ** 2).sum()))
+
+    return numpy.vstack(rows)
+
+PROFILE_MATRIX      = _profile_matrix()
+#
+#-----------------------------------------------------------------------------------------------
+def key_correlations(histograms):
+    """
+    The correlation of each histogram with each key of each method: (scores, methods, 24), keys in KEY_ORDER.  A histogram with no
+    spread (e.g. all zeros) correlates 0 with everything.
+    """
+    histograms = numpy.atleast_2d(numpy.asarray(histograms, dtype=float))
+    centred = histograms - histograms.mean(axis=1, keepdims=True)
+    norms = numpy.sqrt((centred ** 2).sum(axis=1, keepdims=True))
+
+    correlations = numpy.divide(centred @ PROFILE_MATRIX.T, norms, out=numpy.zeros((len(histograms), len(PROFILE_MATRIX))), where=norms > 0)
+
+    return correlations.reshape(len(histograms), len(KEY_PROFILES), len(KEY_ORDER))
+#
+#-----------------------------------------------------------------------------------------------
+def batch_keys(histograms):
+    """
+    The best key of each method for each histogram: [{method: key name}], one per histogram.
+    """
+    best = key_correlations(histograms).argmax(axis=2)
+
+    return [{method: key_name(*KEY_ORDER[k]) for method, k in zip(KEY_PROFILES, row)} for row in best]
+#
+#-----------------------------------------------------------------------------------------------
+def key_names(histogram):
+    """
+    The best key of each method for one histogram: {method: key name}.
+    """
+    return batch_keys([histogram])[0]
+#
+#-----------------------------------------------------------------------------------------------
+def pitch_class_histogram(pitch_classes):
+    """
+    Build a histogram from (quarter length, pitch classes) pairs: each pitch class gets the length of every note or chord it is in.
+    """
+    histogram = [0.0] * 12
+    for length, classes in pitch_classes:
+        for pc in classes:
+            histogram[pc] += length
+
+    return histogram
+#
+#-----------------------------------------------------------------------------------------------
+def corpus_keys(score_dictionary):
+    """
+    Re-run every method over the whole corpus from the stored histograms (Pitch -> Pitch Classes), without parsing a score:
+    {title: {method: key name}}.  Unpitched scores are left out.
+    """
+    titles = [next_title for next_title, entry in score_dictionary.items() if (entry.get('Pitch') or {}).get('Pitch Classes')]
+    histograms = [score_dictionary[next_title]['Pitch']['Pitch Classes'] for next_title in titles]
+
+    if not titles:
+        return {}
+
+    return dict(zip(titles, batch_keys(histograms)))
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Song Search Melody Index
+written by: Song Search contributors
+created on: 18 October 2026
+
+Find melodies without scanning every score.  Each part's interval and contour sequences (Pitch -> Intervals / Contour -> All) are
+cut into n-grams, and every n-gram points at the places it occurs.  Intervals and contours do not change when a melody is
+transposed, so a tune is found in any key.
+
+    { N:          length of the n-grams,
+      Sequences:  { field: { (title, part): sequence } },
+      Grams:      { field: { n-gram: [(title, part, offset), ...] } },
+      Suffixes:   { field: suffix array } (only if asked for, see build_suffix_array())
+    }
+
+The last few offsets of a sequence get shorter n-grams, so every note offset is in the index.  A search looks up the rarest n-gram
+of the query and checks the candidates against the whole query:
+
+    find_melody(melody_index, 'M2 M2 m3')                                   # every song containing M2 M2 m3
+    find_melody(melody_index, 'M2 M2 m3', contour='up up down')             # ... going up, up, down
+    find_melody(melody_index, 'P4 M2 M2 m2 M2', incipit=True)               # songs which open like this
+    find_melody(melody_index, 'P4 M2 M2 m2 M2', mismatches=1)               # ... with at most one interval different
+
+Results are sorted (title, part, offset) tuples, the offset counting intervals from the start of the part.
+
+Standard library only.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import pickle
+
+from bisect         import bisect_right
+
+from score_paths    import MELODY_DATAPATH
+from score_index    import save_score_index
+from score_index    import load_score_index
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+MELODY_NGRAM        = 3
+
+# Sequence fields which are indexed: field: (section, sub-field)
+MELODY_FIELDS       = {'Intervals':   ('Pitch', 'Intervals'),
+                       'Contour':     ('Pitch', 'Contour')}
+
+# A suffix array sorts its suffixes by this many symbols.  Longer queries are searched by their first SUFFIX_WINDOW symbols, and each
+# hit is then checked against the whole query.
+SUFFIX_WINDOW       = 32
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def melody_sequences(entry, field):
+    """
+    The sequences of one Score Dictionary entry for a field: {part: sequence}.  Unpitched parts are left out.
+    """
+    section, sub_field = MELODY_FIELDS[field]
+    the_parts = ((entry.get(section) or {}).get(sub_field) or {}).get('All') or {}
+
+    return {next_part: sequence for next_part, sequence in the_parts.items() if sequence}
+#
+#-----------------------------------------------------------------------------------------------
+def _add_title(melody_index, next_title, entry):
+    """
+    Add the sequences of one entry and their n-grams to the index.
+    """
+    n = melody_index['N']
+
+    for next_field in MELODY_FIELDS:
+        field_grams = melody_index['Grams'].setdefault(next_field, {})
+        field_sequences = melody_index['Sequences'].setdefault(next_field, {})
+
+        for next_part, sequence in melody_sequences(entry, next_field).items():
+            field_sequences[(next_title, next_part)] = sequence
+            words = list(sequence)
+
+            for offset in range(len(words)):
+                field_grams.setdefault(tuple(words[offset:offset + n]), []).append((next_title, next_part, offset))
+#
+#-----------------------------------------------------------------------------------------------
+def _remove_title(melody_index, next_title):
+    """
+    Take one title's sequences and n-grams out of the index.
+    """
+    n = melody_index['N']
+
+    for next_field, field_sequences in melody_index['Sequences'].items():
+        field_grams = melody_index['Grams'].get(next_field, {})
+
+        for next_key in [k for k in field_sequences if k[0] == next_title]:
+            words = list(field_sequences.pop(next_key))
+
+            for next_gram in {tuple(words[offset:offset + n]) for offset in range(len(words))}:
+                postings = [hit for hit in field_grams.get(next_gram, ()) if hit[0] != next_title]
+                if postings:
+                    field_grams[next_gram] = postings
+                else:
+                    field_grams.pop(next_gram, None)
+#
+#-----------------------------------------------------------------------------------------------
+def build_melody_index(score_dictionary, n=MELODY_NGRAM, suffix_array=False):
+    """
+    Build the melody index of a whole Score Dictionary in one pass.  With suffix_array=True a suffix array of each field is built as well.
+    """
+    melody_index = {'N': n, 'Sequences': {}, 'Grams': {}, 'Suffixes': {}}
+
+    for next_title, entry in score_dictionary.items():
+        _add_title(melody_index, next_title, entry)
+
+    if suffix_array:
+        for next_field in MELODY_FIELDS:
+            build_suffix_array(melody_index, next_field)
+
+    return melody_index
+#
+#-----------------------------------------------------------------------------------------------
+def update_melody_index(melody_index, score_dictionary, titles=(), deleted=()):
+    """
+    Patch the index after an incremental update: re-index the given titles and drop the deleted ones.  Suffix arrays are rebuilt.
+    """
+    for next_title in set(titles) | set(deleted):
+        _remove_title(melody_index, next_title)
+
+    for next_title in titles:
+        if next_title in score_dictionary:
+            _add_title(melody_index, next_title, score_dictionary[next_title])
+
+    for next_field in list(melody_index['Suffixes']):
+        build_suffix_array(melody_index, next_field)
+
+    return melody_index
+#
+#-----------------------------------------------------------------------------------------------
+def refresh_melody_index(score_dictionary, titles=None, deleted=(), index_path=None):
+    """
+    Bring the saved melody index up to date.  With titles=None (or no saved index) it is rebuilt, otherwise only the given titles are
+    re-indexed and the deleted ones dropped.  (The index is pickled the same way as the score index.)
+    """
+    melody_index = None
+    index_path = index_path or MELODY_DATAPATH
+
+    if titles is not None:
+        try:
+            melody_index = update_melody_index(load_score_index(index_path), score_dictionary, titles=titles, deleted=deleted)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            melody_index = None
+
+    if melody_index is None:
+        melody_index = build_melody_index(score_dictionary)
+
+    save_score_index(melody_index, index_path)
+    return melody_index
+#
+#-----------------------------------------------------------------------------------------------
+def load_melody_index(index_path=None):
+    """
+    Unpickle the melody index.
+    """
+    return load_score_index(index_path or MELODY_DATAPATH)
+#
+#-----------------------------------------------------------------------------------------------
+def build_suffix_array(melody_index, field):
+    """
+    Build the suffix array of one field: every sequence is turned into integer codes and joined, with -1 between sequences, and the
+    start of every suffix is sorted by its first SUFFIX_WINDOW codes.  An exact search is then two binary searches, plus a check of
+    each hit when the query is longer than SUFFIX_WINDOW.
+
+        { Words:   {word: code},
+          Text:    [codes of every sequence, -1 after each],
+          Starts:  [where each sequence starts in Text],
+          Keys:    [(title, part) of each sequence],
+          Order:   [positions in Text, sorted by the suffix starting there]
+        }
+    """
+    words, text, starts, keys = {}, [], [], []
+
+    for next_key, sequence in melody_index['Sequences'].get(field, {}).items():
+        starts.append(len(text))
+        keys.append(next_key)
+        text.extend(words.setdefault(next_word, len(words)) for next_word in sequence)
+        text.append(-1)
+
+    order = [i for i in range(len(text)) if text[i] != -1]
+    order.sort(key=lambda i: text[i:i + SUFFIX_WINDOW])
+
+    melody_index['Suffixes'][field] = {'Words': words, 'Text': text, 'Starts': starts, 'Keys': keys, 'Order': order}
+    return melody_index['Suffixes'][field]
+#
+#-----------------------------------------------------------------------------------------------
+def _suffix_search(suffixes, query):
+    """
+    Every (title, part, offset) where query starts, found with the suffix array.
+    """
+    try:
+        the_codes = [suffixes['Words'][next_word] for next_word in query]
+    except KeyError:
+        return set()
+
+    # The suffixes are only sorted by their first SUFFIX_WINDOW codes, so only that much of the query can be binary searched.
+    text, order, m = suffixes['Text'], suffixes['Order'], min(len(the_codes), SUFFIX_WINDOW)
+    prefix = the_codes[:m]
+
+    # First suffix which is not smaller than the query.
+    low, high = 0, len(order)
+    while low < high:
+        middle = (low + high) // 2
+        if text[order[middle]:order[middle] + m] < prefix:
+            low = middle + 1
+        else:
+            high = middle
+    first = low
+
+    # First suffix past those starting with the query.
+    high = len(order)
+    while low < high:
+        middle = (low + high) // 2
+        if text[order[middle]:order[middle] + m] == prefix:
+            low = middle + 1
+        else:
+            high = middle
+
+    found = set()
+    for position in order[first:low]:
+        # Text holds the codes of the sequences themselves, with -1 between them, so this is the check against the sequence.
+        if len(the_codes) > m and text[position:position + len(the_codes)] != the_codes:
+            continue
+        i = bisect_right(suffixes['Starts'], position) - 1
+        next_title, next_part = suffixes['Keys'][i]
+        found.add((next_title, next_part, position - suffixes['Starts'][i]))
+
+    return found
+#
+#-----------------------------------------------------------------------------------------------
+def _candidates(melody_index, field, piece):
+    """
+    Every (title, part, offset) where piece starts, from the n-gram postings.  Pieces shorter than N match the start of longer n-grams.
+    """
+    n = melody_index['N']
+    field_grams = melody_index['Grams'].get(field, {})
+
+    if len(piece) < n:
+        piece = tuple(piece)
+        return {hit for next_gram, postings in field_grams.items() if next_gram[:len(piece)] == piece for hit in postings}
+
+    # Look up the rarest n-gram of the piece and line its hits up with the start of the piece.
+    grams = [(len(field_grams.get(tuple(piece[j:j + n]), ())), j) for j in range(len(piece) - n + 1)]
+    size, j = min(grams)
+
+    return {(next_title, next_part, offset - j) for next_title, next_part, offset in field_grams.get(tuple(piece[j:j + n]), ())
+            if offset >= j}
+#
+#-----------------------------------------------------------------------------------------------
+def _mismatches(sequence, offset, query, limit):
+    """
+    How many symbols of sequence starting at offset differ from query, or limit + 1 once there are too many (or it runs off the end).
+    """
+    window = sequence[offset:offset + len(query)]
+    if len(window) < len(query):
+        return limit + 1
+
+    count = 0
+    for have, want in zip(window, query):
+        if have != want:
+            count += 1
+            if count > limit:
+                break
+
+    return count
+#
+#-----------------------------------------------------------------------------------------------
+def search_field(melody_index, field, query, mismatches=0, incipit=False):
+    """
+    Every (title, part, offset) where a field's sequence matches query with at most mismatches symbols different.  With incipit=True
+    only matches at the very start of a part count.
+
+    An approximate search splits the query into mismatches + 1 pieces; at least one of them has to match exactly, so its hits are the
+    only candidates to check.
+    """
+    query = query.split() if isinstance(query, str) else list(query)
+    if not query:
+        return set()
+
+    if mismatches == 0 and field in melody_index['Suffixes']:
+        found = _suffix_search(melody_index['Suffixes'][field], query)
+        return {hit for hit in found if hit[2] == 0} if incipit else found
+
+    pieces = min(mismatches + 1, len(query))
+    bounds = [len(query) * k // pieces for k in range(pieces + 1)]
+
+    candidates = set()
+    for start, end in zip(bounds, bounds[1:]):
+        candidates |= {(next_title, next_part, offset - start) for next_title, next_part, offset in _candidates(melody_index, field, query[start:end])}
+
+    field_sequences = melody_index['Sequences'].get(field, {})
+    found = set()
+    for next_title, next_part, offset in candidates:
+        if offset < 0 or (incipit and offset != 0):
+            continue
+        if _mismatches(field_sequences[(next_title, next_part)], offset, query, mismatches) <= mismatches:
+            found.add((next_title, next_part, offset))
+
+    return found
+#
+#-----------------------------------------------------------------------------------------------
+def find_melody(melody_index, intervals=None, contour=None, mismatches=0, incipit=False):
+    """
+    Search by interval names (e.g. 'M2 M2 m3'), by contour (e.g. 'up up down'), or both, in which case a match has to have both at
+    the same place.  mismatches and incipit apply to each.  Returns a sorted list of (title, part, offset).
+    """
+    found = None
+
+    for next_field, query in (('Intervals', intervals), ('Contour', contour)):
+        if query:
+            matches = search_field(melody_index, next_field, query, mismatches=mismatches, incipit=incipit)
+            found = matches if found is None else found & matches
+
+    return sorted(found or ())
+
+#                                           MAIN
+#-----------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    from pprint         import pprint
+
+    melody_index = load_melody_index()
+
+    print('Songs containing M2 M2 m3:')
+    pprint(find_melody(melody_index, 'M2 M2 m3'))
+
+    print('Songs opening with a rising P4:')
+    pprint(find_melody(melody_index, 'P4', contour='up', incipit=True))
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Song Search Metadata Cache
+written by: Song Search contributors
+created on: 18 October 2026
+
+Keep the 'scoreLibrary' metadata cache up to date one file at a time.  rebuildMetadataCache() throws the whole bundle away and parses
+every score in the corpus again; this changes only the entries of the files which changed:
+
+    ensure_corpus()                                         register the LocalCorpus, only if it is not registered already
+    update_metadata_entries(added, removed, workers)        drop the removed paths' entries, parse the added paths' metadata
+                                                            (a modified file is in both), and save the bundle
+
+New metadata is parsed with Music21's own MetadataCachingJob, in a pool of workers processes when there is more than one file.
+The bundle is written the way MetadataBundle.write() does (a gzipped pickle), but to a temporary file which is then moved into place,
+so readers never see half a cache.  The cache it replaces is kept as old_cache.json.
+
+If there is no cache yet, the whole cache is built (build_metadata_cache()).
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import gzip
+import pickle
+import shutil
+import tempfile
+
+from pathlib                import Path
+from concurrent.futures     import ProcessPoolExecutor
+
+from music21                import corpus
+from music21                import metadata
+
+from score_paths            import CORPUS_FILEPATH
+from score_paths            import CACHE_FILEPATH
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+CORPUS_NAME         = 'scoreLibrary'
+CACHE_NAME          = 'our_corpus_cache.json'
+BACKUP_NAME         = 'old_cache.json'
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def ensure_corpus():
+    """
+    Register the LocalCorpus for the Score Library, with its cache in CACHE_FILEPATH.  Nothing is changed (or written to Music21's
+    settings) if it is already registered that way.
+    """
+    our_corpus = corpus.corpora.LocalCorpus(CORPUS_NAME)
+    cache_path = Path(CACHE_FILEPATH).joinpath(CACHE_NAME)
+
+    if not our_corpus.existsInSettings or Path(CORPUS_FILEPATH) not in [Path(p) for p in our_corpus.directoryPaths]:
+        our_corpus.addPath(CORPUS_FILEPATH)
+        our_corpus.save()
+
+    if our_corpus.cacheFilePath != cache_path:
+        our_corpus.cacheFilePath = cache_path
+
+    return our_corpus
+#
+#-----------------------------------------------------------------------------------------------
+def metadata_key(score_path):
+    """
+    The key of a file's entry in the bundle, as Music21 makes it.
+    """
+    return metadata.bundles.MetadataBundle.corpusPathToKey(Path(score_path))
+#
+#-----------------------------------------------------------------------------------------------
+def parse_metadata(score_path):
+    """
+    The metadata entries of one file, and the paths which could not be parsed.  Runs in the worker processes.
+    """
+    job = metadata.caching.MetadataCachingJob(Path(score_path), parseUsingCorpus=False, corpusName=CORPUS_NAME)
+
+    return job.run()
+#
+#-----------------------------------------------------------------------------------------------
+def write_bundle(the_bundle, cache_path):
+    """
+    Save a bundle as MetadataBundle.write() does, but atomically.  The file it replaces is kept as BACKUP_NAME.
+    """
+    cache_path = Path(cache_path)
+
+    # The corpus client cannot be pickled.
+    stored_corpus, the_bundle._corpus = the_bundle._corpus, None
+    try:
+        uncompressed = pickle.dumps(the_bundle, protocol=5)
+    finally:
+        the_bundle._corpus = stored_corpus
+
+    os.makedirs(cache_path.parent, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as raw_file:
+            with gzip.GzipFile(fileobj=raw_file, mode='wb') as the_file:
+                the_file.write(uncompressed)
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+
+        # A second link to the old cache keeps it as the backup, without copying it.
+        if cache_path.exists():
+            backup_path = cache_path.with_name(BACKUP_NAME)
+            backup_temp = cache_path.with_name(BACKUP_NAME + '.tmp')
+            try:
+                if backup_temp.exists():
+                    backup_temp.unlink()
+                os.link(cache_path, backup_temp)
+            except OSError:
+                shutil.copy2(cache_path, backup_temp)
+            os.replace(backup_temp, backup_path)
+
+        os.replace(temp_path, cache_path)
+
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+#
+#-----------------------------------------------------------------------------------------------
+def update_metadata_entries(added=(), removed=(), workers=1):
+    """
+    Bring the metadata cache up to date: remove the entries of the removed paths and parse the added ones.  A modified file belongs in
+    both.  workers > 1 (or None for one per CPU) parses the added files in a process pool.
+
+    Returns the paths which could not be parsed.
+    """
+    from music21_globals import build_metadata_cache
+
+    our_corpus = ensure_corpus()
+    the_bundle = our_corpus.metadataBundle
+
+    if not our_corpus.cacheFilePath.exists():
+        build_metadata_cache()
+        return []
+
+    the_bundle.read()
+
+    for next_path in removed:
+        the_bundle._metadataEntries.pop(metadata_key(next_path), None)
+
+    added = [str(next_path) for next_path in dict.fromkeys(added)]
+    if workers == 1 or len(added) < 2:
+        results = map(parse_metadata, added)
+    else:
+        pool = ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(added)))
+        results = pool.map(parse_metadata, added)
+
+    failed = []
+    try:
+        for entries, errors in results:
+            for next_entry in entries:
+                the_bundle._metadataEntries[next_entry.corpusPath] = next_entry
+            failed += [str(next_path) for next_path in errors]
+    finally:
+        if workers != 1 and len(added) >= 2:
+            pool.shutdown()
+
+    write_bundle(the_bundle, our_corpus.cacheFilePath)
+
+    return failed
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Song Search Mongo Store
+written by: Song Search contributors
+created on: 18 October 2026
+
+Load the Score Dictionary into MongoDB: one document per score, keyed on the title (_id), with the Music21 stream left out.
+
+    load_mongo(score_dictionary)                                    # the whole corpus: clear, then insert_many(ordered=False)
+    load_mongo(score_dictionary, titles=changed, deleted=gone)      # after an incremental update: ReplaceOne upserts + deletes
+
+Writes go out in batches of MONGO_BATCH_SIZE, and a batch which fails with a connection error is retried (MONGO_RETRIES times, waiting
+longer each time).  Documents which did get in before a failure come back as duplicate keys on the retry and are skipped.
+Clients are pooled, one per URI, for the life of the process.
+
+The database is only used if MONGO_URI is set (or the SCORE_MONGO_URI environment variable).  pymongo is optional: without it, or
+for testing, pass a FileCollection, a stand-in which keeps its documents in a JSON file (written once, when load_mongo() is done).
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import json
+import time
+import tempfile
+
+from numbers        import Integral
+from numbers        import Real
+
+try:
+    import pymongo
+    from pymongo        import ReplaceOne
+    from pymongo        import DeleteMany
+    from pymongo.errors import BulkWriteError
+    from pymongo.errors import ConnectionFailure
+except ImportError:
+    pymongo = None
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+MONGO_URI           = os.environ.get('SCORE_MONGO_URI')
+MONGO_DATABASE      = 'song_search'
+MONGO_COLLECTION    = 'scores'
+
+MONGO_BATCH_SIZE    = 1000
+MONGO_POOL_SIZE     = 10
+MONGO_RETRIES       = 3
+MONGO_RETRY_DELAY   = 0.5
+
+# MongoDB's duplicate key error.
+DUPLICATE_KEY       = 11000
+
+# One client per URI.  A MongoClient holds its own connection pool and is safe to share.
+_CLIENTS            = {}
+
+#                                            CLASSES
+#-----------------------------------------------------------------------------------------------
+if pymongo is None:
+
+    class BulkWriteError(Exception):
+        """
+        Stand-in for pymongo.errors.BulkWriteError: details['writeErrors'] lists the documents which failed.
+        """
+        def __init__(self, details):
+            super().__init__('batch op errors occurred')
+            self.details = details
+
+    class ConnectionFailure(Exception):
+        """
+        Stand-in for pymongo.errors.ConnectionFailure.
+        """
+
+    class ReplaceOne:
+        """
+        Stand-in for pymongo.ReplaceOne.
+        """
+        def __init__(self, filter, replacement, upsert=False):
+            self._filter, self._doc, self._upsert = filter, replacement, upsert
+
+    class DeleteMany:
+        """
+        Stand-in for pymongo.DeleteMany.
+        """
+        def __init__(self, filter):
+            self._filter = filter
+#
+#-----------------------------------------------------------------------------------------------
+class FileCollection:
+    """
+    A file-backed stand-in for a pymongo Collection, with the parts the loader uses: insert_many, bulk_write, delete_many, find,
+    find_one, and count_documents.  Filters can match fields by value or with $in / $nin.
+
+    Writes only change the documents in memory: save() rewrites the file, once for any number of writes.  load_mongo() saves when it
+    is done, and so does leaving a with block.
+    """
+    def __init__(self, path):
+        self.path = str(path)
+        self._changed = False
+        try:
+            with open(self.path, encoding='utf-8') as the_file:
+                self.documents = json.load(the_file)
+        except FileNotFoundError:
+            self.documents = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.save()
+
+    def save(self):
+        """
+        Write the documents to the file, if they have changed since it was last written.
+        """
+        if not self._changed:
+            return
+
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', suffix='.tmp')
+        with os.fdopen(handle, 'w', encoding='utf-8') as the_file:
+            json.dump(self.documents, the_file, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self._changed = False
+
+    @staticmethod
+    def _matches(document, filter):
+        for next_field, wanted in (filter or {}).items():
+            have = document.get(next_field)
+            if isinstance(wanted, dict) and '$in' in wanted:
+                if have not in wanted['$in']:
+                    return False
+            elif isinstance(wanted, dict) and '$nin' in wanted:
+                if have in wanted['$nin']:
+                    return False
+            elif have != wanted:
+                return False
+        return True
+
+    def insert_many(self, documents, ordered=True):
+        errors = []
+        for i, next_document in enumerate(documents):
+            if next_document['_id'] in self.documents:
+                errors.append({'index': i, 'code': DUPLICATE_KEY, 'errmsg': 'E11000 duplicate key error'})
+                if ordered:
+                    break
+            else:
+                self.documents[next_document['_id']] = next_document
+                self._changed = True
+        if errors:
+            raise BulkWriteError({'writeErrors': errors})
+
+    def bulk_write(self, requests, ordered=True):
+        for next_request in requests:
+            if isinstance(next_request, DeleteMany):
+                self.delete_many(next_request._filter)
+            elif next_request._upsert or next_request._filter['_id'] in self.documents:
+                self.documents[next_request._filter['_id']] = dict(next_request._doc, _id=next_request._filter['_id'])
+                self._changed = True
+
+    def delete_many(self, filter):
+        for next_id in [k for k, document in self.documents.items() if self._matches(document, filter)]:
+            del self.documents[next_id]
+            self._changed = True
+
+    def find(self, filter=None):
+        return [document for document in self.documents.values() if self._matches(document, filter)]
+
+    def find_one(self, filter=None):
+        found = self.find(filter)
+        return found[0] if found else None
+
+    def count_documents(self, filter):
+        return len(self.find(filter))
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def mongo_client(uri=None):
+    """
+    The pooled client for a URI, created the first time it is asked for.
+    """
+    uri = uri or MONGO_URI
+
+    if pymongo is None:
+        raise ImportError('pymongo is needed to connect to MongoDB.  Use a FileCollection for testing.')
+
+    if uri not in _CLIENTS:
+        _CLIENTS[uri] = pymongo.MongoClient(uri, maxPoolSize=MONGO_POOL_SIZE, retryWrites=True)
+
+    return _CLIENTS[uri]
+#
+#-----------------------------------------------------------------------------------------------
+def scores_collection(uri=None):
+    """
+    The collection the Score Dictionary is loaded into.
+    """
+    return mongo_client(uri)[MONGO_DATABASE][MONGO_COLLECTION]
+#
+#-----------------------------------------------------------------------------------------------
+def _plain(value):
+    """
+    A value as plain BSON-friendly data: sequences (e.g. CodedSequence) become lists, Fractions floats, and paths strings.
+    """
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+
+    if value is None or isinstance(value, (str, bool, Integral)):
+        return value
+
+    if isinstance(value, Real):
+        return float(value)
+
+    if isinstance(value, (set, frozenset)):
+        return sorted((_plain(v) for v in value), key=str)
+
+    if isinstance(value, (list, tuple)) or hasattr(value, '__len__') and hasattr(value, '__getitem__'):
+        # Most sequences are letter names, intervals, etc., which need no converting.
+        items = list(value)
+        if all(type(v) is str for v in items):
+            return items
+        return [_plain(v) for v in items]
+
+    return str(value)
+#
+#-----------------------------------------------------------------------------------------------
+def score_document(title, entry):
+    """
+    The document of one Score Dictionary entry.  The stream is left out.
+    """
+    document = {'_id': title, 'Title': title}
+
+    for next_section, the_section in entry.items():
+        if next_section == 'File Information':
+            the_section = {k: v for k, v in the_section.items() if k != 'Stream'}
+        document[next_section] = _plain(the_section)
+
+    return document
+#
+#-----------------------------------------------------------------------------------------------
+def _with_retries(write, batch):
+    """
+    Run write(batch), retrying after a connection error.  Duplicate keys (documents which got in on an earlier try) are not errors;
+    other failed documents are retried on their own.
+    """
+    for attempt in range(MONGO_RETRIES + 1):
+        try:
+            write(batch)
+            return
+
+        except BulkWriteError as why:
+            failed = [error['index'] for error in why.details.get('writeErrors', ()) if error.get('code') != DUPLICATE_KEY]
+            if not failed:
+                return
+            batch = [batch[i] for i in failed]
+            if attempt == MONGO_RETRIES:
+                raise
+
+        except ConnectionFailure:
+            if attempt == MONGO_RETRIES:
+                raise
+
+        time.sleep(MONGO_RETRY_DELAY * 2 ** attempt)
+#
+#-----------------------------------------------------------------------------------------------
+def _batches(items, batch_size):
+    """
+    items in lists of batch_size.
+    """
+    items = list(items)
+    for start in range(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+#
+#-----------------------------------------------------------------------------------------------
+def load_mongo(score_dictionary, collection=None, titles=None, deleted=(), batch_size=None):
+    """
+    Write the Score Dictionary to the collection.  titles=None replaces everything with insert_many(ordered=False); otherwise the given
+    titles are upserted and the deleted ones removed.  Returns the number of documents written.
+    """
+    collection = scores_collection() if collection is None else collection
+
+    if not isinstance(collection, FileCollection):
+        return _load_collection(score_dictionary, collection, titles, deleted, batch_size or MONGO_BATCH_SIZE)
+
+    # A FileCollection is written once for the whole load, even one which fails part way (as a database keeps what got in).
+    with collection:
+        return _load_collection(score_dictionary, collection, titles, deleted, batch_size or MONGO_BATCH_SIZE)
+#
+#-----------------------------------------------------------------------------------------------
+def _load_collection(score_dictionary, collection, titles, deleted, batch_size):
+    """
+    The writes of load_mongo().
+    """
+    if titles is None:
+        collection.delete_many({})
+        for next_batch in _batches(score_dictionary, batch_size):
+            documents = [score_document(next_title, score_dictionary[next_title]) for next_title in next_batch]
+            _with_retries(lambda batch: collection.insert_many(batch, ordered=False), documents)
+        return len(score_dictionary)
+
+    titles = [next_title for next_title in titles if next_title in score_dictionary]
+
+    for next_batch in _batches(titles, batch_size):
+        requests = [ReplaceOne({'_id': next_title}, score_document(next_title, score_dictionary[next_title]), upsert=True)
+                    for next_title in next_batch]
+        _with_retries(lambda batch: collection.bulk_write(batch, ordered=False), requests)
+
+    for next_batch in _batches(deleted, batch_size):
+        _with_retries(lambda batch: collection.bulk_write(batch, ordered=False), [DeleteMany({'_id': {'$in': next_batch}})])
+
+    return len(titles)
+#
+#-----------------------------------------------------------------------------------------------
+def refresh_mongo(score_dictionary, titles=None, deleted=()):
+    """
+    Load the Score Dictionary (or the changed titles) into MongoDB, if MONGO_URI is set.
+    """
+    if not MONGO_URI:
+        return 0
+
+    return load_mongo(score_dictionary, titles=titles, deleted=deleted)
@@ -8,23 +8,49 @@ created on: 23 October 2020
 #-----------------------------------------------------------------------------------------------
 from music21    import *
 from pprint     import pprint
-from pprint     import PrettyPrinter
 from pathlib    import Path
-from deepdiff   import DeepDiff 
 
 import os
 import time
 import pickle
 import inspect
-import codecs
+import tempfile
+
+from fingerprint  import file_fingerprint
+from fingerprint  import file_changed
+from fingerprint  import content_hash
+from stream_cache import StreamHandle
+from stream_cache import forget_streams
+from score_index  import refresh_score_index
+from melody_index import refresh_melody_index
+from sqlite_store import refresh_sqlite
+from mongo_store  import refresh_mongo
+from score_log    import write_score_log
+from shard_store  import pickle_shards
+from shard_store  import unpickle_shards
+from duplicates   import duplicates_of
+from duplicates   import write_duplicate_report
+from metadata_cache import ensure_corpus
+from metadata_cache import update_metadata_entries
+from corpus_scanner import is_score_name
+from corpus_scanner import scan_corpus
+from corpus_scanner import stat_files
+from corpus_scanner import update_path_index
+from corpus_scanner import build_path_index
+from corpus_scanner import write_path_index
+from corpus_scanner import find_file as find_indexed_file
+
+from score_paths  import SCORE_DATAPATH
+from score_paths  import SCORE_LOGPATH
+from score_paths  import CORPUS_FILEPATH
+from score_paths  import CACHE_FILEPATH
+from score_paths  import PARSED_CACHEPATH
 
 #                                           VARIABLES
 #-----------------------------------------------------------------------------------------------
 
-SCORE_DATAPATH           = Path.home().joinpath('Dropbox (Personal)', 'Score Library', 'score_search', 'score_data', '_Data', 'score_dictionary.pkl')
-SCORE_LOGPATH            = Path.home().joinpath('Dropbox (Personal)', 'Score Library', 'score_search', 'score_data', '_Logs', 'score_dictionary.txt')
-CORPUS_FILEPATH          = Path.home().joinpath('Dropbox (Personal)', 'Score Library', 'all_musicxml')
-CACHE_FILEPATH           = Path.home().joinpath('Dropbox (Personal)', 'Score Library', 'score_search', 'score_data', '_cache')
+# metadata_index() remembers the last bundle it indexed so that extractors handed a bundle only index it once.
+_BUNDLE_INDEX            = {'Bundle': None, 'Index': None}
 
 #                                            METHODS
 #-----------------------------------------------------------------------------------------------
@@ -80,32 +106,68 @@ def access_metadata():
     return the_metadata
 #
 #-----------------------------------------------------------------------------------------------
-def score_file_info():
+def score_key(score_path):
     """
-    Using Music21's metadata sourcePath, create a unique string for each file to be used as its key in the Score Dictionary.
-    Add the full sourcePath to the dictionary.  Then look at the file itself and add the Content Created and Content Modified datetimes.
+    The Score Dictionary key for a file: its file name without the extension.  Variants keep their " - " suffix.
+    """
+    return str(score_path).split('/')[-1].split('.')[0]
+#
+#-----------------------------------------------------------------------------------------------
+def metadata_index(the_metadata=None):
+    """
+    Index the metadata bundle once so a score's metadata can be looked up in O(1) instead of scanning the whole bundle.
     
-    NOTE: Created and Modified times vary by system.  Will need to put a timestamp in the file itself should this program ever be shared by users on separate machines.
+    Returns { Path: {sourcePath: metadata},
+              Key:  {Score Dictionary key: metadata}
+            }
     
-    TODO:   1) Create and append Music21 streams to non-leadsheet scores?  [Not sure I want this.]
-            2) Rethink created on and modified on.  Because musicxmls might be re-created with each edit, rather than modified.
-        
-    Tests:  1) What if file path does not exist?
-            2) What if file is empty or corrupt?
-            3) What if the file info is missing?  [Is this even possible?]
-            4) What if the file info is corrupt?  [Is this even possible?]
+    NOTE: Indexing a MetadataBundle with a number rebuilds its list of entries every time, so the whole bundle is taken in one slice.
     """
-    # Step 1: Open the Score Dictionary.
-    score_dictionary = {}
+    if the_metadata is None:
+        the_metadata = access_metadata()
+    
+    the_index = {'Path': {}, 'Key': {}}
+    
+    for next_entry in the_metadata[:]:
+        score_path = next_entry.metadata.sourcePath
+        the_index['Path'][str(score_path)] = next_entry.metadata
+        the_index['Key'][score_key(score_path)] = next_entry.metadata
 
-    # Step 2: Access the metadata for each score.  This means define the bundle and read it.
-    my_metadata = access_metadata()
+    return the_index
+#
+#-----------------------------------------------------------------------------------------------
+def find_metadata(the_metadata, score_path):
+    """
+    Look up the metadata for one score by its sourcePath.  Returns None if the score is not in the bundle.
+    
+    the_metadata is an index from metadata_index().  A raw MetadataBundle also works; it is indexed the first time it is seen.
+    """
+    if not isinstance(the_metadata, dict):
+        if _BUNDLE_INDEX['Bundle'] is not the_metadata:
+            _BUNDLE_INDEX.update({'Bundle': the_metadata, 'Index': metadata_index(the_metadata)})
+        the_metadata = _BUNDLE_INDEX['Index']
 
-    # Step 3: Iterate through the bundle and extract the sourcePath. Split it until only the file name without extension and variants remain.  This is the key.
+    return the_metadata['Path'].get(str(score_path))
+#
+#-----------------------------------------------------------------------------------------------
+def score_entries(score_paths, with_hash=True, stats=None):
+    """
+    Build Score Dictionary entries which hold only File Information for a list of score files.  Lead sheets become entries, " - "
+    variants are filed under their lead sheet's Family.  Variants whose lead sheet is not in the list are left out.
+    
+    Each entry gets a Fingerprint (see fingerprint.py).  with_hash=False leaves its Hash to be computed later, only if it is needed.
+    stats ({path: os.stat_result}, e.g. from corpus_scanner.scan_corpus()) saves stat'ing the files again.  Files without one are
+    stat'ed on a pool of threads.
+    
+    Used by score_file_info() for the whole corpus and by update_metadata_cache() to look at the directory as it is now.
+    """
+    score_dictionary = {}
+
+    # Step 1: Split each path until only the file name without extension and variants remain.  This is the key.
     sc_family = []
-    for x in range(len(my_metadata)):
-        score_path = my_metadata[x].metadata.sourcePath
-        file_name = score_path.split('/')[-1].split('.')[0]
+    for score_path in score_paths:
+        score_path = str(score_path)
+        file_name = score_key(score_path)
         
         
         if ' - ' not in file_name: 
@@ -118,7 +180,7 @@ def score_file_info():
             #if 'Family' in score_dictionary[file_name]['File Information'].keys():
                 #print('ok')
 
-    # Step 4: Add the variant scores.
+    # Step 2: Add the variant scores.
     for x in range(len(sc_family)):
         for key in sc_family[x]:
             org_sc = key.split(' - ')
@@ -129,44 +191,87 @@ def score_file_info():
                 else:
                     score_dictionary[org_sc[0]]['File Information']['Family'].update({org_sc[-1].title(): sc_family[x][key]})
 
-    # Step 5: Iterate through each file in the Score Dictionary.
+    # Step 3: Iterate through each file in the Score Dictionary.  Stat each file once.
+    stats = dict(stats or {})
+    stats.update(stat_files([v['File Information']['Path'] for v in score_dictionary.values() if v['File Information']['Path'] not in stats]))
     for next_score in score_dictionary:
         next_path = Path(score_dictionary[next_score]['File Information']['Path'])
+        next_stat = stats.get(str(next_path)) or next_path.stat()
         
-        # Retrieve the Create Time using st_birthtime (MacOS = ok, not sure about others), convert into human readable form, and add to Score Dictionary -> File Information.
-        c_float_sec = next_path.stat().st_birthtime
+        # Retrieve the Create Time using st_birthtime (MacOS), or st_ctime where there is no birth time (Linux), convert into human readable form,
+        # and add to Score Dictionary -> File Information.
+        c_float_sec = getattr(next_stat, 'st_birthtime', next_stat.st_ctime)
         create_time = time.ctime(c_float_sec)
         score_dictionary[next_score]['File Information'].update({'Created On': create_time})
 
-        # Repeat for Modified Time. [TODO: Iterate through os.stat() to process create and modified times simultaneously?]
-        m_float_sec = next_path.stat().st_mtime
+        # Repeat for Modified Time.
+        m_float_sec = next_stat.st_mtime
         modify_time = time.ctime(m_float_sec)
         score_dictionary[next_score]['File Information'].update({'Modified On': modify_time})
+        
+        # The Fingerprint is what update_metadata_cache() uses to detect changes.
+        score_dictionary[next_score]['File Information'].update({'Fingerprint': file_fingerprint(next_path, file_stat=next_stat, with_hash=with_hash)})
+
+    return score_dictionary
+#
+#-----------------------------------------------------------------------------------------------
+def score_file_info():
+    """
+    Using Music21's metadata sourcePath, create a unique string for each file to be used as its key in the Score Dictionary.
+    Add the full sourcePath to the dictionary.  Then look at the file itself and add the Content Created and Content Modified datetimes.
+    
+    NOTE: Created and Modified times vary by system.  Will need to put a timestamp in the file itself should this program ever be shared by users on separate machines.
     
-    # Step 6: Add the Music21 stream.
+    TODO:   1) Create and append Music21 streams to non-leadsheet scores?  [Not sure I want this.]
+            2) Rethink created on and modified on.  Because musicxmls might be re-created with each edit, rather than modified.
+        
+    Tests:  1) What if file path does not exist?
+            2) What if file is empty or corrupt?
+            3) What if the file info is missing?  [Is this even possible?]
+            4) What if the file info is corrupt?  [Is this even possible?]
+    """
+    # Step 1: Access the metadata for each score.  This means define the bundle and read it.
+    my_metadata = access_metadata()
+
+    # Steps 2-5: Build the File Information for every sourcePath in the bundle.
+    all_paths = [str(next_entry.metadata.sourcePath) for next_entry in my_metadata[:]]
+    score_dictionary = score_entries(all_paths)
+    
+    # Every score's path, by file name, for find_file().
+    write_path_index(build_path_index(all_paths))
+    
+    # Step 6: Add a handle to the Music21 stream.  The score is only parsed when an extractor asks for it (see stream_cache.py).
     for next_score in score_dictionary:
-        parse_score = corpus.manager.parse(score_dictionary[next_score]['File Information']['Path'])
-        score_dictionary[next_score]['File Information']['Stream'] = parse_score
+        score_dictionary[next_score]['File Information']['Stream'] = StreamHandle(score_dictionary[next_score]['File Information']['Path'])
     
-    pickle_it(score_dictionary, pickle_path=SCORE_DATAPATH, text_path=SCORE_LOGPATH)
+    pickle_shards(score_dictionary, text_path=SCORE_LOGPATH)
         
     return score_dictionary
 #
 #-----------------------------------------------------------------------------------------------
-def pickle_it(a_structure, pickle_path=None, text_path=None):
+def pickle_it(a_structure, pickle_path=None, text_path=None, titles=None):
     """
-    Pickle a data structure.
+    Pickle a data structure.  The pickle is written to a temporary file, synced, and moved into place, so it is never half written.
+    
+    Once the pickle is safe, the text log is written on a background thread (see score_log.py).  titles limits the log to the records
+    which changed; text_path=None skips it.
     """
+    pickle_dir = os.path.dirname(str(pickle_path))
+    
     try:
         # Pickle the materials dictionary
-        with open(pickle_path, 'wb') as the_store:
-            pickle.dump(a_structure, the_store)
-
-        # Derive a text file from the pickle created in the previous step and do a formatted print
-        with codecs.open(text_path, encoding='utf-8', mode='w') as ITPKL:
-            report_pp = PrettyPrinter(indent=2, width=160, stream=ITPKL)
-            print('The Pickled Data Structure:\n', file=ITPKL)
-            report_pp.pprint(a_structure)
+        handle, temp_path = tempfile.mkstemp(dir=pickle_dir, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as the_store:
+                pickle.dump(a_structure, the_store, protocol=pickle.HIGHEST_PROTOCOL)
+                the_store.flush()
+                os.fsync(the_store.fileno())
+            os.replace(temp_path, pickle_path)
+        
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
 
     # Attempt to figure out why pickling failed miserably.
     except IOError as why:
@@ -174,6 +279,9 @@ def pickle_it(a_structure, pickle_path=None, text_path=None):
         print(f'{caller_name}  trying to save "{pickle_path}"')
         print (f'  - saved_structure: Exception: {why}')
         raise
+    
+    # Derive a text file, one line per score, from the structure just pickled.
+    write_score_log(a_structure, text_path, titles=titles)
 #
 #-----------------------------------------------------------------------------------------------
 def unpickle_it(pickle_path=None, be_verbose=False):
@@ -196,121 +304,203 @@ def unpickle_it(pickle_path=None, be_verbose=False):
             print (f'  - new_dict: Exception: {why}')
         raise
 #
+#-----------------------------------------------------------------------------------------------
+def family_changed(score_entry, new_family, stats=None):
+    """
+    Whether a score's Family variants have been added, removed, moved, or edited since they were analyzed.  Each variant's stored
+    Fingerprint (Score Dictionary -> Family) is checked the same way as the lead sheet's.
+    
+    Returns (changed, refreshed).  refreshed is True if only the stat fields of some variant changed; their Fingerprints are updated.
+    stats ({path: os.stat_result}) saves stat'ing the variants again.
+    """
+    old_family = score_entry.get('Family')
+    new_family = new_family or {}
+    
+    # Entries from before variants were analyzed have no Family section.
+    if old_family is None:
+        return bool(new_family), False
+    
+    if {k: v['Path'] for k, v in old_family.items()} != new_family:
+        return True, False
+    
+    refreshed = False
+    for the_variant in old_family.values():
+        changed, new_fingerprint = file_changed(the_variant.get('Fingerprint'), the_variant['Path'], file_stat=(stats or {}).get(the_variant['Path']))
+        if changed:
+            return True, False
+        if new_fingerprint != the_variant.get('Fingerprint'):
+            the_variant['Fingerprint'] = new_fingerprint
+            refreshed = True
+    
+    return False, refreshed
+#
+#-----------------------------------------------------------------------------------------------
+def entry_paths(file_information):
+    """
+    The paths of a score's lead sheet and of its Family variants.
+    """
+    return [file_information['Path']] + list((file_information.get('Family') or {}).values())
+#
 #-----------------------------------------------------------------------------------------------        
-def update_metadata_cache():
+def affected_files(score_dictionary, changed_paths):
     """
-    Determine whether there have been changes in the corpus directory and if the metadata cache file needs updating. Save the old metadata cache as a backup.
-    Need to do 2 checks:
-        1) Have files been added or deleted?  Compare directory info with entry in Score Dictionary -> File Information -> Path
-        2) Have files been modified?  Compare file info with entry in Score Dictionary -> File Information -> Modified On
+    The titles which a set of changed file paths can affect, and the score files of those titles on disk now.  A path affects its lead
+    sheet's title (a variant "Title - Student" affects "Title").  Only the directories of the changed paths, and of the titles' current
+    files, are listed.
     
-    TODO: Need a more precise rebuild process. Instead of rebuilding the whole Score Dictionary, only add/delete/modify the entire Score Dictionary, 
-          only change the entries that have been identified as different.
+    Returns (titles, files).
     """
-    # Check 1: Have files been added or deleted? 
-    # Step 1: Get the file paths from the xml directory and put them in a list.
-    paths = Path(CORPUS_FILEPATH).glob('**/*.musicxml')
-    files = [x for x in paths if x.is_file() and ' - ' not in str(x)]
+    titles = {score_key(next_path).split(' - ')[0] for next_path in changed_paths}
+    directories = {os.path.dirname(str(next_path)) for next_path in changed_paths}
     
+    for next_score in titles & set(score_dictionary):
+        file_information = score_dictionary[next_score]['File Information']
+        directories.add(os.path.dirname(file_information['Path']))
+        directories.update(os.path.dirname(next_path) for next_path in (file_information.get('Family') or {}).values())
     
-    # Step 2: Extract the file paths from the Score Dictionary and put them in a list.
-    score_dictionary = unpickle_it(pickle_path=SCORE_DATAPATH, be_verbose=False)
-    score_list = []
-    for next_score in score_dictionary:
-        score_path = score_dictionary[next_score]['File Information']['Path']
-        score_list.append(Path(score_path))
-
-
-    # Step 3: Sort the lists.
-    score_list.sort()
-    files.sort()
+    files = []
+    for next_directory in directories:
+        try:
+            with os.scandir(next_directory) as entries:
+                files += [next_entry.path for next_entry in entries if is_score_name(next_entry.name) and next_entry.is_file()
+                          and score_key(next_entry.name).split(' - ')[0] in titles]
+        except OSError:
+            continue
     
-    #print(f"Score List: {score_list}")
+    return titles, files
+#
+#-----------------------------------------------------------------------------------------------        
+def update_metadata_cache(workers=1, paths=None):
+    """
+    Determine whether there have been changes in the corpus directory and if the metadata cache file needs updating. Save the old metadata cache as a backup.
+    Need to do 2 checks:
+        1) Have files been added or deleted?  Compare directory info with entry in Score Dictionary -> File Information -> Path
+        2) Have files been modified?  Compare file info with entry in Score Dictionary -> File Information -> Fingerprint
+           The size, mtime_ns, and inode are compared first.  The file is only hashed when one of them differs.
     
-    #for next_path in files:
-        #if next_path not in score_list:
-            #print(f"File Path: {next_path}")
+    Only the entries which have been identified as different are changed: deleted scores are removed, added and modified scores are
+    re-parsed and re-analyzed (with workers processes, see x_load_data.analyze_scores()), and everything else is left as it is.
     
-    # Step 4: Compare the lists.  If they are the same then the corpus has not changed, proceed to Check 2.   
-    if score_list == files:
-        print(">>>>> The score dictionary and the local corpus directory contain the same files. Proceeding to Step 2 of update analysis. <<<<<\n")
-        
-        # Check 2: Have any of the files been modified?
-        # Step A: Retreive the mtime from the xml directory, translate to the form in the Score Dictionary, put in a dictionary.
-        file_mod_time = {}
-        for next_file in files:
-            m_float_sec = next_file.stat().st_mtime
-            file_time = time.ctime(m_float_sec)
-            file_mod_time.update({str(next_file): file_time})
-        
-        #pprint(file_mod_time)
+    paths:  None scans the whole corpus directory.  Otherwise only the titles of these changed (added, edited, deleted, or renamed)
+            file paths are checked, e.g. from corpus_watcher.py.
+    
+    Returns the sets of added, deleted, and modified titles.
+    """
+    # Step 1: Retrieve the Score Dictionary.
+    score_dictionary = unpickle_shards(be_verbose=False)
+    
+    # Check 1: Have files been added or deleted? 
+    # Step 2: Get the file paths from the xml directory (or of the changed titles) and build their File Information as it is right now.
+    # The scan (see corpus_scanner.py) stats every file once, on a pool of threads, and keeps the path index up to date.
+    if paths is None:
+        scope = set(score_dictionary)
+        stats = scan_corpus(CORPUS_FILEPATH)
+    else:
+        # Scores which share the analysis of a changed title may have to be analyzed again, so their files are looked at too.
+        sharing = duplicates_of(score_dictionary, {score_key(next_path).split(' - ')[0] for next_path in paths})
+        scope, files = affected_files(score_dictionary, list(paths) + [p for t in sharing for p in entry_paths(score_dictionary[t]['File Information'])])
+        stats = stat_files(files)
+        update_path_index(paths)
+    on_disk = score_entries(list(stats), with_hash=False, stats=stats)
 
-        # Step B: Retreive the "Modified On" time from the Score Dictionary, put in a dictionary.
-        score_mod_time = {}
-        for next_score in score_dictionary:
-            score_time = score_dictionary[next_score]['File Information']['Modified On']
-            score_mod_time.update({score_dictionary[next_score]['File Information']['Path']: score_time})
+    # Step 3: Compare the titles.
+    added = set(on_disk) - set(score_dictionary)
+    deleted = (scope & set(score_dictionary)) - set(on_disk)
+    
+    # Check 2: Have any of the remaining files been modified?  Compare the path and the Fingerprint.
+    modified = set()
+    refreshed = set()
+    for next_score in set(on_disk) & set(score_dictionary):
+        old_info = score_dictionary[next_score]['File Information']
+        new_info = on_disk[next_score]['File Information']
         
-        #pprint(score_mod_time)
-
-        # Step C: Use the deepdiff library to compare the 2 dictionaries
-        diff = DeepDiff(score_mod_time, file_mod_time)
+        changed, new_info['Fingerprint'] = file_changed(old_info.get('Fingerprint'), new_info['Path'], file_stat=stats.get(new_info['Path']))
+        variants_changed, variants_refreshed = family_changed(score_dictionary[next_score], new_info.get('Family'), stats)
         
-        #for next_entry in diff:
-            #for x in range(len(diff[next_entry])):
-                #print(f"{diff[next_entry][x]}\n")
-
+        if old_info['Path'] != new_info['Path'] or changed or variants_changed:
+            modified.add(next_score)
+            continue
         
-        # Step D: If deepdiff returns a populated dictionary, then modifications have occurred.  Rebuild the metadata and Score Dictionary.
-        if len(diff) > 0:
-            print(">>>>> Files in the local corpus directory have been modified.  Rebuilding the music21 metadata cache and score dictionary. <<<<<")
-            
-            # Before rebuilding, change the name of the current cache file in case we need to walk it back.
-            current_cache = Path.joinpath(CACHE_FILEPATH, 'our_corpus_cache.json')
-            current_cache.rename(Path.joinpath(CACHE_FILEPATH, 'old_cache.json'))
-            
-            # Now rebuild
-            build_metadata_cache()
-            score_file_info()
+        if variants_refreshed:
+            refreshed.add(next_score)
         
-        # If deepdiff returns an empty dictionary, then everything is the same and we're finished.
+        # Same contents but new stat fields (e.g. Dropbox rewrote the mtime).  Keep the new ones so the file is not hashed again next time.
+        if old_info.get('Fingerprint') != new_info['Fingerprint']:
+            old_info.update({'Fingerprint': new_info['Fingerprint'], 'Modified On': new_info['Modified On']})
+            refreshed.add(next_score)
+    
+    # Added scores have nothing to compare against.  Hash them now so the next update can.
+    for next_score in added:
+        new_info = on_disk[next_score]['File Information']
+        new_info['Fingerprint']['Hash'] = content_hash(new_info['Path'])
+    
+    if not (added or deleted or modified):
+        if refreshed:
+            print(f">>>>> The File Information of {len(refreshed)} scores has changed, but not their music.  Updating the File Information. <<<<<")
+            pickle_shards(score_dictionary, text_path=SCORE_LOGPATH, titles=refreshed)
+            refresh_sqlite(score_dictionary, titles=refreshed)
+            refresh_mongo(score_dictionary, titles=refreshed)
         else:
             print(">>>>> The local corpus directory and score dictionary match.  No action required.  Analysis finished. <<<<<")
-            
-    # The corpus has changed.  Rebuild the metadata and Score Dictionary.
-    else:
-        print(">>>>> The score dictionary and local corpus directory are different. Rebuilding the Music21 metadata cache and score dictionary. <<<<<\n")
-        
-        #Before rebuilding, change the name of the current cache file in case we need to walk it back.
-        current_cache = Path.joinpath(CACHE_FILEPATH, 'our_corpus_cache.json')
-        current_cache.rename(Path.joinpath(CACHE_FILEPATH, 'old_cache.json'))
-        
-        # Now rebuild
-        build_metadata_cache()
-        score_file_info()
-        
+        return added, deleted, modified
+    
+    print(f">>>>> {len(added)} added, {len(deleted)} deleted, {len(modified)} modified.  Updating their Music21 metadata and their entries. <<<<<\n")
+    
+    # The extractors read the time signature and ambitus from the metadata, so it has to be updated before the analysis.  Only the
+    # changed files' entries are replaced (see metadata_cache.py); the old cache is kept as old_cache.json in case we need to walk it back.
+    update_metadata_entries(added=[p for t in added | modified for p in entry_paths(on_disk[t]['File Information'])],
+                            removed=[p for t in deleted | modified for p in entry_paths(score_dictionary[t]['File Information'])],
+                            workers=workers)
+    
+    # Scores which shared the analysis of a deleted or modified score have to be analyzed again (or share another score's).
+    modified |= duplicates_of(score_dictionary, deleted | modified) - deleted
+    
+    # Streams parsed earlier in this process (e.g. by corpus_watcher.py) are of the files as they were.
+    forget_streams([p for t in deleted | modified for p in entry_paths(score_dictionary[t]['File Information'])])
+    
+    # Step 4: Patch the Score Dictionary.  Remove the deleted scores, and give added and modified scores their new File Information.
+    for next_score in deleted:
+        del score_dictionary[next_score]
+    
+    for next_score in added | modified:
+        score_dictionary[next_score] = on_disk[next_score]
+        score_dictionary[next_score]['File Information']['Stream'] = StreamHandle(on_disk[next_score]['File Information']['Path'])
+    
+    # Step 5: Parse and analyze only the added and modified scores.  (Imported here because x_load_data imports this module.)
+    from x_load_data import analyze_scores
+    analyze_scores(score_dictionary, sorted(added | modified), workers=workers)
+    
+    # Only the shards of the changed scores are written.  Deleted scores' shards are removed.
+    pickle_shards(score_dictionary, text_path=SCORE_LOGPATH, titles=added | modified | refreshed)
+    write_duplicate_report(score_dictionary)
+    
+    # Step 6: Re-index only the changed titles.
+    refresh_score_index(score_dictionary, titles=added | modified, deleted=deleted)
+    refresh_melody_index(score_dictionary, titles=added | modified, deleted=deleted)
+    refresh_sqlite(score_dictionary, titles=added | modified | refreshed, deleted=deleted)
+    refresh_mongo(score_dictionary, titles=added | modified | refreshed, deleted=deleted)
+    
+    return added, deleted, modified
 #
 #----------------------------------------------------------------------------------------------- 
 def find_file(file_name, directory_name):
-    files_found = []
-    for path, subdirs, files in os.walk(directory_name):
-        for name in files:
-            if(file_name == name):
-                file_path = os.path.join(path,name)
-                files_found.append(file_path)
-    return files_found     
+    """
+    The paths of the files called file_name in directory_name or under it.  Inside the corpus this is a lookup in the path index (see
+    corpus_scanner.py), not a walk of the tree.
+    """
+    return find_indexed_file(file_name, directory_name)
 
 #                                           MAIN
 #-----------------------------------------------------------------------------------------------
 if __name__ == '__main__':
     
-    reset_corpus()
-    define_corpus()
-    build_metadata_cache()
+    # The corpus stays registered between runs.  The whole cache is only built the first time.
+    if not ensure_corpus().cacheFilePath.exists():
+        build_metadata_cache()
 
     score_dictionary = score_file_info()
     update_metadata_cache()
 
-    score_dictionary = unpickle_it(pickle_path=SCORE_DATAPATH, be_verbose=False)
+    score_dictionary = unpickle_shards(be_verbose=False)
     pprint(score_dictionary)
     
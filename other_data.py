@@ -22,37 +22,59 @@ Populate the other dictionary for each score in this format:
 
 from music21        import *
 from pprint         import pprint
+from collections    import Counter
 
 from music21_globals  import *
 
+from stream_cache     import score_stream
+from sequence_store   import coded
+from score_walk       import register_collector
+from score_walk       import score_walk
+from score_walk       import fast_events
+from score_walk       import all_parts
+from profiling        import profiled
+
+#                                           COLLECTORS
+#-----------------------------------------------------------------------------------------------
+# What the score walk gathers for this module.  See score_walk.py.
+
+register_collector('Text Repeats',  repeat.RepeatExpression,  lambda el: el.name)
+register_collector('Bar Repeats',   bar.Repeat,               lambda el: el.direction)
+register_collector('Chord Symbols', harmony.ChordSymbol,      lambda el: el.figure)
+register_collector('Slurs',         spanner.Slur,             len)
+register_collector('Measures',      stream.Measure,           lambda el: el.number)
+
 #                                            METHODS
 #-----------------------------------------------------------------------------------------------
+@profiled
 def number_of_parts(a_dictionary, score):
     """
     Get how many parts a score has.
     """
 
-    parsed = a_dictionary[score]['File Information']['Stream']
-    num_parts = len(parsed.parts)
+    the_walk = score_walk(a_dictionary, score, names=())
+    num_parts = len(the_walk['Parts'])
     a_dictionary[score]['Other'].update({'Parts': num_parts})
     
     return a_dictionary
 
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def measure_length(a_dictionary, score):
     """
     Get how many measures a score has printed.  Repeats are NOT included in this tally.
     """
     
-    parsed = a_dictionary[score]['File Information']['Stream']
-    m_length = len(parsed.parts[0].getElementsByClass(stream.Measure))
+    the_walk = score_walk(a_dictionary, score, names=('Measures',))
+    m_length = len(the_walk['Parts'][0]['Measures'])
     a_dictionary[score]['Other'].update({'Length': m_length})
     
     return a_dictionary
     
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def repeats(a_dictionary, score):
     """
     If a score has repeats return the type of repeats.  If it does not return None.
@@ -62,16 +84,16 @@ def repeats(a_dictionary, score):
         2) What about scores with bracket endings?  How does Music21 handle them?
     """
 
-    parsed = a_dictionary[score]['File Information']['Stream']
+    the_walk = score_walk(a_dictionary, score, names=('Text Repeats', 'Bar Repeats'))
     
     # Gives the true length of piece if all repeats are performed
-    text_repeats = parsed.parts[0].recurse().getElementsByClass(repeat.RepeatExpression)
-    bar_repeats = parsed.parts[0].recurse().getElementsByClass(bar.Repeat)
+    text_repeats = the_walk['Parts'][0]['Text Repeats']
+    bar_repeats = the_walk['Parts'][0]['Bar Repeats']
     
     if text_repeats:
         for next_text in text_repeats:
-            if next_text.name != 'fine' or next_text.name != 'coda':
-                a_dictionary[score]['Other'].update({'Repeats': next_text.name})
+            if next_text != 'fine' or next_text != 'coda':
+                a_dictionary[score]['Other'].update({'Repeats': next_text})
     
     elif bar_repeats:
         for next_bar in bar_repeats:
@@ -92,6 +114,28 @@ def form(a_dictionary, score):
 
 #
 #-----------------------------------------------------------------------------------------------
+def assemble_lyrics(first_lyrics):
+    """
+    Join the (text, syllabic) of the first lyric of each note into words, as text.assembleLyrics() does with a stream.
+    """
+    word = []
+    words = []
+    
+    for lyric_text, syllabic in first_lyrics:
+        # '_' continues the syllable before it
+        if lyric_text == '_':
+            continue
+        
+        word.append(lyric_text)
+        if syllabic not in ('begin', 'middle'):
+            words.append(''.join(word))
+            word = []
+    
+    return ' '.join(words)
+
+#
+#-----------------------------------------------------------------------------------------------
+@profiled
 def lyrics(a_dictionary, score):
     """
     Extract the lyrics from each score and assemble them into words.
@@ -99,8 +143,13 @@ def lyrics(a_dictionary, score):
     Returns the first verse worth of lyrics.  Returns None if it is an instrumental score.
     """
 
-    parsed = a_dictionary[score]['File Information']['Stream']
-    s_lyrics = text.assembleLyrics(parsed)    
+    # The fast path already has the lyrics in the order Music21 assembles them.  Otherwise they come from the parsed score.
+    the_walk = fast_events(a_dictionary, score)
+    
+    if the_walk is not None:
+        s_lyrics = assemble_lyrics(the_walk['Score']['Lyrics'])
+    else:
+        s_lyrics = text.assembleLyrics(score_stream(a_dictionary, score))
     
     if s_lyrics:
         a_dictionary[score]['Other']['Lyrics'] = s_lyrics
@@ -111,6 +160,7 @@ def lyrics(a_dictionary, score):
 
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def chords_symbols(a_dictionary, score):
     """
     Find scores with chord symbols using Music21.  Iterate through scores with chords and list all the chord symbols in each part.  
@@ -123,21 +173,19 @@ def chords_symbols(a_dictionary, score):
     """
     # Parse each score and set up the dictionary to store the data
     
-    parsed = a_dictionary[score]['File Information']['Stream']
+    the_walk = score_walk(a_dictionary, score, names=('Chord Symbols',))
     a_dictionary[score]['Other']['Chords'] = {'All': {}}
     
-    # Iterate through each part and extract the chord symbols
-    for i, next_part in enumerate(parsed.parts):
-        part_chords = next_part.recurse().getElementsByClass(harmony.ChordSymbol)
+    # Iterate through each part and pick up the chord symbols the walk found
+    for i, next_part in enumerate(the_walk['Parts']):
+        part_chords = next_part['Chord Symbols']
 
         # Collect chords into a list
         if part_chords:
-            chord_list = []
-            for next_chord in part_chords:
-                chord_list.append(next_chord.figure)
+            chord_list = list(part_chords)
             
             # Add the list(s) to the dictionary
-            a_dictionary[score]['Other']['Chords']['All'].update({'Part '+ str(i+1): chord_list})
+            a_dictionary[score]['Other']['Chords']['All'].update({'Part '+ str(i+1): coded('Chords', chord_list)})
             
             # Create a list of chords in all parts to identify and count chord appearances
             symbol_list = []
@@ -145,16 +193,8 @@ def chords_symbols(a_dictionary, score):
                 for next_symbol in a_dictionary[score]['Other']['Chords']['All'][next_part]:
                     symbol_list.append(next_symbol)
             
-            # Set up the dictionary for unique chord types
-            a_dictionary[score]['Other']['Chords'].update({'Types': {}})
-
-            # Count the number of each unique chord type and add it.
-            for next_chord in set(symbol_list):
-                chord_count = 0
-                for next_sym in symbol_list:
-                    if next_chord == next_sym:
-                        chord_count += 1
-                a_dictionary[score]['Other']['Chords']['Types'].update({next_chord: chord_count})
+            # Count the number of each unique chord type in one pass and add it.
+            a_dictionary[score]['Other']['Chords'].update({'Types': dict(Counter(symbol_list))})
             
         # If there are no chord symbols, set dictionary values to None
         else:
@@ -165,22 +205,24 @@ def chords_symbols(a_dictionary, score):
 
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def slurs(a_dictionary, score):
     """
     Return the number of slurs in a score and the lengths of each.
     """
     
-    parsed = a_dictionary[score]['File Information']['Stream']
+    the_walk = score_walk(a_dictionary, score, names=('Slurs',))
     a_dictionary[score]['Other']['Slurs'] = {}
     
     slur_count = 0
     slur_length = []
 
-    for el in parsed.recurse().getElementsByClass(spanner.Slur):
+    # The walk records the length of each slur it finds
+    for next_length in all_parts(the_walk, 'Slurs'):
         slur_count +=1
         
-        if len(el) not in slur_length:
-            slur_length.append(len(el))
+        if next_length not in slur_length:
+            slur_length.append(next_length)
 
     if slur_count != 0:
         a_dictionary[score]['Other']['Slurs']['Number'] = slur_count
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Song Search Parse Cache
+written by: Song Search contributors
+created on: 18 October 2026
+
+Parsing MusicXML is the most expensive step of a build.  This cache keeps every parsed score on disk as a frozen Music21 stream
+(converter.freeze / converter.thaw), so a re-run on an unchanged corpus never parses XML again.
+
+    Key:        the file's path + the hash of its contents (see fingerprint.py) + the Music21 version
+    Location:   PARSED_CACHEPATH, one <key>.p file per score
+    Eviction:   least recently used files are deleted once the cache is over PARSE_CACHE_BYTES
+
+Each file is written to a temporary name and moved into place with os.replace(), so several worker processes can read and write the
+cache at the same time without anyone seeing a half-written file.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import hashlib
+import tempfile
+
+from fingerprint    import content_hash
+from score_paths    import PARSED_CACHEPATH
+from profiling      import profile_call
+from profiling      import current_score
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+PARSE_CACHE_ENABLED     = True
+PARSE_CACHE_BYTES       = 2 * 1024 * 1024 * 1024
+
+# Checking the size of the cache means listing it, so only do it every so many writes.
+EVICT_EVERY             = 50
+
+_WRITES                 = {'Since Evict': 0}
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def cache_file(score_path, cache_path=None):
+    """
+    Where the frozen stream of a score file lives in the cache.
+    """
+    from music21 import VERSION_STR
+
+    cache_path = cache_path or PARSED_CACHEPATH
+    the_key = hashlib.sha1('|'.join([str(score_path), content_hash(score_path), VERSION_STR]).encode('utf-8')).hexdigest()
+
+    return os.path.join(cache_path, the_key + '.p')
+#
+#-----------------------------------------------------------------------------------------------
+def load_parsed(frozen_path):
+    """
+    Thaw a stream from the cache.  Returns None if it is not there or cannot be read.
+    """
+    from music21 import converter
+
+    try:
+        parsed = converter.thaw(frozen_path)
+
+    except FileNotFoundError:
+        return None
+
+    # A damaged file (or one another process is evicting) is a miss.  Remove it so it gets written again.
+    except Exception:
+        try:
+            os.remove(frozen_path)
+        except OSError:
+            pass
+        return None
+
+    # Touch the file so eviction sees it as recently used.
+    try:
+        os.utime(frozen_path)
+    except OSError:
+        pass
+
+    return parsed
+#
+#-----------------------------------------------------------------------------------------------
+def store_parsed(frozen_path, parsed):
+    """
+    Freeze a stream into the cache.  The file appears all at once or not at all.
+    """
+    from music21 import converter
+
+    cache_path = os.path.dirname(frozen_path)
+    os.makedirs(cache_path, exist_ok=True)
+
+    handle, temp_path = tempfile.mkstemp(dir=cache_path, suffix='.tmp')
+    os.close(handle)
+
+    try:
+        converter.freeze(parsed, fp=temp_path)
+        os.replace(temp_path, frozen_path)
+
+    # The cache is only an optimization.  If writing fails, leave no temporary file behind and carry on.
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return
+
+    _WRITES['Since Evict'] += 1
+    if _WRITES['Since Evict'] >= EVICT_EVERY:
+        evict_parsed(cache_path)
+#
+#-----------------------------------------------------------------------------------------------
+def evict_parsed(cache_path=None, max_bytes=None):
+    """
+    Delete the least recently used frozen streams until the cache is within max_bytes.
+    """
+    cache_path = cache_path or PARSED_CACHEPATH
+    max_bytes = PARSE_CACHE_BYTES if max_bytes is None else max_bytes
+    _WRITES['Since Evict'] = 0
+
+    frozen = []
+    try:
+        with os.scandir(cache_path) as the_dir:
+            for entry in the_dir:
+                if entry.name.endswith('.p'):
+                    try:
+                        entry_stat = entry.stat()
+                    except OSError:
+                        continue
+                    frozen.append((entry_stat.st_mtime, entry_stat.st_size, entry.path))
+
+    except FileNotFoundError:
+        return
+
+    total = sum(size for used, size, path in frozen)
+
+    for used, size, path in sorted(frozen):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+#
+#-----------------------------------------------------------------------------------------------
+def parse_score(score_path, cache_path=None):
+    """
+    Return the Music21 stream of a score file, from the disk cache if it has already been parsed, otherwise by parsing it (and
+    adding it to the cache).
+    """
+    from music21 import corpus
+
+    # Both are profiled under the score of the extractor which asked for the stream (see profiling.py).
+    the_score = current_score(score_path)
+
+    if not PARSE_CACHE_ENABLED:
+        return profile_call('Parse', the_score, corpus.manager.parse, score_path)
+
+    frozen_path = cache_file(score_path, cache_path)
+
+    parsed = profile_call('Thaw', the_score, load_parsed, frozen_path)
+    if parsed is None:
+        parsed = profile_call('Parse', the_score, corpus.manager.parse, score_path)
+        store_parsed(frozen_path, parsed)
+
+    return parsed
@@ -8,6 +8,7 @@ Populate the pitch dictionary for each score in this format:
 
     { Pitch:
         { Key Signature:    list,
+          Pitch Classes:    pitch-class histogram (C to B) weighted by note length, what the key is found from,
           Mode:             derived from key signature,                              
           Clef:             list,
           Letter Names:     { All: list of letter names in order of appearance,
@@ -19,6 +20,9 @@ Populate the pitch dictionary for each score in this format:
           Intervals:        { All: list of intervals in order of appearance,
                               Types: list of intervals:appearance dictionaries
                             },
+          Contour:          { All: list of melodic directions (up, down, same) in order of appearance,
+                              Types: list of direction:appearance dictionaries
+                            },
           Range:            highest note, lowest note, interval between them,        
           Slurs:            number and length
         }
@@ -28,74 +32,200 @@ Populate the pitch dictionary for each score in this format:
 
 import re
 
+from collections    import Counter
+from functools      import lru_cache
+
 from music21        import *
 from pprint         import pprint
 
-from music21_globals  import SCORE_DATAPATH
 from music21_globals  import SCORE_LOGPATH
-from music21_globals  import unpickle_it
-from music21_globals  import pickle_it
+from shard_store      import pickle_shards
+from shard_store      import unpickle_shards
 from music21_globals  import access_metadata
+from music21_globals  import metadata_index
+from music21_globals  import find_metadata
 from music21_globals  import define_corpus
 
+from stream_cache     import score_stream
+from sequence_store   import coded
+from score_walk       import register_collector
+from score_walk       import score_walk
+from score_walk       import fast_events
+from score_walk       import all_parts
+from profiling        import profiled
+from key_engine       import key_names
+from key_engine       import pitch_class_histogram
+from key_engine       import KRUMHANSL
+from key_engine       import AARDEN
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+# Music21 interval directions (1, -1, 0) as contour names.
+CONTOUR_NAMES       = {1: 'up', -1: 'down', 0: 'same'}
+
+#                                           COLLECTORS
+#-----------------------------------------------------------------------------------------------
+# What the score walk gathers for this module.  See score_walk.py.
+
+def clef_name(a_clef):
+    """
+    Turn a Music21 clef into a friendly name, e.g. <music21.clef.TrebleClef> becomes 'Treble Clef'.
+    """
+    processing = str(a_clef).split('.')[-1].strip('>')
+    return re.sub('([A-Z])', r' \1', processing).strip()
+#
+#-----------------------------------------------------------------------------------------------
+def letter_name(a_note):
+    """
+    Take the last word of the note's string, e.g. <music21.note.Note C#> becomes 'C#'.
+    """
+    return str(a_note).split('.')[-1].split()[-1].strip('>')
+#
+#-----------------------------------------------------------------------------------------------
+def key_pitches(a_note):
+    """
+    The length and pitch classes of a note or chord, for the key histogram.  Unpitched notes are left out, as Music21's key analysis does.
+    """
+    if isinstance(a_note, note.Unpitched):
+        return None
+
+    return float(a_note.quarterLength), tuple(p.pitchClass for p in a_note.pitches)
+
+register_collector('Keys',          key.Key)
+register_collector('Clefs',         clef.Clef,      clef_name)
+register_collector('Letter Names',  note.Note,      letter_name)
+register_collector('Pitch Classes', note.NotRest,   key_pitches)
+
 #                                            METHODS
 #-----------------------------------------------------------------------------------------------
+@lru_cache(maxsize=None)
+def spelled_pitch(name):
+    """
+    The Music21 pitch of a name the fast path gives, e.g. 'C#4'.  The same few pitches come up again and again, so they are made once.
+    """
+    return pitch.Pitch(name)
+#
+#-----------------------------------------------------------------------------------------------
+@lru_cache(maxsize=65536)
+def spelled_interval(start, end):
+    """
+    The name and contour of the interval between two pitch names, e.g. ('M2', 'up') from 'C4' to 'D4'.
+    """
+    the_interval = interval.Interval(spelled_pitch(start), spelled_pitch(end))
+    return the_interval.name, CONTOUR_NAMES[int(the_interval.direction)]
+#
+#-----------------------------------------------------------------------------------------------
+@lru_cache(maxsize=4096)
+def solfege_syllable(letter_key, letter_name):
+    """
+    Music21's solfege syllable of a letter name in a key, e.g. 'fa' for 'F' in 'C'.  Working one out is slow, and a library only
+    needs a few hundred of them, so each is worked out once.
+    """
+    return key.Key(letter_key).solfeg(letter_name)
+#
+#-----------------------------------------------------------------------------------------------
+def pitch_span(a_part):
+    """
+    The lowest and highest pitch of a part, or None if it has no pitches.  When several are equally low (or high) the first is taken,
+    as analysis.discrete.Ambitus does.
+    
+    a_part is a part of the parsed score, or of the fast path's walk (see fast_xml.py).
+    """
+    if not isinstance(a_part, dict):
+        return analysis.discrete.Ambitus().getPitchSpan(a_part)
+    
+    found = [spelled_pitch(name) for next_pitches in a_part['Pitches'] for name in next_pitches]
+    if not found:
+        return None
+    
+    ps_found = [p.ps for p in found]
+    return found[ps_found.index(min(ps_found))], found[ps_found.index(max(ps_found))]
+#
+#-----------------------------------------------------------------------------------------------
+def melody_steps(a_part):
+    """
+    The (interval name, contour) of each pair of contiguous notes in a part, in offset order.  Chords are left out.
+    
+    a_part is a part of the parsed score, or of the fast path's walk (see fast_xml.py).
+    """
+    if isinstance(a_part, dict):
+        our_notes = a_part['Melody']
+        return [spelled_interval(n1, n2) for n1, n2 in zip(our_notes, our_notes[1:])]
+    
+    # Flatten the part and get the Note attribute of the Music21 note class.  The walk's recurse() order is not offset order
+    # when a part has several voices, so the notes come from the flattened part.
+    our_notes = list(a_part.flatten().getElementsByClass(note.Note))
+    
+    # Use Music21 to calculate the interval between each pair of contiguous notes
+    the_intervals = [interval.Interval(n1, n2) for n1, n2 in zip(our_notes, our_notes[1:])]
+    return [(x.name, CONTOUR_NAMES[int(x.direction)]) for x in the_intervals]
+#
+#-----------------------------------------------------------------------------------------------
+@profiled
 def key_signature(a_dictionary, the_metadata, score):
     """
     Analyze the key of each piece in 3 different ways.  Return the key which the majority of methods agrees upon, or the most accurate method.
     (Which is not that accurate).
     
-    NOTE: Because of the multiple analyses, this method does take measurable time.  Consider multiple processing methods.
+    The two key analyses come from one pitch-class histogram, which is kept in the dictionary so the whole corpus can be re-analyzed
+    without parsing (see key_engine.py).
+    
+    the_metadata is the index from metadata_index() (a raw bundle also works, see find_metadata()).
     """
-
-    parsed = a_dictionary[score]['File Information']['Stream']
     
-    for x in range(len(the_metadata)):
-        if the_metadata[x].metadata.sourcePath == a_dictionary[score]['File Information']['Path']:
-            if the_metadata[x].metadata.ambitus.semitones == 0:
-                a_dictionary[score]['Pitch']['Key Signature'] = 'Unpitched'
-                #pass
-                
+    score_metadata = find_metadata(the_metadata, a_dictionary[score]['File Information']['Path'])
+    
+    if score_metadata is not None:
+        if score_metadata.ambitus.semitones == 0:
+            a_dictionary[score]['Pitch']['Key Signature'] = 'Unpitched'
+            #pass
+            
+        else:
+            the_walk = score_walk(a_dictionary, score, names=('Keys', 'Pitch Classes'))
+            histogram = pitch_class_histogram(all_parts(the_walk, 'Pitch Classes'))
+            a_dictionary[score]['Pitch']['Pitch Classes'] = histogram
+            the_keys = key_names(histogram)
+            
+            tur_key = str(all_parts(the_walk, 'Keys')[0])      # only returns major keys
+            mon_key = the_keys[KRUMHANSL]                      # same as parsed.analyze('key.krumhanslschmuckler')
+            hoc_key = the_keys[AARDEN]                         # same as parsed.analyze('key')
+            
+            # print(f'{score_metadata.sourcePath}')
+            # print(f'Get Elements: {tur_key}')
+            # print(f'KrumhaslSchumuckler: {mon_key}')
+            # print(f'Analze Key: {hoc_key}')
+            # print(f'AardenEssen: {analysis.discrete.AardenEssen().getSolution(parsed)}')
+            # print(f'BellmanBudge: {analysis.discrete.BellmanBudge().getSolution(parsed)}')
+            # print(f'TemperleyKostkaPayne: {analysis.discrete.TemperleyKostkaPayne().getSolution(parsed)}')
+
+            if tur_key == mon_key:
+                real_key = tur_key
+            elif tur_key == hoc_key:
+                real_key = tur_key
+            elif mon_key == hoc_key:
+                real_key = mon_key
             else:
-                tur_key = parsed.recurse().getElementsByClass(key.Key)[0]      # only returns major keys
-                mon_key = parsed.analyze('key.krumhanslschmuckler')
-                hoc_key = parsed.analyze('key')
+                real_key = tur_key
                 
-                # print(f'{my_metadata[x].metadata.sourcePath}')
-                # print(f'Get Elements: {tur_key}')
-                # print(f'KrumhaslSchumuckler: {mon_key}')
-                # print(f'Analze Key: {hoc_key}')
-                # print(f'AardenEssen: {analysis.discrete.AardenEssen().getSolution(parsed)}')
-                # print(f'BellmanBudge: {analysis.discrete.BellmanBudge().getSolution(parsed)}')
-                # print(f'TemperleyKostkaPayne: {analysis.discrete.TemperleyKostkaPayne().getSolution(parsed)}')
-
-                if tur_key == mon_key:
-                    real_key = tur_key
-                elif tur_key == hoc_key:
-                    real_key = tur_key
-                elif mon_key == hoc_key:
-                    real_key = mon_key
-                else:
-                    real_key = tur_key
-                    
-                a_dictionary[score]['Pitch'].update({'Key Signature': str(real_key)})   #needs str() to add a string
+            a_dictionary[score]['Pitch'].update({'Key Signature': real_key})
 
     return a_dictionary
 
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def find_clef(a_dictionary, score):
     """
     This funcation needs to iterate through every part.
     """
 
     a_dictionary[score]['Pitch']['Clef'] = []
-    parsed = a_dictionary[score]['File Information']['Stream']
+    the_walk = score_walk(a_dictionary, score, names=('Clefs',))
     
-    for next_part in parsed.parts:
-        raw_clef = next_part.recurse().getElementsByClass('Clef')[0]
-        processing = str(raw_clef).split('.')[-1].strip('>')
-        finish_clef = re.sub('([A-Z])', r' \1', processing).strip()
+    # The walk has already turned each clef into its friendly name.  Take the first clef of each part.
+    for next_part in the_walk['Parts']:
+        finish_clef = next_part['Clefs'][0]
         
         if finish_clef not in a_dictionary[score]['Pitch']['Clef']:
             a_dictionary[score]['Pitch']['Clef'].append(finish_clef)
@@ -104,23 +234,26 @@ def find_clef(a_dictionary, score):
 
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def melody_range(a_dictionary, score):
     """
     Get the interval range, lowest note, and highest note for each part from music21.analaysis.discrete module.
     """
 
-    parsed = a_dictionary[score]['File Information']['Stream']
+    # The parts of the fast path's walk if there is one, so the score is not parsed.  See pitch_span().
+    the_walk = fast_events(a_dictionary, score)
+    the_parts = the_walk['Parts'] if the_walk is not None else score_stream(a_dictionary, score).parts
     a_dictionary[score]['Pitch']['Range'] = {}
     
-    for x in range(len(parsed.parts)):
+    for x in range(len(the_parts)):
         if a_dictionary[score]['Pitch']['Key Signature'] != 'Unpitched': 
-            step_1 = analysis.discrete.Ambitus()
-            pitchMin, pitchMax = step_1.getPitchSpan(parsed.parts[x])
+            pitchMin, pitchMax = pitch_span(the_parts[x])
             a_dictionary[score]['Pitch']['Range'].update({'Part '+str(x+1): {}})
             a_dictionary[score]['Pitch']['Range']['Part '+str(x+1)].update({'Lowest Note': str(pitchMin)})
             a_dictionary[score]['Pitch']['Range']['Part '+str(x+1)].update({'Highest Note': str(pitchMax)})
 
-            step_2 = step_1.getSolution(parsed.parts[x])
+            # The same interval analysis.discrete.Ambitus().getSolution() gives
+            step_2 = interval.Interval(noteStart=pitchMin, noteEnd=pitchMax)
             step_3 = str(step_2).split('.')[-1].strip('Interval').strip('>')
             a_dictionary[score]['Pitch']['Range']['Part '+str(x+1)].update({'Interval': str(step_3)})
         else:
@@ -132,16 +265,17 @@ def melody_range(a_dictionary, score):
     return a_dictionary
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def letter_names(a_dictionary, score):
     """
     Get the letter names for each part of each score.
     """
     # Parse the scores.
 
-    parsed = a_dictionary[score]['File Information']['Stream']
+    the_walk = score_walk(a_dictionary, score, names=('Letter Names',))
     a_dictionary[score]['Pitch']['Letter Names'] = {'All': {}}
     
-    for i, next_part in enumerate(parsed.parts):
+    for i, next_part in enumerate(the_walk['Parts']):
         
         # If a score is unpitched we fill in the dictionary entries with None.
         if a_dictionary[score]['Pitch']['Key Signature'] == 'Unpitched':
@@ -150,21 +284,11 @@ def letter_names(a_dictionary, score):
 
         # Otherwise the score has pitches and needs processing.
         else:
-            # List to store notes
-            note_list = []
-        
-            # Recurse the part and get the Note attribute of the M21 note class.  
-            score_notes = next_part.recurse().getElementsByClass(note.Note)
-        
-            # Iterate through the notes to extract the parts we need.
-            for next_note in score_notes:
-            
-                # We take the last character of the string
-                only_letter = str(next_note).split('.')[-1].split()[-1].strip('>')
-                note_list.append(only_letter)
+            # The walk took the letter name of every Note in the part.
+            note_list = list(next_part['Letter Names'])
             
             # Add list of letter names for each part to dictionary.
-            a_dictionary[score]['Pitch']['Letter Names']['All'].update({'Part '+ str(i+1): note_list})
+            a_dictionary[score]['Pitch']['Letter Names']['All'].update({'Part '+ str(i+1): coded('Letter Names', note_list)})
 
             # Create a list of all letters for counting appearances.
             letter_list = []
@@ -172,31 +296,22 @@ def letter_names(a_dictionary, score):
                 for next_note in a_dictionary[score]['Pitch']['Letter Names']['All'][next_part]:
                     letter_list.append(next_note)
 
-            # Set up dictionary for unique letter names
-            a_dictionary[score]['Pitch']['Letter Names'].update({'Types': {}})
-
-            # Count instances of each letter.  
-            for next_note in set(letter_list):
-                note_count = 0
-                for next_letter in letter_list:
-                    if next_note == next_letter:
-                        note_count += 1
-
-                # Add letter and count to dictionary
-                a_dictionary[score]['Pitch']['Letter Names']['Types'].update({next_note: note_count})
+            # Count instances of each letter in one pass and add the letters and counts to the dictionary.
+            a_dictionary[score]['Pitch']['Letter Names'].update({'Types': dict(Counter(letter_list))})
 
     return a_dictionary
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def solfege_names(a_dictionary, score):
     """
     Get the solfege names for each part of each score.
     """
     # Parse the scores and set up the dictionaries
-    parsed = a_dictionary[score]['File Information']['Stream']
+    the_walk = score_walk(a_dictionary, score, names=())
     a_dictionary[score]['Pitch']['Solfege'] = {'All': {}}
     
-    for i, next_part in enumerate(parsed.parts):
+    for i, next_part in enumerate(the_walk['Parts']):
         
         # If a score is unpitched we fill in the dictionary entries with None
         if a_dictionary[score]['Pitch']['Key Signature'] == 'Unpitched':
@@ -205,19 +320,18 @@ def solfege_names(a_dictionary, score):
         
         # Pitched scores need to be processed
         else:
-            # Create a Music21 key object to use for solfege calculation
+            # The key the solfege is calculated in
             letter_key = a_dictionary[score]['Pitch']['Key Signature'].split()[0]
-            m21_key = key.Key(letter_key)
             
             # Use Music21 solfege function calculate the syllables for each part of each score
             solfege_list = []
             for next_list in a_dictionary[score]['Pitch']['Letter Names']['All']:
                 
                 for next_note in a_dictionary[score]['Pitch']['Letter Names']['All'][next_list]:
-                    sol_note = m21_key.solfeg(next_note)
+                    sol_note = solfege_syllable(letter_key, next_note)
                     solfege_list.append(sol_note)
                     
-            a_dictionary[score]['Pitch']['Solfege']['All'].update({'Part '+ str(i+1): solfege_list})
+            a_dictionary[score]['Pitch']['Solfege']['All'].update({'Part '+ str(i+1): coded('Solfege', solfege_list)})
             
             # Create a master syllable list for counting appearances
             total_sol = []
@@ -225,52 +339,44 @@ def solfege_names(a_dictionary, score):
                 for next_note in a_dictionary[score]['Pitch']['Solfege']['All'][next_part]:
                     total_sol.append(next_note)
 
-            # Set up dictionary for unique solfege syllables
-            a_dictionary[score]['Pitch']['Solfege'].update({'Types': {}})
-
-            # Count instances of each syllable  
-            for next_note in set(total_sol):
-                sol_count = 0
-                for next_syll in total_sol:
-                    if next_note == next_syll:
-                        sol_count += 1
-
-                # Add syllable and count to dictionary
-                a_dictionary[score]['Pitch']['Solfege']['Types'].update({next_note: sol_count})
+            # Count instances of each syllable in one pass and add the syllables and counts to the dictionary.
+            a_dictionary[score]['Pitch']['Solfege'].update({'Types': dict(Counter(total_sol))})
 
     return a_dictionary
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def intervals(a_dictionary, score):
     """
     Get the solfege names for each part of each score.
     """
-    # Parse the scores and set up the dictionaries
-    
-    parsed = a_dictionary[score]['File Information']['Stream']
+    # The parts of the fast path's walk if there is one, so the score is not parsed.  See melody_steps().
+    the_walk = fast_events(a_dictionary, score)
+    the_parts = the_walk['Parts'] if the_walk is not None else score_stream(a_dictionary, score).parts
     a_dictionary[score]['Pitch']['Intervals'] = {'All': {}}
+    a_dictionary[score]['Pitch']['Contour'] = {'All': {}}
     
-    for i, next_part in enumerate(parsed.parts):
+    for i, next_part in enumerate(the_parts):
         
         # If a score is unpitched we fill in the dictionary entries with None
         if a_dictionary[score]['Pitch']['Key Signature'] == 'Unpitched':
             a_dictionary[score]['Pitch']['Intervals']['All'].update({'Part '+ str(i+1): None})
             a_dictionary[score]['Pitch']['Intervals'].update({'Types': None})
+            a_dictionary[score]['Pitch']['Contour']['All'].update({'Part '+ str(i+1): None})
+            a_dictionary[score]['Pitch']['Contour'].update({'Types': None})
 
         # Pitched scores need to be processed
         else:
-            # List to store notes
-            interval_list = []
-        
-            # Flatten the part and get the Note attribute of the Music21 note class.  
-            our_notes = next_part.flat.getElementsByClass(note.Note)
-            
-            # Use Music21 to calculate the intervals (Unknown why this is part of the segmentByRests class)
-            the_intervals = analysis.segmentByRests.Segmenter.getIntervalList(our_notes)
+            # The interval between each pair of contiguous notes, and which way it goes
+            the_steps = melody_steps(next_part)
             
             # Make the list with friendly names and add it
-            interval_list = [x.name for x in the_intervals]
-            a_dictionary[score]['Pitch']['Intervals']['All'].update({'Part '+ str(i+1): interval_list})
+            interval_list = [name for name, direction in the_steps]
+            a_dictionary[score]['Pitch']['Intervals']['All'].update({'Part '+ str(i+1): coded('Intervals', interval_list)})
+            
+            # Interval names do not say which way the melody moved.  The contour does, so the two together describe the melody in any key.
+            contour_list = [direction for name, direction in the_steps]
+            a_dictionary[score]['Pitch']['Contour']['All'].update({'Part '+ str(i+1): coded('Contour', contour_list)})
 
             # Create a master interval list for counting appearances
             total_int = []
@@ -278,18 +384,11 @@ def intervals(a_dictionary, score):
                 for next_int in a_dictionary[score]['Pitch']['Intervals']['All'][next_part]:
                     total_int.append(next_int)
 
-            # Set up dictionary for unique intervals
-            a_dictionary[score]['Pitch']['Intervals'].update({'Types': {}})
-
-            # Count instances of each syllable  
-            for next_int in set(total_int):
-                int_count = 0
-                for next_dis in total_int:
-                    if next_int == next_dis:
-                        int_count += 1
-
-                # Add syllable and count to dictionary
-                a_dictionary[score]['Pitch']['Intervals']['Types'].update({next_int: int_count})
+            # Count instances of each interval in one pass and add the intervals and counts to the dictionary.
+            a_dictionary[score]['Pitch']['Intervals'].update({'Types': dict(Counter(total_int))})
+            
+            total_contour = [next_direction for next_part in a_dictionary[score]['Pitch']['Contour']['All'].values() for next_direction in next_part]
+            a_dictionary[score]['Pitch']['Contour'].update({'Types': dict(Counter(total_contour))})
 
     return a_dictionary
 
@@ -298,8 +397,8 @@ def intervals(a_dictionary, score):
 if __name__ == '__main__':
     
     # Retreive the Score Dictionary and metadata.
-    score_dictionary = unpickle_it(pickle_path=SCORE_DATAPATH, be_verbose=False)
-    my_metadata = access_metadata()
+    score_dictionary = unpickle_shards(be_verbose=False)
+    my_metadata = metadata_index()
     
     for next_score in score_dictionary:
         
@@ -312,5 +411,5 @@ if __name__ == '__main__':
         #intervals(score_dictionary, my_metadata)
 
     pprint(score_dictionary)
-    #pickle_it(score_dictionary, pickle_path=SCORE_DATAPATH, text_path=SCORE_LOGPATH)
+    #pickle_shards(score_dictionary, text_path=SCORE_LOGPATH)
 
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Song Search Profiling
+written by: Song Search contributors
+created on: 18 October 2026
+
+Time every extractor, and every Music21 parse, score by score.  Each extractor is wrapped with @profiled, and parse_cache.py times
+corpus.manager.parse() and the thaw of a frozen stream with profile_call().  For each (score, name) the profile keeps:
+
+    Calls       number of calls
+    Wall        wall-clock seconds (time.perf_counter)
+    CPU         CPU seconds of this process (time.process_time)
+    Peak        largest tracemalloc peak of a call, in bytes, if memory profiling is on
+
+The times are each call's own: a parse which happens inside the first extractor to ask for the stream is counted under Parse, not
+under that extractor.
+
+Profiling is off unless the SCORE_PROFILE environment variable is set (SCORE_PROFILE=1, or SCORE_PROFILE=memory to add tracemalloc)
+or enable_profiling() is called, e.g. by score_dictionary(profile=True).  When it is off, a wrapped extractor costs one extra call
+and one dictionary lookup.
+
+    profile_report(top=10)          -> text: slowest scores, slowest extractors, and each score's breakdown
+    profile_stats()                 -> {score: {name: {Calls, Wall, CPU, Peak}}}
+    take_stats() / merge_stats()    hand a worker process's profile to the parent
+
+Standard library only.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import time
+import functools
+import tracemalloc
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+PROFILE_SETTING     = os.environ.get('SCORE_PROFILE', '').strip().lower()
+
+# Whether profiling is on, and whether it also traces memory.
+_PROFILE            = {'On': PROFILE_SETTING not in ('', '0', 'no', 'off'), 'Memory': PROFILE_SETTING == 'memory'}
+
+# {(score, name): [calls, wall, cpu, peak]}
+_STATS              = {}
+
+# One frame per profiled call in progress: [score, child wall, child cpu, child peak].
+_STACK              = []
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def profiling_enabled():
+    """
+    Whether calls are being profiled.
+    """
+    return _PROFILE['On']
+#
+#-----------------------------------------------------------------------------------------------
+def profiling_state():
+    """
+    The settings to hand a worker process (see enable_profiling()).
+    """
+    return dict(_PROFILE)
+#
+#-----------------------------------------------------------------------------------------------
+def enable_profiling(memory=False, state=None):
+    """
+    Start profiling, with tracemalloc peaks if memory is True.  state (from profiling_state()) copies another process's settings.
+    """
+    _PROFILE.update(state or {'On': True, 'Memory': memory})
+
+    if _PROFILE['On'] and _PROFILE['Memory'] and not tracemalloc.is_tracing():
+        tracemalloc.start()
+#
+#-----------------------------------------------------------------------------------------------
+def disable_profiling():
+    """
+    Stop profiling.  What has been recorded is kept.
+    """
+    _PROFILE.update({'On': False, 'Memory': False})
+
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+#
+#-----------------------------------------------------------------------------------------------
+def reset_profile():
+    """
+    Forget everything recorded so far.
+    """
+    _STATS.clear()
+#
+#-----------------------------------------------------------------------------------------------
+def score_name(score):
+    """
+    The name a score is recorded under: its title, 'title - variant' for a Family variant, or its file name for a path.
+    """
+    if isinstance(score, tuple):
+        return ' - '.join(score)
+
+    score = str(score)
+    if '/' in score:
+        return score.split('/')[-1].split('.')[0]
+
+    return score
+#
+#-----------------------------------------------------------------------------------------------
+def current_score(default=None):
+    """
+    The score of the profiled call in progress, or default if there is none.
+    """
+    return _STACK[-1][0] if _STACK else default
+#
+#-----------------------------------------------------------------------------------------------
+def profile_call(name, score, function, *args, **kwargs):
+    """
+    Call function(*args, **kwargs) and record it under (score, name).
+    """
+    if not _PROFILE['On']:
+        return function(*args, **kwargs)
+
+    frame = [score_name(score), 0.0, 0.0, 0]
+    _STACK.append(frame)
+
+    memory = _PROFILE['Memory']
+    if memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    try:
+        return function(*args, **kwargs)
+
+    finally:
+        wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+        peak = max(tracemalloc.get_traced_memory()[1] - start_bytes, frame[3]) if memory else 0
+        _STACK.pop()
+
+        # The caller's own time leaves this call out.
+        if _STACK:
+            _STACK[-1][1] += wall
+            _STACK[-1][2] += cpu
+            _STACK[-1][3] = max(_STACK[-1][3], peak)
+
+        stats = _STATS.setdefault((frame[0], name), [0, 0.0, 0.0, 0])
+        stats[0] += 1
+        stats[1] += wall - frame[1]
+        stats[2] += cpu - frame[2]
+        stats[3] = max(stats[3], peak)
+#
+#-----------------------------------------------------------------------------------------------
+def profiled(function):
+    """
+    Decorator for an extractor: record each call under its name and its score, the last positional argument.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _PROFILE['On']:
+            return function(*args, **kwargs)
+        return profile_call(function.__name__, args[-1], function, *args, **kwargs)
+
+    return wrapper
+#
+#-----------------------------------------------------------------------------------------------
+def take_stats():
+    """
+    Everything recorded in this process, as a plain dict which can be sent to another process, and forget it here.
+    """
+    stats = {the_key: list(values) for the_key, values in _STATS.items()}
+    _STATS.clear()
+
+    return stats
+#
+#-----------------------------------------------------------------------------------------------
+def merge_stats(stats):
+    """
+    Add stats from take_stats() (e.g. from a worker process) to this process's profile.
+    """
+    for the_key, (calls, wall, cpu, peak) in (stats or {}).items():
+        totals = _STATS.setdefault(the_key, [0, 0.0, 0.0, 0])
+        totals[0] += calls
+        totals[1] += wall
+        totals[2] += cpu
+        totals[3] = max(totals[3], peak)
+#
+#-----------------------------------------------------------------------------------------------
+def profile_stats():
+    """
+    The profile as {score: {name: {Calls, Wall, CPU, Peak}}}.
+    """
+    stats = {}
+    for (score, name), (calls, wall, cpu, peak) in _STATS.items():
+        stats.setdefault(score, {})[name] = {'Calls': calls, 'Wall': wall, 'CPU': cpu, 'Peak': peak}
+
+    return stats
+#
+#-----------------------------------------------------------------------------------------------
+def _totals(group_of):
+    """
+    Total the profile by score or by name: {group: [calls, wall, cpu, peak]}, slowest (wall) first.
+    """
+    totals = {}
+    for the_key, (calls, wall, cpu, peak) in _STATS.items():
+        group = totals.setdefault(group_of(the_key), [0, 0.0, 0.0, 0])
+        group[0] += calls
+        group[1] += wall
+        group[2] += cpu
+        group[3] = max(group[3], peak)
+
+    return dict(sorted(totals.items(), key=lambda item: -item[1][1]))
+#
+#-----------------------------------------------------------------------------------------------
+def _row(label, calls, wall, cpu, peak):
+    """
+    One line of the report.
+    """
+    return f'{label[:44]:<46}{calls:>7}{wall * 1e3:>12.1f}{cpu * 1e3:>12.1f}{wall / max(calls, 1) * 1e3:>11.2f}{peak / 1024:>11.0f}'
+#
+#-----------------------------------------------------------------------------------------------
+def profile_report(top=10):
+    """
+    The profile as text: the top slowest scores, every extractor slowest first, then each of the top scores' extractors.
+    """
+    header = f'{"":<46}{"calls":>7}{"wall ms":>12}{"cpu ms":>12}{"ms/call":>11}{"peak KiB":>11}'
+    by_score = _totals(lambda the_key: the_key[0])
+    by_name = _totals(lambda the_key: the_key[1])
+    total_wall = sum(values[1] for values in by_name.values())
+
+    lines = [f'Profile of {len(by_score)} scores, {total_wall:.2f} s in profiled calls', '']
+
+    lines += [f'Slowest scores (top {top})', header]
+    lines += [_row(score, *values) for score, values in list(by_score.items())[:top]]
+
+    lines += ['', 'Slowest extractors', header]
+    lines += [_row(name, *values) for name, values in by_name.items()]
+
+    lines += ['', f'Breakdown of the slowest scores (top {top})']
+    for score in list(by_score)[:top]:
+        lines += ['', score, header]
+        calls = sorted(((name, values) for (next_score, name), values in _STATS.items() if next_score == score), key=lambda item: -item[1][1])
+        lines += [_row(f'    {name}', *values) for name, values in calls]
+
+    return '\n'.join(lines) + '\n'
+#
+#-----------------------------------------------------------------------------------------------
+def write_profile_report(report_path, top=10):
+    """
+    Save profile_report() to a text file.
+    """
+    os.makedirs(os.path.dirname(str(report_path)), exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as the_file:
+        the_file.write(profile_report(top))
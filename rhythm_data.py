@@ -25,36 +25,95 @@ Populate the rhythm dictionary for each score in this format.
 #-----------------------------------------------------------------------------------------------
 from music21        import *
 from pprint         import pprint
+from collections    import Counter
 
-from music21_globals  import SCORE_DATAPATH
 from music21_globals  import SCORE_LOGPATH
-from music21_globals  import unpickle_it
-from music21_globals  import pickle_it
+from shard_store      import pickle_shards
+from shard_store      import unpickle_shards
 from music21_globals  import access_metadata
+from music21_globals  import metadata_index
+from music21_globals  import find_metadata
 from music21_globals  import define_corpus
 
+from stream_cache     import score_stream
+from sequence_store   import coded
+from score_walk       import register_collector
+from score_walk       import score_walk
+from score_walk       import fast_events
+from score_walk       import all_parts
+from profiling        import profiled
+
+#                                           COLLECTORS
+#-----------------------------------------------------------------------------------------------
+# What the score walk gathers for this module.  See score_walk.py.
+
+def note_value(a_note):
+    """
+    Turn a note or rest into its value.  Chords and chord symbols return None and are left out.
+    """
+    # Notes we take the last two words of the string
+    if a_note.fullName.endswith('Note'):
+        return a_note.fullName.split()[4] + ' ' + a_note.fullName.split()[5]
+    
+    # Rests we take the whole string.
+    elif a_note.fullName.endswith('Rest'):
+        return a_note.fullName
+    
+    return None
+#
+#-----------------------------------------------------------------------------------------------
+def tie_type(a_note):
+    """
+    The tie type ('start', 'continue', 'stop') of a note, or None if it is not tied.
+    """
+    if a_note.tie:
+        return a_note.tie.type
+    
+    return None
+
+register_collector('Values',    note.GeneralNote,   note_value)
+register_collector('Ties',      note.NotRest,       tie_type)
+
 #                                            METHODS
 #-----------------------------------------------------------------------------------------------
+def pickup_length(measure_offsets):
+    """
+    repeat.RepeatFinder(parsed).getQuarterLengthOfPickupMeasure() from the offsets of the first part's measures (see fast_xml.py): the
+    first measure's length, less any whole measures, measured by the second one.
+    """
+    offsets = sorted({common.opFrac(next_offset) for next_offset in measure_offsets})
+    
+    if len(offsets) < 3:
+        raise repeat.InsufficientLengthException('Cannot determine length of pickup given fewer than 3 measures')
+    
+    return (offsets[1] - offsets[0]) % (offsets[2] - offsets[1])
+#
+#-----------------------------------------------------------------------------------------------
+@profiled
 def time_signature(a_dictionary, the_metadata, score):
     """
     Extract the time signature information for each score and add to its dictionary.
     
     TODO: If a score has a hidden time signature, it cannot be extracted by music21, either through the metadata or 
     through getElementsByClass(meter.TimeSignature).  Is there a way to extrapolate the information from other properties?
+    
+    the_metadata is the index from metadata_index() (a raw bundle also works, see find_metadata()).
     """
     
 
     # Try to get the time signatures out of the metadata.  If the time signature is hidden, this method will fail.
-    for x in range(len(the_metadata)):
-        if the_metadata[x].metadata.sourcePath == a_dictionary[score]['File Information']['Path']:
-            if the_metadata[x].metadata.timeSignatures != []:
-                a_dictionary[score]['Rhythm'].update({'Time Signature': the_metadata[x].metadata.timeSignatures})
-            else:
-                a_dictionary[score]['Rhythm'].update({'Time Signature': 'hidden'})
+    score_metadata = find_metadata(the_metadata, a_dictionary[score]['File Information']['Path'])
+    
+    if score_metadata is not None:
+        if score_metadata.timeSignatures != []:
+            a_dictionary[score]['Rhythm'].update({'Time Signature': score_metadata.timeSignatures})
+        else:
+            a_dictionary[score]['Rhythm'].update({'Time Signature': 'hidden'})
 
     return a_dictionary
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def meter(a_dictionary, score):
     """
     Using the time signature, figure out the score's meter.  We are working under the principle that there are three meters: duple, triple, and mixed.
@@ -88,71 +147,52 @@ def meter(a_dictionary, score):
     return a_dictionary
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def value_list(a_dictionary, score):
     """
     Extract the note/rest value list from the leadsheet score and enter it into the score dictionary.
     Each part will need its own list.
     """
-    # Parse each score from its stream.   
-    parsed = a_dictionary[score]['File Information']['Stream']
+    # Walk the score from its stream.   
+    the_walk = score_walk(a_dictionary, score, names=('Values',))
     
     # Add the All Values sub-dictionary to each score's data structure.
     a_dictionary[score]['Rhythm'].update({'Values': {'All': {}}})
     
-    # Enumerate through the parsed parts because we need both the part and it's index number
-    for i, next_part in enumerate(parsed.parts):
-        
-        # List to store notes
-        note_list = []
+    # Enumerate through the walked parts because we need both the part and it's index number
+    for i, next_part in enumerate(the_walk['Parts']):
         
-        # Recurse the part and get the GeneralNote attribute of the M21 note class.  
-        # General note is the only class attribute which accurately lists both notes and rests.
-        score_notes = next_part.recurse().getElementsByClass(note.GeneralNote)
-        
-        # Iterate through the notes to extract the parts we need.
-        for next_note in score_notes:
-            
-            # Notes we take the last two words of the string
-            if next_note.fullName.endswith('Note'):
-                note_val = next_note.fullName.split()[4] + ' ' + next_note.fullName.split()[5]
-                note_list.append(note_val)
-            
-            # Rests we take the whole string. (We ignore chords in this function)   
-            elif next_note.fullName.endswith('Rest'):
-                note_list.append(next_note.fullName)
+        # The walk took the value of every GeneralNote in the part.
+        # General note is the only class attribute which accurately lists both notes and rests.  (We ignore chords in this function)
+        note_list = list(next_part['Values'])
             
         # Populate the sub-dictionary. Identify each part by its index number +1
-        a_dictionary[score]['Rhythm']['Values']['All'].update({'Part '+ str(i+1): note_list})
+        a_dictionary[score]['Rhythm']['Values']['All'].update({'Part '+ str(i+1): coded('Values', note_list)})
         
         value_list = []
         for next_part in a_dictionary[score]['Rhythm']['Values']['All']:
             for next_note in a_dictionary[score]['Rhythm']['Values']['All'][next_part]:
                 value_list.append(next_note)
     
-        # Set up dictionary for unique letter names
-        a_dictionary[score]['Rhythm']['Values'].update({'Types': {}})
-
-        # Count instances of each letter.  
-        for next_note in set(value_list):
-            note_count = 0
-            for next_value in value_list:
-                if next_note == next_value:
-                    note_count += 1
-
-            # Add letter and count to dictionary
-            a_dictionary[score]['Rhythm']['Values']['Types'].update({next_note: note_count})
+        # Count instances of each value in one pass and add the values and counts to the dictionary.
+        a_dictionary[score]['Rhythm']['Values'].update({'Types': dict(Counter(value_list))})
 
     return a_dictionary
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def anacrusis(a_dictionary, score):
     """
     Find out if a score has pick-up notes.  Count the number and type of notes used.  Record in Score Dictionary.
     """
-    parsed = a_dictionary[score]['File Information']['Stream']
+    # The fast path's walk has the measure offsets, so the score is not parsed.
+    the_walk = fast_events(a_dictionary, score)
     
     try:
-        pickup = repeat.RepeatFinder(parsed).getQuarterLengthOfPickupMeasure()
+        if the_walk is not None:
+            pickup = pickup_length(the_walk['Parts'][0]['Measure Offsets'])
+        else:
+            pickup = repeat.RepeatFinder(score_stream(a_dictionary, score)).getQuarterLengthOfPickupMeasure()
         a_dictionary[score]['Rhythm']['Anacrusis'] = pickup
     
     except repeat.InsufficientLengthException:
@@ -161,30 +201,29 @@ def anacrusis(a_dictionary, score):
     return a_dictionary
 #
 #-----------------------------------------------------------------------------------------------
+@profiled
 def ties(a_dictionary, score):
     """
     Find out if a score has ties.  Count the number of ties and their length. Record all info in Score Dictionary.
     
     TODO: 1) Decide whether the note values in a tie are wanted.
     """
-    parsed = a_dictionary[score]['File Information']['Stream']
+    the_walk = score_walk(a_dictionary, score, names=('Ties',))
 
     tie_count = 0
     lengths = []
 
-    for n in range(len(parsed.recurse().notes)):
-        note = parsed.recurse().notes[n]
-
-        if note.tie:
-            if note.tie.type == 'start':
-                tie_count +=1
-                tie_length = 2
-            
-            if note.tie.type == 'continue':
-                tie_length += 1
-            
-            if tie_length not in lengths:
-                lengths.append(tie_length)
+    # The walk records the tie type of every tied note, part by part.
+    for next_tie in all_parts(the_walk, 'Ties'):
+        if next_tie == 'start':
+            tie_count +=1
+            tie_length = 2
+        
+        if next_tie == 'continue':
+            tie_length += 1
+        
+        if tie_length not in lengths:
+            lengths.append(tie_length)
 
     if lengths != []:
         a_dictionary[score]['Rhythm'].update({'Ties': {'Lengths': lengths}})
@@ -202,10 +241,10 @@ def ties(a_dictionary, score):
 if __name__ == '__main__':
     
     # Retreive the Score Dictionary and metadata.
-    score_dictionary = unpickle_it(pickle_path=SCORE_DATAPATH, be_verbose=False)
+    score_dictionary = unpickle_shards(be_verbose=False)
     #pprint(score_dictionary)
     
-    my_metadata = access_metadata()
+    my_metadata = metadata_index()
     #pprint(my_metadata)
     
     for next_score in score_dictionary:
@@ -217,6 +256,6 @@ if __name__ == '__main__':
         ties(score_dictionary, next_score)
 
     pprint(score_dictionary)
-    pickle_it(score_dictionary, pickle_path=SCORE_DATAPATH, text_path=SCORE_LOGPATH)
+    pickle_shards(score_dictionary, text_path=SCORE_LOGPATH)
     
     
\ No newline at end of file
@@ -12,8 +12,8 @@ Query the Type dictionary
 """
 from pprint         import pprint
 
-from music21_globals  import SCORE_DATAPATH
-from music21_globals  import unpickle_it
+from score_index    import load_score_index
+from score_index    import select
 
 REG_NOTES = ['Whole Note', 'Half Note', 'Quarter Note', 'Eighth Note', 'Sixteenth Note']
 REG_RESTS = ['Whole Rest', 'Half Rest', 'Quarter Rest', 'Eighth Rest', 'Sixteenth Rest']
@@ -22,9 +22,9 @@ DOT_RESTS = ['Dotted Whole Rest', 'Dotted Half Rest', 'Dotted Quarter Rest', 'Do
 
 
 def find_rhythmatician_candidates(reg_notes=None, reg_rests=None, dot_notes=None, dot_rests=None, num_items=None):
-    # Step 1: Retrieve data 
-    score_dictionary = unpickle_it(pickle_path=SCORE_DATAPATH, be_verbose=False)
-    # pprint(score_dictionary)
+    # Step 1: Retrieve data.  The score index is enough; the Score Dictionary is not unpickled.
+    score_index = load_score_index()
+    # pprint(score_index)
 
     # Step 2: Build query
     # search_list = []
@@ -43,16 +43,13 @@ def find_rhythmatician_candidates(reg_notes=None, reg_rests=None, dot_notes=None
     # pprint(search_list)
     
     # Step 3: Initial search. Eliminate all titles with too many types of notes/rests.
-    # pprint(score_dictionary['can can']['Rhythm']['Values']['Types'])
+    # pprint(score_index['Titles']['can can']['Value Types'])
     
-    first_pass_list =[]
-    
-    for next_title in score_dictionary:
-        if len(score_dictionary[next_title]['Rhythm']['Values']['Types']) == num_items and next_title not in first_pass_list:
-            first_pass_list.append(next_title)
+    hits = select(score_index, ranges={'Value Type Count': (num_items, num_items)})
+    first_pass_list = [next_title for next_title in score_index['Titles'] if next_title in hits]
             
     for next_entry in first_pass_list:
-        print(f"{next_entry}: {score_dictionary[next_entry]['Rhythm']['Values']['Types']} \n")
+        print(f"{next_entry}: {score_index['Titles'][next_entry]['Value Types']} \n")
         
     # pprint(first_pass_list)
     
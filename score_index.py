@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Song Search Score Index
+written by: Song Search contributors
+created on: 18 October 2026
+
+An inverted index over the analyzed fields of the Score Dictionary, so queries never have to unpickle the dictionary or scan every title.
+
+    { Terms:    { field: { value: set of titles } },                # e.g. Terms -> Meter -> 'triple'
+      Numbers:  { field: ( [sorted values], [titles in the same order] ) },
+      Titles:   { title: { Value Types: {rhythm value: count} } }  # just enough to print a result
+    }
+
+Term fields:    Value Types, Meter, Time Signature, Key Signature, Clef, Intervals, Solfege, Letter Names, Chords, Repeats, Parts
+Number fields:  Parts, Length (measures), Range (semitones, widest part), Value Type Count, Slurs, Ties, Anacrusis
+
+Queries combine terms with AND (all_of), OR (any_of), and NOT (none_of), plus inclusive numeric ranges:
+
+    select(the_index, all_of=[('Meter', 'triple')], none_of=[('Clef', 'Bass Clef')], ranges={'Range': (None, 9)})
+
+Standard library only.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import pickle
+import tempfile
+
+from numbers        import Real
+
+from bisect         import bisect_left
+from bisect         import bisect_right
+
+from score_paths    import INDEX_DATAPATH
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+# Term fields whose values are the keys of a 'Types' histogram: field: (section, sub-field)
+TYPE_TERMS          = {'Value Types':     ('Rhythm', 'Values'),
+                       'Intervals':       ('Pitch', 'Intervals'),
+                       'Solfege':         ('Pitch', 'Solfege'),
+                       'Letter Names':    ('Pitch', 'Letter Names'),
+                       'Chords':          ('Other', 'Chords')}
+
+# Term fields whose values are stored directly (a value or a list of values): field: (section, sub-field)
+VALUE_TERMS         = {'Meter':           ('Rhythm', 'Meter'),
+                       'Time Signature':  ('Rhythm', 'Time Signature'),
+                       'Key Signature':   ('Pitch', 'Key Signature'),
+                       'Clef':            ('Pitch', 'Clef'),
+                       'Repeats':         ('Other', 'Repeats'),
+                       'Parts':           ('Other', 'Parts')}
+
+# Semitones above C of each letter, for turning 'F#4' into a MIDI number.
+STEP_SEMITONES      = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def _field(entry, section, sub_field):
+    """
+    A field of one Score Dictionary entry, or None if it is missing.
+    """
+    return (entry.get(section) or {}).get(sub_field)
+#
+#-----------------------------------------------------------------------------------------------
+def midi_number(pitch_name):
+    """
+    The MIDI number of a Music21 pitch name such as 'C4', 'F#5' or 'B-3'.  Returns None for anything else.
+    """
+    try:
+        step, octave = pitch_name[0].upper(), int(pitch_name.lstrip('ABCDEFGabcdefg#-~`')[:3] or 'x')
+        alter = pitch_name.count('#') - pitch_name.count('-')
+        return 12 * (octave + 1) + STEP_SEMITONES[step] + alter
+
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+#
+#-----------------------------------------------------------------------------------------------
+def index_terms(entry):
+    """
+    The term values of one Score Dictionary entry: {field: set of values}.
+    """
+    terms = {}
+
+    for next_field, (section, sub_field) in TYPE_TERMS.items():
+        the_types = (_field(entry, section, sub_field) or {}).get('Types') or {}
+        terms[next_field] = set(the_types)
+
+    for next_field, (section, sub_field) in VALUE_TERMS.items():
+        the_value = _field(entry, section, sub_field)
+        values = the_value if isinstance(the_value, (list, tuple)) else [the_value]
+        terms[next_field] = {next_value for next_value in values if next_value is not None}
+
+    return terms
+#
+#-----------------------------------------------------------------------------------------------
+def index_numbers(entry):
+    """
+    The numeric values of one Score Dictionary entry: {field: number}.  Fields without a number are left out.
+    """
+    numbers = {'Parts':             _field(entry, 'Other', 'Parts'),
+               'Length':            _field(entry, 'Other', 'Length'),
+               'Value Type Count':  len(((_field(entry, 'Rhythm', 'Values') or {}).get('Types')) or {}),
+               'Slurs':             (_field(entry, 'Other', 'Slurs') or {}).get('Number') or 0,
+               'Ties':              (_field(entry, 'Rhythm', 'Ties') or {}).get('Number') or 0,
+               'Anacrusis':         _field(entry, 'Rhythm', 'Anacrusis')}
+
+    # Range in semitones: the widest part.
+    spans = []
+    for next_part in (_field(entry, 'Pitch', 'Range') or {}).values():
+        lowest, highest = midi_number(next_part.get('Lowest Note')), midi_number(next_part.get('Highest Note'))
+        if lowest is not None and highest is not None:
+            spans.append(highest - lowest)
+    numbers['Range'] = max(spans) if spans else None
+
+    # Anacrusis is a Fraction or 'not available', Slurs may be None: keep real numbers only.
+    return {next_field: float(value) for next_field, value in numbers.items() if isinstance(value, Real) and not isinstance(value, bool)}
+#
+#-----------------------------------------------------------------------------------------------
+def _add_title(the_index, next_title, entry):
+    """
+    Add one entry to the index.
+    """
+    for next_field, values in index_terms(entry).items():
+        field_terms = the_index['Terms'].setdefault(next_field, {})
+        for next_value in values:
+            field_terms.setdefault(next_value, set()).add(next_title)
+
+    for next_field, value in index_numbers(entry).items():
+        values, titles = the_index['Numbers'].setdefault(next_field, ([], []))
+        i = bisect_right(values, value)
+        values.insert(i, value)
+        titles.insert(i, next_title)
+
+    the_index['Titles'][next_title] = {'Value Types': dict(((_field(entry, 'Rhythm', 'Values') or {}).get('Types')) or {})}
+#
+#-----------------------------------------------------------------------------------------------
+def _remove_title(the_index, next_title):
+    """
+    Take one title out of the index.
+    """
+    for field_terms in the_index['Terms'].values():
+        for next_value in [v for v, titles in field_terms.items() if next_title in titles]:
+            field_terms[next_value].discard(next_title)
+            if not field_terms[next_value]:
+                del field_terms[next_value]
+
+    for values, titles in the_index['Numbers'].values():
+        while next_title in titles:
+            i = titles.index(next_title)
+            del values[i]
+            del titles[i]
+
+    the_index['Titles'].pop(next_title, None)
+#
+#-----------------------------------------------------------------------------------------------
+def build_score_index(score_dictionary):
+    """
+    Build the index of a whole Score Dictionary.
+    """
+    the_index = {'Terms': {}, 'Numbers': {}, 'Titles': {}}
+
+    # Collect the numbers first and sort once, rather than inserting one at a time.
+    numbers = {}
+    for next_title, entry in score_dictionary.items():
+        for next_field, values in index_terms(entry).items():
+            field_terms = the_index['Terms'].setdefault(next_field, {})
+            for next_value in values:
+                field_terms.setdefault(next_value, set()).add(next_title)
+
+        for next_field, value in index_numbers(entry).items():
+            numbers.setdefault(next_field, []).append((value, next_title))
+
+        the_index['Titles'][next_title] = {'Value Types': dict(((_field(entry, 'Rhythm', 'Values') or {}).get('Types')) or {})}
+
+    for next_field, pairs in numbers.items():
+        pairs.sort()
+        the_index['Numbers'][next_field] = ([value for value, title in pairs], [title for value, title in pairs])
+
+    return the_index
+#
+#-----------------------------------------------------------------------------------------------
+def update_score_index(the_index, score_dictionary, titles=(), deleted=()):
+    """
+    Patch the index after an incremental update: re-index the given titles and drop the deleted ones.
+    """
+    for next_title in set(titles) | set(deleted):
+        _remove_title(the_index, next_title)
+
+    for next_title in titles:
+        if next_title in score_dictionary:
+            _add_title(the_index, next_title, score_dictionary[next_title])
+
+    return the_index
+#
+#-----------------------------------------------------------------------------------------------
+def save_score_index(the_index, index_path=None):
+    """
+    Pickle the index.  It is written to a temporary file and moved into place, so readers never see half an index.
+    """
+    index_path = str(index_path or INDEX_DATAPATH)
+
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(index_path), suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as the_store:
+            pickle.dump(the_index, the_store, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, index_path)
+
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+#
+#-----------------------------------------------------------------------------------------------
+def load_score_index(index_path=None):
+    """
+    Unpickle the index.
+    """
+    with open(index_path or INDEX_DATAPATH, 'rb') as the_store:
+        return pickle.load(the_store)
+#
+#-----------------------------------------------------------------------------------------------
+def refresh_score_index(score_dictionary, titles=None, deleted=(), index_path=None):
+    """
+    Bring the saved index up to date with the Score Dictionary.  With titles=None (or no saved index) the whole index is rebuilt,
+    otherwise only the given titles are re-indexed and the deleted ones dropped.
+    """
+    the_index = None
+
+    if titles is not None:
+        try:
+            the_index = update_score_index(load_score_index(index_path), score_dictionary, titles=titles, deleted=deleted)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            the_index = None
+
+    if the_index is None:
+        the_index = build_score_index(score_dictionary)
+
+    save_score_index(the_index, index_path)
+    return the_index
+#
+#-----------------------------------------------------------------------------------------------
+def find(the_index, field, value):
+    """
+    The titles with a term value.
+    """
+    return set(the_index['Terms'].get(field, {}).get(value, ()))
+#
+#-----------------------------------------------------------------------------------------------
+def in_range(the_index, field, low=None, high=None):
+    """
+    The titles whose number field is between low and high (inclusive).  None leaves that end open.
+    """
+    values, titles = the_index['Numbers'].get(field, ([], []))
+
+    start = 0 if low is None else bisect_left(values, low)
+    end = len(values) if high is None else bisect_right(values, high)
+
+    return set(titles[start:end])
+#
+#-----------------------------------------------------------------------------------------------
+def select(the_index, all_of=None, any_of=None, none_of=None, ranges=None):
+    """
+    Titles matching every (field, value) in all_of, at least one in any_of, none in none_of, and every {field: (low, high)} in ranges.
+    With no all_of or ranges the search starts from every title.
+    """
+    found = None
+
+    for next_field, next_value in all_of or ():
+        matches = find(the_index, next_field, next_value)
+        found = matches if found is None else found & matches
+
+    for next_field, (low, high) in (ranges or {}).items():
+        matches = in_range(the_index, next_field, low, high)
+        found = matches if found is None else found & matches
+
+    if found is None:
+        found = set(the_index['Titles'])
+
+    if any_of:
+        either = set()
+        for next_field, next_value in any_of:
+            either |= find(the_index, next_field, next_value)
+        found &= either
+
+    for next_field, next_value in none_of or ():
+        found -= find(the_index, next_field, next_value)
+
+    return found
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Song Search Score Log
+written by: Song Search contributors
+created on: 18 October 2026
+
+The human-readable copy of the Score Dictionary (_Logs/score_dictionary.txt).  It used to be a pretty-print of the whole structure,
+which took longer than the build it logged.  Now it is one JSON record per line, in Score Dictionary order:
+
+    {"Title": "Chorale 7", "File Information": {...}, "Other": {...}, "Pitch": {...}, "Rhythm": {...}}
+
+so it can be diffed and searched with grep.  A save only re-encodes the records of the titles which changed; the others are copied
+from the previous log.  The records are encoded when the log is asked for, and merged and written on a background thread.
+
+    LOG_ENABLED:    False turns the log off
+    LOG_FIELDS:     None logs everything, otherwise only these sections ('Pitch') or fields ('Pitch.Intervals')
+
+Standard library only.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import json
+import tempfile
+import threading
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+LOG_ENABLED         = True
+LOG_FIELDS          = None
+
+# The log being written, so the next one waits for it.
+_LOG_THREAD         = {'Thread': None}
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def _plain(value):
+    """
+    JSON stand-in for anything json cannot write: sequences (e.g. CodedSequence) become lists, a StreamHandle its path, and the rest a string.
+    """
+    if hasattr(value, 'path') and type(value).__name__ == 'StreamHandle':
+        return value.path
+
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+
+    try:
+        return list(value)
+    except TypeError:
+        return str(value)
+#
+#-----------------------------------------------------------------------------------------------
+def _filtered(entry, fields):
+    """
+    The part of one entry to log: every section, or only the sections and 'Section.Field' fields in fields.
+    """
+    if fields is None:
+        return entry
+
+    record = {}
+    for next_field in fields:
+        section, _, sub_field = next_field.partition('.')
+        if section not in entry:
+            continue
+        if not sub_field:
+            record[section] = entry[section]
+        elif sub_field in (entry[section] or {}):
+            record.setdefault(section, {})[sub_field] = entry[section][sub_field]
+
+    return record
+#
+#-----------------------------------------------------------------------------------------------
+def log_record(title, entry, fields=None):
+    """
+    One line of the log.
+    """
+    record = {'Title': title}
+    record.update(_filtered(entry, fields))
+
+    return json.dumps(record, ensure_ascii=False, default=_plain)
+#
+#-----------------------------------------------------------------------------------------------
+def read_log(text_path):
+    """
+    The records of an existing log: {title: line}.  A missing log, or one in the old pretty-printed format, has none.
+    """
+    records = {}
+
+    try:
+        with open(text_path, encoding='utf-8') as the_log:
+            for next_line in the_log:
+                try:
+                    records[json.loads(next_line)['Title']] = next_line.rstrip('\n')
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+    except OSError:
+        pass
+
+    return records
+#
+#-----------------------------------------------------------------------------------------------
+def _write_log(text_path, order, new_records, fields, previous):
+    """
+    Merge the new records with the old log and replace it.  Runs on the background thread.
+    """
+    if previous is not None:
+        previous.join()
+
+    old_records = read_log(text_path) if len(new_records) < len(order) else {}
+
+    log_dir = os.path.dirname(str(text_path)) or '.'
+    os.makedirs(log_dir, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=log_dir, suffix='.tmp')
+
+    try:
+        with os.fdopen(handle, 'w', encoding='utf-8') as the_log:
+            for next_title, next_entry in order:
+                next_line = new_records.get(next_title) or old_records.get(next_title)
+                if next_line is None:
+                    # Not in the old log (e.g. it was turned off last time).  Encode it now.
+                    next_line = log_record(next_title, next_entry, fields)
+                the_log.write(next_line + '\n')
+            the_log.flush()
+            os.fsync(the_log.fileno())
+        os.replace(temp_path, text_path)
+
+    except OSError as why:
+        print(f'write_score_log  trying to save "{text_path}"')
+        print(f'  - Exception: {why}')
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+#
+#-----------------------------------------------------------------------------------------------
+def write_score_log(a_structure, text_path, titles=None, fields=None, background=True):
+    """
+    Write the log of a Score Dictionary.  titles=None re-encodes every record, otherwise only those of the given titles; deleted
+    titles simply drop out.  After changing fields, write with titles=None once so every record has the same fields.
+    Returns the thread writing the log (None if background=False or the log is off).
+    """
+    if not LOG_ENABLED or text_path is None:
+        return None
+
+    fields = LOG_FIELDS if fields is None else fields
+
+    # Encode the changed records now, so the caller can go on changing the dictionary while the file is written.
+    changed = a_structure if titles is None else [next_title for next_title in titles if next_title in a_structure]
+    new_records = {next_title: log_record(next_title, a_structure[next_title], fields) for next_title in changed}
+    order = [(next_title, None if next_title in new_records else a_structure[next_title]) for next_title in a_structure]
+
+    if not background:
+        wait_for_log()
+        _write_log(text_path, order, new_records, fields, None)
+        return None
+
+    the_thread = threading.Thread(target=_write_log, args=(text_path, order, new_records, fields, _LOG_THREAD['Thread']), name='score-log')
+    _LOG_THREAD['Thread'] = the_thread
+    the_thread.start()
+
+    return the_thread
+#
+#-----------------------------------------------------------------------------------------------
+def wait_for_log():
+    """
+    Wait for the log being written in the background, if there is one.
+    """
+    the_thread = _LOG_THREAD['Thread']
+    if the_thread is not None:
+        the_thread.join()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Song Search Paths
+written by: Song Search contributors
+created on: 18 October 2026
+
+Where the Score Library lives on disk.  Kept apart from music21_globals so modules which never parse a score can find the data
+without importing Music21.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+from pathlib    import Path
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+SCORE_DATAPATH           = Path.home().joinpath('Dropbox (Personal)', 'Score Library', 'score_search', 'score_data', '_Data', 'score_dictionary.pkl')
+SCORE_LOGPATH            = Path.home().joinpath('Dropbox (Personal)', 'Score Library', 'score_search', 'score_data', '_Logs', 'score_dictionary.txt')
+CORPUS_FILEPATH          = Path.home().joinpath('Dropbox (Personal)', 'Score Library', 'all_musicxml')
+CACHE_FILEPATH           = Path.home().joinpath('Dropbox (Personal)', 'Score Library', 'score_search', 'score_data', '_cache')
+
+# Frozen Music21 streams, see parse_cache.py
+PARSED_CACHEPATH         = CACHE_FILEPATH.joinpath('parsed')
+
+# Inverted index over the analyzed fields, see score_index.py
+INDEX_DATAPATH           = SCORE_DATAPATH.with_name('score_index.pkl')
+
+# Melodic n-gram index, see melody_index.py
+MELODY_DATAPATH          = SCORE_DATAPATH.with_name('melody_index.pkl')
+
+# One pickle per score, see shard_store.py
+SHARD_FILEPATH           = SCORE_DATAPATH.with_name('shards')
+
+# Normalized SQLite copy of the Score Dictionary, see sqlite_store.py
+SQLITE_DATAPATH          = SCORE_DATAPATH.with_name('score_dictionary.sqlite')
+
+# Scores which share another score's analysis, see duplicates.py
+DUPLICATE_REPORTPATH     = SCORE_LOGPATH.with_name('duplicates.json')
+
+# Per-score, per-extractor timings of a profiled build, see profiling.py
+PROFILE_REPORTPATH       = SCORE_LOGPATH.with_name('profile.txt')
+
+# File name -> paths of every score in the corpus, see corpus_scanner.py
+PATH_INDEXPATH           = CACHE_FILEPATH.joinpath('path_index.json')
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Song Search Query
+written by: Song Search contributors
+created on: 18 October 2026
+
+Ask the analyzed Score Library questions from the command line, without waiting for Music21 to import.  Only the standard library and
+the stores are loaded (score_index.py, melody_index.py, shard_store.py), so an answer comes back in a fraction of a second.  Music21 is
+only imported by the stream command, the one question which needs a score's stream.
+
+    python score_query.py find [--all FIELD=VALUE ...] [--any FIELD=VALUE ...] [--none FIELD=VALUE ...] [--range FIELD=LOW:HIGH ...]
+    python score_query.py show TITLE [SECTION [FIELD]]
+    python score_query.py melody [--intervals 'M2 M2 m3'] [--contour 'up up down'] [--mismatches N] [--incipit]
+    python score_query.py fields [FIELD]
+    python score_query.py stream TITLE
+
+find        titles from the score index.  Term fields (Meter, Clef, Value Types, ...) take a value, number fields (Length, Range,
+            Slurs, ...) a range: 'Range=:9' is at most 9 semitones, 'Length=8:16' is 8 to 16 measures, 'Parts=2' is exactly 2.
+show        one score's analysis, from its shard: everything, a section (Rhythm, Pitch, Other, File Information), or one field.
+melody      titles, parts, and note offsets of a melodic pattern, from the melody index.
+fields      the fields find knows, or the values of one term field.
+stream      one score's Music21 stream, as text.
+
+Field names, values, titles, and sections are matched without regard to case.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import sys
+import argparse
+
+from pprint         import pprint
+
+from score_index    import load_score_index
+from score_index    import select
+from shard_store    import shard_titles
+from shard_store    import unpickle_shards
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+SECTIONS            = ('File Information', 'Other', 'Pitch', 'Rhythm', 'Family')
+
+#                                            CLASSES
+#-----------------------------------------------------------------------------------------------
+class QueryError(Exception):
+    """
+    A question which cannot be asked: an unknown field, title, or section, or a badly written value.
+    """
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def _match(choices, text, what):
+    """
+    The one of choices which text names, ignoring case.
+    """
+    for next_choice in choices:
+        if str(next_choice) == text:
+            return next_choice
+
+    for next_choice in choices:
+        if str(next_choice).lower() == text.lower():
+            return next_choice
+
+    raise QueryError(f'No {what} "{text}".  Try one of: {", ".join(sorted(map(str, choices)))}')
+#
+#-----------------------------------------------------------------------------------------------
+def _split(condition, separator='='):
+    """
+    'Field=Value' as (field, value).
+    """
+    the_field, found, value = condition.partition(separator)
+    if not found:
+        raise QueryError(f'"{condition}" should be written FIELD{separator}VALUE')
+
+    return the_field.strip(), value.strip()
+#
+#-----------------------------------------------------------------------------------------------
+def term(the_index, condition):
+    """
+    A 'Field=Value' condition as a (field, value) pair of the index.  A value the index has never seen matches nothing.
+    """
+    the_field, value = _split(condition)
+    the_field = _match(the_index['Terms'], the_field, 'term field')
+
+    try:
+        return the_field, _match(the_index['Terms'][the_field], value, 'value')
+    except QueryError:
+        return the_field, value
+#
+#-----------------------------------------------------------------------------------------------
+def number_range(the_index, condition):
+    """
+    A 'Field=Low:High' (or 'Field=Value') condition as (field, (low, high)).  An empty end is left open.
+    """
+    the_field, value = _split(condition)
+    the_field = _match(the_index['Numbers'], the_field, 'number field')
+    low, found, high = value.partition(':')
+
+    try:
+        low = float(low) if low.strip() else None
+        high = (float(high) if high.strip() else None) if found else low
+    except ValueError:
+        raise QueryError(f'"{value}" should be a number or LOW:HIGH') from None
+
+    return the_field, (low, high)
+#
+#-----------------------------------------------------------------------------------------------
+def find_titles(all_of=(), any_of=(), none_of=(), ranges=(), the_index=None):
+    """
+    The titles matching the conditions, written as on the command line, in Score Dictionary order.
+    """
+    the_index = the_index or load_score_index()
+
+    found = select(the_index,
+                   all_of=[term(the_index, next_condition) for next_condition in all_of],
+                   any_of=[term(the_index, next_condition) for next_condition in any_of],
+                   none_of=[term(the_index, next_condition) for next_condition in none_of],
+                   ranges=dict(number_range(the_index, next_condition) for next_condition in ranges))
+
+    return [next_title for next_title in the_index['Titles'] if next_title in found]
+#
+#-----------------------------------------------------------------------------------------------
+def score_entry(title):
+    """
+    One score's entry, read from its shard alone.
+    """
+    title = _match(shard_titles(), title, 'score')
+
+    return title, unpickle_shards(titles=[title])[title]
+#
+#-----------------------------------------------------------------------------------------------
+def score_field(title, section=None, sub_field=None):
+    """
+    A score's entry, one section of it, or one field of a section.  The Stream handle is left out.
+    """
+    title, entry = score_entry(title)
+    answer = {next_section: value for next_section, value in entry.items()}
+    answer['File Information'] = {k: v for k, v in entry['File Information'].items() if k != 'Stream'}
+
+    if section:
+        answer = answer[_match([s for s in SECTIONS if s in answer], section, 'section')]
+    if sub_field:
+        if not isinstance(answer, dict):
+            raise QueryError(f'{section} has no fields')
+        answer = answer[_match(answer, sub_field, 'field')]
+
+    return title, answer
+#
+#-----------------------------------------------------------------------------------------------
+def score_stream(title):
+    """
+    A score's Music21 stream.  This is the only query which imports Music21, when the stream is parsed (see stream_cache.py).
+    """
+    title, entry = score_entry(title)
+
+    return entry['File Information']['Stream'].stream
+#
+#-----------------------------------------------------------------------------------------------
+def index_fields(the_field=None, the_index=None):
+    """
+    {term fields: [...], number fields: [...]}, or the values of one term field with how many titles have each.
+    """
+    the_index = the_index or load_score_index()
+
+    if the_field is None:
+        return {'Term Fields': sorted(the_index['Terms']), 'Number Fields': sorted(the_index['Numbers'])}
+
+    the_field = _match(the_index['Terms'], the_field, 'term field')
+    values = the_index['Terms'][the_field]
+
+    return {str(value): len(titles) for value, titles in sorted(values.items(), key=lambda item: (-len(item[1]), str(item[0])))}
+#
+#-----------------------------------------------------------------------------------------------
+def query_parser():
+    """
+    The command line.
+    """
+    parser = argparse.ArgumentParser(description='Query the analyzed Score Library.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    find = commands.add_parser('find', help='titles matching term values and number ranges')
+    find.add_argument('--all', action='append', default=[], metavar='FIELD=VALUE', help='must have (repeatable)')
+    find.add_argument('--any', action='append', default=[], metavar='FIELD=VALUE', help='must have at least one of (repeatable)')
+    find.add_argument('--none', action='append', default=[], metavar='FIELD=VALUE', help='must not have (repeatable)')
+    find.add_argument('--range', action='append', default=[], metavar='FIELD=LOW:HIGH', help='number between (repeatable)')
+    find.add_argument('--count', action='store_true', help='only print how many')
+
+    show = commands.add_parser('show', help="one score's analysis")
+    show.add_argument('title')
+    show.add_argument('section', nargs='?')
+    show.add_argument('field', nargs='?')
+
+    melody = commands.add_parser('melody', help='scores containing a melodic pattern')
+    melody.add_argument('--intervals', help="interval names, e.g. 'M2 M2 m3'")
+    melody.add_argument('--contour', help="e.g. 'up up down'")
+    melody.add_argument('--mismatches', type=int, default=0)
+    melody.add_argument('--incipit', action='store_true', help='only at the start of a part')
+
+    fields = commands.add_parser('fields', help='the fields find knows, or the values of one')
+    fields.add_argument('field', nargs='?')
+
+    stream = commands.add_parser('stream', help="one score's Music21 stream (imports Music21)")
+    stream.add_argument('title')
+
+    return parser
+#
+#-----------------------------------------------------------------------------------------------
+def main(argv=None):
+    """
+    Answer one query and print it.  Returns the exit status.
+    """
+    parser = query_parser()
+    arguments = parser.parse_args(argv)
+
+    try:
+        if arguments.command == 'find':
+            titles = find_titles(arguments.all, arguments.any, arguments.none, arguments.range)
+            print(len(titles) if arguments.count else '\n'.join(titles))
+
+        elif arguments.command == 'show':
+            title, answer = score_field(arguments.title, arguments.section, arguments.field)
+            print(f'{title}:')
+            pprint(answer, sort_dicts=False)
+
+        elif arguments.command == 'melody':
+            if not (arguments.intervals or arguments.contour):
+                parser.error('melody needs --intervals, --contour, or both')
+            from melody_index import load_melody_index
+            from melody_index import find_melody
+            for next_title, next_part, offset in find_melody(load_melody_index(), arguments.intervals, arguments.contour,
+                                                            mismatches=arguments.mismatches, incipit=arguments.incipit):
+                print(f'{next_title}\t{next_part}\t{offset}')
+
+        elif arguments.command == 'fields':
+            pprint(index_fields(arguments.field), sort_dicts=False)
+
+        elif arguments.command == 'stream':
+            score_stream(arguments.title).show('text')
+
+    except QueryError as why:
+        print(why, file=sys.stderr)
+        return 1
+
+    except FileNotFoundError as why:
+        print(f'The Score Library has not been analyzed yet ({why.filename}).  Run x_load_data.py first.', file=sys.stderr)
+        return 1
+
+    return 0
+
+#                                           MAIN
+#-----------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    sys.exit(main())
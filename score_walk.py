@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Song Search Score Walk
+written by: Song Search contributors
+created on: 18 October 2026
+
+Walk each part of a parsed score once and hand every element to the registered collectors.  The extractors in other_data, pitch_data,
+and rhythm_data read what the collectors gathered instead of each doing their own recurse() over the same Stream.
+
+A walk looks like this:
+
+    { Parts:    [ { Collector Name: [values in order of appearance], ... },     # one dictionary per part
+                  ...
+                ],
+      Score:    { Collector Name: [values] }                                   # elements stored outside the parts (e.g. spanners)
+    }
+
+To add a new field, register a collector for the music21 class it needs and read the walk in the extractor.  No new traversal is needed.
+
+An extractor which only reads collectors in fast_xml.FAST_COLLECTORS says so (score_walk(..., names=...)) and gets a walk read straight
+from the MusicXML, without parsing the score, unless the score uses something only Music21 reads correctly.  The fields a walk of the
+stream cannot give (lyrics, ranges, intervals, the anacrusis) are read from the raw events of the same fast walk (fast_events()), and
+from the stream only when there is none, so a score the fast path reads is never parsed.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+
+from music21        import *
+
+from stream_cache   import score_stream
+from fast_xml       import FAST_COLLECTORS
+from fast_xml       import FastPathUnsupported
+from fast_xml       import ParseError
+from fast_xml       import fast_walk
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+# Registered collectors as (name, music21 class, function).  The function turns a matching element into the value that gets recorded.
+# If the function is None the element itself is recorded.  If the function returns None nothing is recorded.
+WALK_COLLECTORS     = []
+
+# Which collectors apply to each element class.  Filled in as the walk meets new classes.
+_DISPATCH           = {}
+
+# The extractors for one score run back to back, so remembering the last walk is enough to share it between them.
+_LAST_WALK          = {'Stream': None, 'Walk': None}
+
+# The same for the fast path, keyed on the file and its modification time.  'Walk' is None if the file needs Music21.
+_LAST_FAST          = {'Key': None, 'Walk': None}
+
+# Set SCORE_FAST_WALK=0 to always walk the Music21 stream.
+FAST_WALK_ENABLED   = os.environ.get('SCORE_FAST_WALK', '1') != '0'
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def register_collector(name, m21_class, collect=None):
+    """
+    Add a collector to the walk.  Every element that is an instance of m21_class is passed to collect() and the result appended to
+    the walk's list under name.
+    """
+    WALK_COLLECTORS.append((name, m21_class, collect))
+    _DISPATCH.clear()
+    _LAST_WALK.update({'Stream': None, 'Walk': None})
+#
+#-----------------------------------------------------------------------------------------------
+def _collectors_for(element_class):
+    """
+    Look up (and remember) the collectors which apply to a class of element.
+    """
+    try:
+        return _DISPATCH[element_class]
+
+    except KeyError:
+        matches = [(name, collect) for name, m21_class, collect in WALK_COLLECTORS if issubclass(element_class, m21_class)]
+        _DISPATCH[element_class] = matches
+        return matches
+#
+#-----------------------------------------------------------------------------------------------
+def _visit(element, found):
+    """
+    Hand one element to its collectors and record the results in found.
+    """
+    for name, collect in _collectors_for(type(element)):
+        value = element if collect is None else collect(element)
+
+        if value is not None:
+            found[name].append(value)
+#
+#-----------------------------------------------------------------------------------------------
+def walk_score(parsed):
+    """
+    Walk a parsed score once: a single recurse() per part, plus the score-level elements which live outside the parts.
+    """
+    names = [name for name, m21_class, collect in WALK_COLLECTORS]
+    the_walk = {'Parts': [], 'Score': {name: [] for name in names}}
+
+    for next_part in parsed.parts:
+        found = {name: [] for name in names}
+
+        for element in next_part.recurse():
+            _visit(element, found)
+
+        the_walk['Parts'].append(found)
+
+    # Older versions of Music21 store spanners such as slurs on the score rather than on the part.
+    for element in parsed.elements:
+        if not isinstance(element, stream.Part):
+            _visit(element, the_walk['Score'])
+
+    return the_walk
+#
+#-----------------------------------------------------------------------------------------------
+def fast_score_walk(score_path):
+    """
+    The fast path's walk of a score file (see fast_xml.py), or None if the score has to be walked in Music21.
+    """
+    try:
+        stat = os.stat(score_path)
+    except OSError:
+        return None
+
+    the_key = (str(score_path), stat.st_mtime_ns, stat.st_size)
+    if _LAST_FAST['Key'] != the_key:
+        try:
+            the_walk = fast_walk(score_path)
+        except (FastPathUnsupported, ParseError, ValueError):
+            the_walk = None
+        _LAST_FAST.update({'Key': the_key, 'Walk': the_walk})
+
+    return _LAST_FAST['Walk']
+#
+#-----------------------------------------------------------------------------------------------
+def fast_events(a_dictionary, score):
+    """
+    The fast path's walk of a score in the Score Dictionary, with its raw events (fast_xml.EVENT_FIELDS), or None if the score has to
+    be parsed.
+    """
+    score_path = a_dictionary[score]['File Information'].get('Path')
+
+    if not FAST_WALK_ENABLED or score_path is None:
+        return None
+
+    return fast_score_walk(score_path)
+#
+#-----------------------------------------------------------------------------------------------
+def score_walk(a_dictionary, score, names=None):
+    """
+    Return the walk of a score in the Score Dictionary, walking its stream only the first time an extractor asks for it.
+
+    names are the collectors the caller reads.  If the fast path gathers all of them the walk comes from the MusicXML instead and the
+    score is not parsed.  names=None always walks the stream.
+    """
+    if names is not None and FAST_COLLECTORS.issuperset(names):
+        the_walk = fast_events(a_dictionary, score)
+        if the_walk is not None:
+            return the_walk
+
+    parsed = score_stream(a_dictionary, score)
+
+    if _LAST_WALK['Stream'] is not parsed:
+        _LAST_WALK.update({'Stream': parsed, 'Walk': walk_score(parsed)})
+
+    return _LAST_WALK['Walk']
+#
+#-----------------------------------------------------------------------------------------------
+def all_parts(the_walk, name):
+    """
+    Every value a collector recorded, across all the parts and the score itself, in walk order.
+    """
+    values = []
+    for next_part in the_walk['Parts']:
+        values.extend(next_part[name])
+    values.extend(the_walk['Score'][name])
+
+    return values
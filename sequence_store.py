@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Song Search Sequence Store
+written by: Song Search contributors
+created on: 18 October 2026
+
+Compact storage for the per-part 'All' sequences of the Score Dictionary (Letter Names, Solfege, Intervals, rhythm Values, Chords).
+The same few strings repeat millions of times across the corpus, so each field gets a Vocabulary which interns its strings to small
+integer codes, and each part's sequence is stored as an array('H') of codes.
+
+A CodedSequence reads like the list it replaces: len(), indexing, slicing, iteration, and == against a list all work.
+
+Vocabularies only ever grow, and each field has one per process (see vocabulary()).  A pickle stores each vocabulary once, however
+many sequences use it.  When a pickle made by another process is loaded, its sequences are re-coded into this process's vocabulary
+if the two disagree.
+
+Standard library only.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+from array          import array
+from collections    import abc
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+# One Vocabulary per field in this process.
+VOCABULARIES        = {}
+
+# array('H') holds codes up to 65535.  A larger vocabulary switches to array('I').
+_SMALL_CODES        = 0xFFFF
+
+#                                            CLASSES
+#-----------------------------------------------------------------------------------------------
+class Vocabulary:
+    """
+    The strings of one field, each with a small integer code: words[code] is the string, codes[string] is its code.
+    """
+    __slots__ = ('name', 'words', 'codes', 'translation')
+
+    def __init__(self, name, words=()):
+        self.name = name
+        self.words = []
+        self.codes = {}
+        self.translation = None
+
+        for next_word in words:
+            self.code(next_word)
+
+    def code(self, word):
+        """
+        The code of a word, adding it to the vocabulary if it is new.
+        """
+        try:
+            return self.codes[word]
+
+        except KeyError:
+            self.codes[word] = len(self.words)
+            self.words.append(word)
+            return self.codes[word]
+
+    def __len__(self):
+        return len(self.words)
+
+    def __reduce__(self):
+        return (_restore_vocabulary, (self.name, tuple(self.words)))
+
+    def __repr__(self):
+        return f'<Vocabulary {self.name}: {len(self.words)} words>'
+#
+#-----------------------------------------------------------------------------------------------
+class CodedSequence(abc.Sequence):
+    """
+    A read-only, list-like sequence of strings stored as codes in a Vocabulary.
+    """
+    __slots__ = ('vocab', 'codes')
+
+    def __init__(self, vocab, codes):
+        self.vocab = vocab
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.vocab.words[c] for c in self.codes[i]]
+
+        return self.vocab.words[self.codes[i]]
+
+    def __iter__(self):
+        words = self.vocab.words
+        return (words[c] for c in self.codes)
+
+    def __eq__(self, other):
+        if isinstance(other, CodedSequence) and other.vocab is self.vocab:
+            return other.codes == self.codes
+
+        if isinstance(other, (CodedSequence, list, tuple)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (_restore_sequence, (self.vocab, self.codes))
+
+    def __repr__(self):
+        return repr(list(self))
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def vocabulary(name):
+    """
+    This process's Vocabulary for a field, created the first time it is asked for.
+    """
+    if name not in VOCABULARIES:
+        VOCABULARIES[name] = Vocabulary(name)
+
+    return VOCABULARIES[name]
+#
+#-----------------------------------------------------------------------------------------------
+def _code_array(codes):
+    """
+    Pack a list of codes into the smallest array that holds them.
+    """
+    if codes and max(codes) > _SMALL_CODES:
+        return array('I', codes)
+
+    return array('H', codes)
+#
+#-----------------------------------------------------------------------------------------------
+def coded(name, words):
+    """
+    Store a list of strings as a CodedSequence in the vocabulary of the field called name.
+    """
+    the_vocab = vocabulary(name)
+
+    return CodedSequence(the_vocab, _code_array([the_vocab.code(next_word) for next_word in words]))
+#
+#-----------------------------------------------------------------------------------------------
+def _restore_vocabulary(name, words):
+    """
+    Unpickle a Vocabulary.  If it agrees with this process's vocabulary for the field (one is the start of the other), the two are
+    merged and this process's is used.  Otherwise a separate Vocabulary is returned and its sequences are re-coded as they load.
+    """
+    the_vocab = vocabulary(name)
+    shared = min(len(words), len(the_vocab.words))
+
+    if list(words[:shared]) == the_vocab.words[:shared]:
+        for next_word in words[shared:]:
+            the_vocab.code(next_word)
+        return the_vocab
+
+    return Vocabulary(name, words)
+#
+#-----------------------------------------------------------------------------------------------
+def _restore_sequence(the_vocab, codes):
+    """
+    Unpickle a CodedSequence, re-coding it into this process's vocabulary if it was stored with a different one.
+    """
+    process_vocab = vocabulary(the_vocab.name)
+
+    if the_vocab is not process_vocab:
+        if the_vocab.translation is None:
+            the_vocab.translation = [process_vocab.code(next_word) for next_word in the_vocab.words]
+        codes = _code_array([the_vocab.translation[c] for c in codes])
+
+    return CodedSequence(process_vocab, codes)
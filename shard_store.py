@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Song Search Shard Store
+written by: Song Search contributors
+created on: 18 October 2026
+
+The Score Dictionary stored one pickle per score instead of one pickle for everything.  Saving a changed score rewrites only its own
+shard, and a tool which needs a few titles only reads those.
+
+    SHARD_FILEPATH/
+        manifest.json       {"Titles": {title: shard file name}}, in Score Dictionary order
+        <hash>.pkl          one Score Dictionary entry, {title: entry}
+
+Every shard and the manifest is written to a temporary file, synced, and moved into place, and the manifest is always written last,
+so a crash leaves the store as it was before the save or after it.
+
+pickle_shards() and unpickle_shards() are the shard versions of pickle_it() and unpickle_it().  If there is no manifest yet,
+unpickle_shards() reads the old single score_dictionary.pkl instead, and the next save moves it into shards.
+
+A duplicate's shard (see duplicates.py) leaves out the sections it shares, and they are linked back in from the original's entry when
+it is read, reading the original's shard too if it was not asked for.
+
+Standard library only.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+
+from score_paths    import SHARD_FILEPATH
+from score_paths    import SCORE_DATAPATH
+from score_log      import write_score_log
+from duplicates     import DUPLICATE_SECTIONS
+from duplicates     import without_shared
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+MANIFEST_NAME       = 'manifest.json'
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def shard_name(title):
+    """
+    The file name of a title's shard.  Titles can hold any character, so the name is a hash of the title.
+    """
+    return hashlib.sha1(title.encode('utf-8')).hexdigest()[:20] + '.pkl'
+#
+#-----------------------------------------------------------------------------------------------
+def _replace(target_path, write, mode='wb'):
+    """
+    Write a file through a temporary file in the same directory: write(file) fills it, then it is synced and moved into place.
+    """
+    target_dir = os.path.dirname(str(target_path))
+    os.makedirs(target_dir, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=target_dir, suffix='.tmp')
+
+    try:
+        with os.fdopen(handle, mode) as the_file:
+            write(the_file)
+            the_file.flush()
+            os.fsync(the_file.fileno())
+        os.replace(temp_path, target_path)
+
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+#
+#-----------------------------------------------------------------------------------------------
+def read_manifest(shard_path=None):
+    """
+    The manifest of the store: {title: shard file name}.  None if the store has not been written yet.
+    """
+    try:
+        with open(os.path.join(shard_path or SHARD_FILEPATH, MANIFEST_NAME), encoding='utf-8') as the_manifest:
+            return json.load(the_manifest)['Titles']
+
+    except FileNotFoundError:
+        return None
+#
+#-----------------------------------------------------------------------------------------------
+def write_manifest(titles, shard_path=None):
+    """
+    Replace the manifest.
+    """
+    the_manifest = {'Titles': titles}
+    _replace(os.path.join(shard_path or SHARD_FILEPATH, MANIFEST_NAME),
+             lambda the_file: json.dump(the_manifest, the_file, ensure_ascii=False, indent=0), mode='w')
+#
+#-----------------------------------------------------------------------------------------------
+def shard_titles(shard_path=None):
+    """
+    Every title in the store, in Score Dictionary order, without reading any shard.
+    """
+    return list(read_manifest(shard_path) or ())
+#
+#-----------------------------------------------------------------------------------------------
+def store_shard(title, entry, shard_path=None):
+    """
+    Write one score's shard.  The manifest is not touched; see pickle_shards().
+    """
+    shard_file = os.path.join(shard_path or SHARD_FILEPATH, shard_name(title))
+    _replace(shard_file, lambda the_file: pickle.dump({title: entry}, the_file, protocol=pickle.HIGHEST_PROTOCOL))
+
+    return shard_name(title)
+#
+#-----------------------------------------------------------------------------------------------
+def load_shard(title, shard_file, shard_path=None):
+    """
+    Read one score's entry from its shard.
+    """
+    with open(os.path.join(shard_path or SHARD_FILEPATH, shard_file), 'rb') as the_store:
+        return pickle.load(the_store)[title]
+#
+#-----------------------------------------------------------------------------------------------
+def pickle_shards(a_structure, shard_path=None, text_path=None, titles=None):
+    """
+    Save a Score Dictionary to the store.  titles=None writes every shard, otherwise only those of the given titles.  Shards of titles
+    which are no longer in the dictionary are removed.  Like pickle_it(), the text log is written afterwards unless text_path is None.
+    """
+    shard_path = shard_path or SHARD_FILEPATH
+    old_titles = read_manifest(shard_path) or {}
+
+    # A title which has no shard yet is written whatever titles says.
+    changed = set(a_structure) if titles is None else {next_title for next_title in titles if next_title in a_structure}
+    changed |= set(a_structure) - set(old_titles)
+
+    for next_title in a_structure:
+        if next_title in changed:
+            store_shard(next_title, without_shared(a_structure[next_title]), shard_path)
+
+    write_manifest({next_title: shard_name(next_title) for next_title in a_structure}, shard_path)
+
+    # Only remove the old shards once the manifest no longer points at them.
+    for next_title in set(old_titles) - set(a_structure):
+        try:
+            os.remove(os.path.join(shard_path, old_titles[next_title]))
+        except OSError:
+            pass
+
+    write_score_log(a_structure, text_path, titles=None if titles is None else changed)
+#
+#-----------------------------------------------------------------------------------------------
+def unpickle_shards(shard_path=None, titles=None, be_verbose=False):
+    """
+    Read a Score Dictionary from the store: every title, or only the given ones (titles not in the store are left out).
+    Without a manifest the old single pickle (SCORE_DATAPATH) is read instead.
+    """
+    the_manifest = read_manifest(shard_path)
+
+    try:
+        if the_manifest is None:
+            with open(SCORE_DATAPATH, 'rb') as the_store:
+                score_dictionary = pickle.load(the_store)
+            if titles is not None:
+                score_dictionary = {next_title: score_dictionary[next_title] for next_title in titles if next_title in score_dictionary}
+            return score_dictionary
+
+        wanted = the_manifest if titles is None else [next_title for next_title in titles if next_title in the_manifest]
+        score_dictionary = {next_title: load_shard(next_title, the_manifest[next_title], shard_path) for next_title in wanted}
+        originals = {}
+
+        for next_title, entry in score_dictionary.items():
+            original = entry['File Information'].get('Duplicate Of')
+            if original not in the_manifest:
+                continue
+            if original not in score_dictionary and original not in originals:
+                originals[original] = load_shard(original, the_manifest[original], shard_path)
+            source = score_dictionary.get(original) or originals[original]
+            entry.update({next_section: source[next_section] for next_section in DUPLICATE_SECTIONS if next_section in source})
+
+        return score_dictionary
+
+    # If retreiving fails, attempt to let the user know what happened.
+    except Exception as why:
+        if be_verbose:
+            print(f'unpickle_shards  trying to retrieve "{shard_path or SHARD_FILEPATH}"')
+            print(f'  - Exception: {why}')
+        raise
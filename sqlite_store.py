@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Song Search SQLite Store
+written by: Song Search contributors
+created on: 18 October 2026
+
+The Score Dictionary as a normalized SQLite database, so questions about the corpus are indexed SQL instead of Python loops.
+
+    scores          one row per title: Parts, Length, Lyrics, Meter, Key Signature, Anacrusis, and counts (Slurs, Ties, Value Types)
+    file_info       Path, Created On, Modified On, and the Fingerprint of each score
+    family          Family variants: (score, variant name, path)
+    attributes      multi-valued fields: Time Signature, Clef, Repeats
+    parts           per-part Range: lowest note, highest note, interval
+    sequences       per-part 'All' sequences (Letter Names, Solfege, Intervals, Contour, Values, Chords) as JSON lists
+    type_counts     every 'Types' histogram: (score, field, value, count)
+    about           About data, (score, field, value)
+
+Child rows are deleted with their score (ON DELETE CASCADE).  load_scores() writes everything in one transaction with executemany:
+titles already in the database are upserted (their score row updated, their child rows replaced), and deleted titles removed.
+
+    connection = connect()
+    load_scores(connection, score_dictionary)                               # the whole corpus
+    load_scores(connection, score_dictionary, titles=changed, deleted=gone) # after an incremental update
+    titles_with_value_types(connection, 2)                                  # rhythmatician_candidates in SQL
+
+Standard library only.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import json
+import sqlite3
+
+from numbers        import Real
+
+from score_paths    import SQLITE_DATAPATH
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id                  INTEGER PRIMARY KEY,
+    title               TEXT NOT NULL UNIQUE,
+    parts               INTEGER,
+    length              INTEGER,
+    lyrics              TEXT,
+    meter               TEXT,
+    key_signature       TEXT,
+    anacrusis           REAL,
+    slurs               INTEGER,
+    ties                INTEGER,
+    value_type_count    INTEGER
+);
+CREATE TABLE IF NOT EXISTS file_info (
+    score_id            INTEGER PRIMARY KEY REFERENCES scores(id) ON DELETE CASCADE,
+    path                TEXT,
+    created_on          TEXT,
+    modified_on         TEXT,
+    size                INTEGER,
+    mtime_ns            INTEGER,
+    inode               INTEGER,
+    hash                TEXT
+);
+CREATE TABLE IF NOT EXISTS family (
+    score_id            INTEGER NOT NULL REFERENCES scores(id) ON DELETE CASCADE,
+    variant             TEXT NOT NULL,
+    path                TEXT,
+    PRIMARY KEY (score_id, variant)
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    score_id            INTEGER NOT NULL REFERENCES scores(id) ON DELETE CASCADE,
+    field               TEXT NOT NULL,
+    value               TEXT NOT NULL,
+    PRIMARY KEY (score_id, field, value)
+);
+CREATE TABLE IF NOT EXISTS parts (
+    score_id            INTEGER NOT NULL REFERENCES scores(id) ON DELETE CASCADE,
+    part                TEXT NOT NULL,
+    lowest_note         TEXT,
+    highest_note        TEXT,
+    range_interval      TEXT,
+    PRIMARY KEY (score_id, part)
+);
+CREATE TABLE IF NOT EXISTS sequences (
+    score_id            INTEGER NOT NULL REFERENCES scores(id) ON DELETE CASCADE,
+    part                TEXT NOT NULL,
+    field               TEXT NOT NULL,
+    symbols             TEXT,
+    PRIMARY KEY (score_id, part, field)
+);
+CREATE TABLE IF NOT EXISTS type_counts (
+    score_id            INTEGER NOT NULL REFERENCES scores(id) ON DELETE CASCADE,
+    field               TEXT NOT NULL,
+    value               TEXT NOT NULL,
+    count               INTEGER NOT NULL,
+    PRIMARY KEY (score_id, field, value)
+);
+CREATE TABLE IF NOT EXISTS about (
+    score_id            INTEGER NOT NULL REFERENCES scores(id) ON DELETE CASCADE,
+    field               TEXT NOT NULL,
+    value               TEXT,
+    PRIMARY KEY (score_id, field)
+);
+CREATE INDEX IF NOT EXISTS scores_meter             ON scores (meter);
+CREATE INDEX IF NOT EXISTS scores_key_signature     ON scores (key_signature);
+CREATE INDEX IF NOT EXISTS scores_parts             ON scores (parts);
+CREATE INDEX IF NOT EXISTS scores_length            ON scores (length);
+CREATE INDEX IF NOT EXISTS scores_value_type_count  ON scores (value_type_count);
+CREATE INDEX IF NOT EXISTS attributes_value         ON attributes (field, value);
+CREATE INDEX IF NOT EXISTS type_counts_value        ON type_counts (field, value, count);
+CREATE INDEX IF NOT EXISTS about_value              ON about (field, value);
+"""
+
+# Histogram and sequence fields: field: (section, sub-field)
+SEQUENCE_FIELDS     = {'Letter Names':    ('Pitch', 'Letter Names'),
+                       'Solfege':         ('Pitch', 'Solfege'),
+                       'Intervals':       ('Pitch', 'Intervals'),
+                       'Contour':         ('Pitch', 'Contour'),
+                       'Values':          ('Rhythm', 'Values'),
+                       'Chords':          ('Other', 'Chords')}
+
+# Multi-valued fields: field: (section, sub-field)
+ATTRIBUTE_FIELDS    = {'Time Signature':  ('Rhythm', 'Time Signature'),
+                       'Clef':            ('Pitch', 'Clef'),
+                       'Repeats':         ('Other', 'Repeats')}
+
+# The child tables, in the order they are filled.
+CHILD_TABLES        = ('file_info', 'family', 'attributes', 'parts', 'sequences', 'type_counts', 'about')
+
+# Rows are handed to executemany() this many at a time.
+BATCH_SIZE          = 5000
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def connect(db_path=None):
+    """
+    Open (and if need be create) the database.
+    """
+    connection = sqlite3.connect(str(db_path or SQLITE_DATAPATH))
+    connection.execute('PRAGMA foreign_keys = ON')
+    connection.execute('PRAGMA journal_mode = WAL')
+    connection.execute('PRAGMA synchronous = NORMAL')
+    connection.executescript(SCHEMA)
+
+    return connection
+#
+#-----------------------------------------------------------------------------------------------
+def _field(entry, section, sub_field):
+    """
+    A field of one Score Dictionary entry, or None if it is missing.
+    """
+    return (entry.get(section) or {}).get(sub_field)
+#
+#-----------------------------------------------------------------------------------------------
+def _number(value):
+    """
+    value if it is a number (Anacrusis can be 'not available'), otherwise None.
+    """
+    return float(value) if isinstance(value, Real) and not isinstance(value, bool) else None
+#
+#-----------------------------------------------------------------------------------------------
+def score_row(title, entry):
+    """
+    The scores row of one entry.
+    """
+    value_types = (_field(entry, 'Rhythm', 'Values') or {}).get('Types') or {}
+
+    return (title,
+            _field(entry, 'Other', 'Parts'),
+            _field(entry, 'Other', 'Length'),
+            _field(entry, 'Other', 'Lyrics'),
+            _field(entry, 'Rhythm', 'Meter'),
+            _field(entry, 'Pitch', 'Key Signature'),
+            _number(_field(entry, 'Rhythm', 'Anacrusis')),
+            (_field(entry, 'Other', 'Slurs') or {}).get('Number') or 0,
+            (_field(entry, 'Rhythm', 'Ties') or {}).get('Number') or 0,
+            len(value_types))
+#
+#-----------------------------------------------------------------------------------------------
+def child_rows(score_id, entry):
+    """
+    The rows of one entry for every child table: {table: [rows]}.
+    """
+    rows = {next_table: [] for next_table in CHILD_TABLES}
+
+    file_information = entry.get('File Information') or {}
+    fingerprint = file_information.get('Fingerprint') or {}
+    rows['file_info'].append((score_id, str(file_information.get('Path')), file_information.get('Created On'),
+                              file_information.get('Modified On'), fingerprint.get('Size'), fingerprint.get('Mtime NS'),
+                              fingerprint.get('Inode'), fingerprint.get('Hash')))
+
+    for next_variant, next_path in (file_information.get('Family') or {}).items():
+        rows['family'].append((score_id, next_variant, str(next_path)))
+
+    for next_field, (section, sub_field) in ATTRIBUTE_FIELDS.items():
+        the_value = _field(entry, section, sub_field)
+        values = the_value if isinstance(the_value, (list, tuple)) else [the_value]
+        for next_value in dict.fromkeys(values):
+            if next_value is not None:
+                rows['attributes'].append((score_id, next_field, str(next_value)))
+
+    for next_part, the_range in (_field(entry, 'Pitch', 'Range') or {}).items():
+        the_range = the_range or {}
+        rows['parts'].append((score_id, next_part, the_range.get('Lowest Note'), the_range.get('Highest Note'),
+                              (the_range.get('Interval') or '').strip() or None))
+
+    for next_field, (section, sub_field) in SEQUENCE_FIELDS.items():
+        the_field = _field(entry, section, sub_field) or {}
+
+        for next_part, sequence in (the_field.get('All') or {}).items():
+            rows['sequences'].append((score_id, next_part, next_field, None if sequence is None else json.dumps(list(sequence))))
+
+        for next_value, next_count in (the_field.get('Types') or {}).items():
+            rows['type_counts'].append((score_id, next_field, str(next_value), next_count))
+
+    for next_field, next_value in (entry.get('About') or {}).items():
+        rows['about'].append((score_id, next_field, None if next_value is None else str(next_value)))
+
+    return rows
+#
+#-----------------------------------------------------------------------------------------------
+def _executemany(connection, statement, rows):
+    """
+    executemany() in batches of BATCH_SIZE rows.
+    """
+    for start in range(0, len(rows), BATCH_SIZE):
+        connection.executemany(statement, rows[start:start + BATCH_SIZE])
+#
+#-----------------------------------------------------------------------------------------------
+def load_scores(connection, score_dictionary, titles=None, deleted=()):
+    """
+    Load the Score Dictionary into the database in one transaction.  titles=None loads every title, otherwise only the given ones.
+    Titles already in the database are upserted; deleted titles are removed.
+    """
+    titles = list(score_dictionary) if titles is None else [next_title for next_title in titles if next_title in score_dictionary]
+
+    with connection:
+        _executemany(connection, 'DELETE FROM scores WHERE title = ?', [(next_title,) for next_title in deleted])
+
+        _executemany(connection,
+                     """INSERT INTO scores (title, parts, length, lyrics, meter, key_signature, anacrusis, slurs, ties, value_type_count)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (title) DO UPDATE SET
+                            parts = excluded.parts, length = excluded.length, lyrics = excluded.lyrics, meter = excluded.meter,
+                            key_signature = excluded.key_signature, anacrusis = excluded.anacrusis, slurs = excluded.slurs,
+                            ties = excluded.ties, value_type_count = excluded.value_type_count""",
+                     [score_row(next_title, score_dictionary[next_title]) for next_title in titles])
+
+        wanted = set(titles)
+        score_ids = {next_title: score_id for score_id, next_title in connection.execute('SELECT id, title FROM scores')
+                     if next_title in wanted}
+
+        # An upserted score keeps its id, so its old child rows are replaced rather than cascaded away.
+        changed_ids = [(score_ids[next_title],) for next_title in titles]
+        for next_table in CHILD_TABLES:
+            _executemany(connection, f'DELETE FROM {next_table} WHERE score_id = ?', changed_ids)
+
+        rows = {next_table: [] for next_table in CHILD_TABLES}
+        for next_title in titles:
+            for next_table, next_rows in child_rows(score_ids[next_title], score_dictionary[next_title]).items():
+                rows[next_table].extend(next_rows)
+
+        for next_table, next_rows in rows.items():
+            if next_rows:
+                holes = ', '.join('?' * len(next_rows[0]))
+                _executemany(connection, f'INSERT INTO {next_table} VALUES ({holes})', next_rows)
+
+    return len(titles)
+#
+#-----------------------------------------------------------------------------------------------
+def refresh_sqlite(score_dictionary, titles=None, deleted=(), db_path=None):
+    """
+    Bring the database up to date with the Score Dictionary: every title (titles=None), or only the changed and deleted ones.
+    """
+    connection = connect(db_path)
+    try:
+        if titles is None:
+            # A full load also drops titles which are no longer in the dictionary.
+            deleted = [next_title for (next_title,) in connection.execute('SELECT title FROM scores') if next_title not in score_dictionary]
+        return load_scores(connection, score_dictionary, titles=titles, deleted=deleted)
+    finally:
+        connection.close()
+#
+#-----------------------------------------------------------------------------------------------
+def titles_with_value_types(connection, num_items):
+    """
+    The scores which use exactly num_items kinds of rhythm value, with their counts: [(title, {value: count})].  See rhythmatician_candidates.
+    """
+    found = {}
+    for next_title, next_value, next_count in connection.execute(
+            """SELECT scores.title, type_counts.value, type_counts.count
+               FROM scores JOIN type_counts ON type_counts.score_id = scores.id AND type_counts.field = 'Values'
+               WHERE scores.value_type_count = ?
+               ORDER BY scores.id""", (num_items,)):
+        found.setdefault(next_title, {})[next_value] = next_count
+
+    return list(found.items())
+#
+#-----------------------------------------------------------------------------------------------
+def titles_with(connection, field, value):
+    """
+    The titles with an attribute (Time Signature, Clef, Repeats) or a 'Types' value (e.g. 'Intervals', 'M2').
+    """
+    return [next_title for (next_title,) in connection.execute(
+            """SELECT title FROM scores WHERE id IN (SELECT score_id FROM attributes WHERE field = ? AND value = ?
+                                                     UNION SELECT score_id FROM type_counts WHERE field = ? AND value = ?)
+               ORDER BY id""", (field, str(value), field, str(value)))]
+#
+#-----------------------------------------------------------------------------------------------
+def score_sequence(connection, title, field, part='Part 1'):
+    """
+    One part's 'All' sequence of a field, as a list.
+    """
+    found = connection.execute("""SELECT symbols FROM sequences JOIN scores ON scores.id = sequences.score_id
+                                  WHERE scores.title = ? AND sequences.part = ? AND sequences.field = ?""", (title, part, field)).fetchone()
+
+    return None if found is None or found[0] is None else json.loads(found[0])
+
+#                                           MAIN
+#-----------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    from pprint         import pprint
+
+    connection = connect()
+
+    print('Scores with 2 kinds of rhythm value:')
+    pprint(titles_with_value_types(connection, 2))
+
+    print('Scores in 6/8:')
+    pprint(titles_with(connection, 'Time Signature', '6/8'))
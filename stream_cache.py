@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Song Search Stream Cache
+written by: Song Search contributors
+created on: 18 October 2026
+
+The Score Dictionary no longer stores parsed Music21 streams.  File Information -> Stream holds a StreamHandle instead, which
+pickles as nothing more than the score's path.  The first time an extractor asks for the stream it is parsed and kept in a
+bounded, in-process LRU cache.  Each stream is kept with the size and modification time its file had when it was parsed, so an edited
+file is parsed again rather than served from memory:
+
+    STREAM_CACHE_SIZE:      most streams kept at once
+    STREAM_CACHE_BYTES:     rough memory limit, estimated from the file sizes (see STREAM_SIZE_FACTOR)
+
+Scores which are not in memory come from the disk cache in parse_cache.py, and are only parsed from XML if they are not there either.
+
+Music21 is only imported when a score is actually parsed, so reading the Score Dictionary does not need it.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+
+from collections    import OrderedDict
+
+from parse_cache    import parse_score
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+STREAM_CACHE_SIZE       = 32
+STREAM_CACHE_BYTES      = 512 * 1024 * 1024
+
+# A parsed stream takes roughly this many times the size of its MusicXML file in memory.
+STREAM_SIZE_FACTOR      = 20
+
+# path: (stream, estimated bytes, (mtime_ns, size) of the file parsed), least recently used first.
+_STREAM_CACHE           = OrderedDict()
+_CACHE_BYTES            = {'Total': 0}
+
+#                                            CLASSES
+#-----------------------------------------------------------------------------------------------
+class StreamHandle:
+    """
+    Stand-in for a score's Music21 stream.  The stream is parsed (through the LRU cache) on first access.
+    """
+    __slots__ = ('path',)
+
+    def __init__(self, path):
+        self.path = str(path)
+
+    @property
+    def stream(self):
+        return cached_stream(self.path)
+
+    def __getattr__(self, name):
+        # Anything else is looked up on the stream itself, so handle.parts etc. work for casual callers.
+        return getattr(self.stream, name)
+
+    def __reduce__(self):
+        return (StreamHandle, (self.path,))
+
+    def __eq__(self, other):
+        return isinstance(other, StreamHandle) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def __repr__(self):
+        return f'<StreamHandle {self.path}>'
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def configure_stream_cache(max_scores=None, max_bytes=None):
+    """
+    Change the size and memory limit of the cache.  Streams over the new limits are dropped straight away.
+    """
+    global STREAM_CACHE_SIZE, STREAM_CACHE_BYTES
+
+    if max_scores is not None:
+        STREAM_CACHE_SIZE = max_scores
+    if max_bytes is not None:
+        STREAM_CACHE_BYTES = max_bytes
+
+    _evict()
+#
+#-----------------------------------------------------------------------------------------------
+def clear_stream_cache():
+    """
+    Drop every cached stream.
+    """
+    _STREAM_CACHE.clear()
+    _CACHE_BYTES['Total'] = 0
+#
+#-----------------------------------------------------------------------------------------------
+def forget_streams(paths):
+    """
+    Drop the cached streams of some score files, e.g. those which have been edited or deleted.
+    """
+    for next_path in map(str, paths):
+        if next_path in _STREAM_CACHE:
+            _CACHE_BYTES['Total'] -= _STREAM_CACHE.pop(next_path)[1]
+#
+#-----------------------------------------------------------------------------------------------
+def _file_key(score_path):
+    """
+    (mtime_ns, size) of a file, or None if it cannot be stat'ed.
+    """
+    try:
+        stat = os.stat(score_path)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+#
+#-----------------------------------------------------------------------------------------------
+def _evict():
+    """
+    Drop the least recently used streams until the cache is within its limits.  The newest stream is always kept.
+    """
+    while len(_STREAM_CACHE) > 1 and (len(_STREAM_CACHE) > STREAM_CACHE_SIZE or _CACHE_BYTES['Total'] > STREAM_CACHE_BYTES):
+        old_path, (old_stream, old_bytes, old_key) = _STREAM_CACHE.popitem(last=False)
+        _CACHE_BYTES['Total'] -= old_bytes
+
+    if STREAM_CACHE_SIZE < 1:
+        clear_stream_cache()
+#
+#-----------------------------------------------------------------------------------------------
+def cached_stream(score_path):
+    """
+    Return the Music21 stream of a score file, parsing it only if it is not already in the cache, or the file has changed since.
+    """
+    score_path = str(score_path)
+    the_key = _file_key(score_path)
+
+    if score_path in _STREAM_CACHE:
+        if _STREAM_CACHE[score_path][2] == the_key:
+            _STREAM_CACHE.move_to_end(score_path)
+            return _STREAM_CACHE[score_path][0]
+        forget_streams([score_path])
+
+    parsed = parse_score(score_path)
+    estimate = the_key[1] * STREAM_SIZE_FACTOR if the_key else 0
+
+    _STREAM_CACHE[score_path] = (parsed, estimate, the_key)
+    _CACHE_BYTES['Total'] += estimate
+    _evict()
+
+    return parsed
+#
+#-----------------------------------------------------------------------------------------------
+def score_stream(a_dictionary, score):
+    """
+    The Music21 stream of a score in the Score Dictionary.  File Information -> Stream may be a StreamHandle, a stream from an
+    older pickle, or missing, in which case it is parsed from File Information -> Path.
+    """
+    parsed = a_dictionary[score]['File Information'].get('Stream')
+
+    if parsed is None:
+        return cached_stream(a_dictionary[score]['File Information']['Path'])
+
+    if isinstance(parsed, StreamHandle):
+        return parsed.stream
+
+    return parsed
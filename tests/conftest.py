@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Song Search Tests
+written by: Song Search contributors
+created on: 18 October 2026
+
+Shared set-up for the tests.  score_paths.py (and Music21's settings) point into the home directory when they are imported, so a
+scratch home replaces HOME before any Song Search module is imported, and the real Score Library is never touched.  Processes the
+tests start inherit it.
+
+    python -m pytest tests
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+
+from pathlib    import Path
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+ROOT_PATH           = Path(__file__).resolve().parent.parent
+
+SCRATCH_HOME        = tempfile.mkdtemp(prefix='song_search_tests_')
+
+os.environ['HOME'] = SCRATCH_HOME
+atexit.register(shutil.rmtree, SCRATCH_HOME, ignore_errors=True)
+
+sys.path.insert(0, str(ROOT_PATH))
+sys.path.insert(0, str(ROOT_PATH.joinpath('benchmarks')))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Song Search Corpus Scanner Tests
+written by: Song Search contributors
+created on: 18 October 2026
+
+find_file() answers from the path index, and only scans the corpus again when the index is out of date: a path in it has gone, or
+the corpus changed after it was saved.
+
+    python -m pytest tests/test_corpus_scanner.py
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+
+import pytest
+
+import corpus_scanner
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+SCORE_TEXT          = '<score-partwise/>'
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    """
+    A small corpus in tmp_path, with its own path index.  Returns the corpus directory and the list of scans made.
+    """
+    corpus_path = tmp_path.joinpath('corpus')
+    for next_path in ('Reels/one.musicxml', 'Jigs/two.musicxml'):
+        corpus_path.joinpath(next_path).parent.mkdir(parents=True, exist_ok=True)
+        corpus_path.joinpath(next_path).write_text(SCORE_TEXT, encoding='utf-8')
+
+    monkeypatch.setattr(corpus_scanner, 'CORPUS_FILEPATH', corpus_path)
+    monkeypatch.setattr(corpus_scanner, 'PATH_INDEXPATH', str(tmp_path.joinpath('data', 'path_index.json')))
+
+    scans, scan_corpus = [], corpus_scanner.scan_corpus
+    def counted_scan(*args, **kwargs):
+        scans.append(args)
+        return scan_corpus(*args, **kwargs)
+    monkeypatch.setattr(corpus_scanner, 'scan_corpus', counted_scan)
+
+    corpus_scanner.scan_corpus(str(corpus_path))
+    scans.clear()
+
+    return corpus_path, scans
+#
+#-----------------------------------------------------------------------------------------------
+def age_index():
+    """
+    Make the saved path index a minute older, so the changes which follow are newer than it.
+    """
+    index_time = os.stat(corpus_scanner.PATH_INDEXPATH).st_mtime - 60
+    os.utime(corpus_scanner.PATH_INDEXPATH, (index_time, index_time))
+#
+#-----------------------------------------------------------------------------------------------
+def test_indexed_file_is_found_without_a_scan(corpus):
+    corpus_path, scans = corpus
+
+    assert corpus_scanner.find_file('one.musicxml') == [str(corpus_path.joinpath('Reels', 'one.musicxml'))]
+    assert corpus_scanner.find_file('two.musicxml', corpus_path.joinpath('Reels')) == []
+    assert scans == []
+#
+#-----------------------------------------------------------------------------------------------
+def test_clean_miss_does_not_scan(corpus):
+    corpus_path, scans = corpus
+
+    assert corpus_scanner.find_file('missing.musicxml') == []
+    assert corpus_scanner.find_file('missing.musicxml', corpus_path.joinpath('Jigs')) == []
+    assert scans == []
+#
+#-----------------------------------------------------------------------------------------------
+def test_file_added_after_the_index_is_found(corpus):
+    corpus_path, scans = corpus
+
+    age_index()
+    corpus_path.joinpath('three.musicxml').write_text(SCORE_TEXT, encoding='utf-8')
+
+    assert corpus_scanner.find_file('three.musicxml') == [str(corpus_path.joinpath('three.musicxml'))]
+    assert len(scans) == 1
+
+    # The scan saved a new index, so the next miss is clean again.
+    assert corpus_scanner.find_file('missing.musicxml') == []
+    assert len(scans) == 1
+#
+#-----------------------------------------------------------------------------------------------
+def test_file_gone_from_the_index_is_rescanned(corpus):
+    corpus_path, scans = corpus
+
+    corpus_path.joinpath('Reels', 'one.musicxml').rename(corpus_path.joinpath('Jigs', 'one.musicxml'))
+
+    assert corpus_scanner.find_file('one.musicxml') == [str(corpus_path.joinpath('Jigs', 'one.musicxml'))]
+    assert len(scans) == 1
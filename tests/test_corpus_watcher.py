@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Song Search Corpus Watcher Tests
+written by: Song Search contributors
+created on: 18 October 2026
+
+The update queue of corpus_watcher.py: batches queued while an update runs are merged, and close() applies every batch queued
+before it (watch_corpus() queues its last batch just before closing).
+
+    python -m pytest tests/test_corpus_watcher.py
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import time
+import threading
+
+from corpus_watcher     import CorpusBatch
+from corpus_watcher     import UpdateQueue
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+WAIT_SECONDS        = 10.0
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def added(*paths):
+    """
+    A batch which adds paths.
+    """
+    return CorpusBatch(set(paths), set(), set(), {})
+#
+#-----------------------------------------------------------------------------------------------
+def slow_queue():
+    """
+    An UpdateQueue whose first update waits until it is released.  Returns the queue, the list of applied batches, and the events
+    for the first update having started and being released.
+    """
+    applied, started, release = [], threading.Event(), threading.Event()
+
+    def update(batch):
+        applied.append(batch)
+        started.set()
+        release.wait(WAIT_SECONDS)
+
+    return UpdateQueue(update), applied, started, release
+#
+#-----------------------------------------------------------------------------------------------
+def test_batches_queued_during_an_update_are_merged():
+    updates, applied, started, release = slow_queue()
+
+    updates.put(added('/corpus/one.musicxml'))
+    assert started.wait(WAIT_SECONDS)
+    updates.put(added('/corpus/two.musicxml'))
+    updates.put(added('/corpus/three.musicxml'))
+    release.set()
+    updates.close()
+
+    assert [batch.added for batch in applied] == [{'/corpus/one.musicxml'}, {'/corpus/two.musicxml', '/corpus/three.musicxml'}]
+#
+#-----------------------------------------------------------------------------------------------
+def test_close_applies_the_batch_queued_before_it():
+    updates, applied, started, release = slow_queue()
+
+    updates.put(added('/corpus/one.musicxml'))
+    assert started.wait(WAIT_SECONDS)
+    updates.put(added('/corpus/two.musicxml'))
+
+    closing = threading.Thread(target=updates.close)
+    closing.start()
+    # Both the batch and close()'s stop are queued before the first update ends, so they are read together.
+    deadline = time.monotonic() + WAIT_SECONDS
+    while updates._queue.qsize() < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    closing.join(WAIT_SECONDS)
+
+    assert not closing.is_alive()
+    assert [batch.added for batch in applied] == [{'/corpus/one.musicxml'}, {'/corpus/two.musicxml'}]
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Song Search Fast Path Tests
+written by: Song Search contributors
+created on: 18 October 2026
+
+The fast path (fast_xml.py) has to give exactly the walk Music21 gives, for every collector it serves, and the same lyrics, ranges,
+intervals, and anacrusis from its raw events.  walk_differences() and field_differences() compare the two on scores from Music21's own
+corpus which the fast path reads, and on synthetic scores with ties, slurs, chord symbols, lyrics, and repeats
+(benchmarks/synthetic_corpus.py).  A score the fast path reads is never parsed.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import os
+import random
+
+import pytest
+
+pytest.importorskip('music21')
+
+from music21            import corpus
+
+import stream_cache
+import other_data, pitch_data, rhythm_data
+
+from score_paths        import CORPUS_FILEPATH
+from metadata_cache     import ensure_corpus
+
+from fast_xml           import walk_differences
+from fast_xml           import field_differences
+from synthetic_corpus   import CorpusSettings
+from synthetic_corpus   import score_xml
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+# Music21 corpus scores the fast path reads: chorales, a lead sheet with chord symbols, verses of lyrics, and longer scores.
+CORPUS_WORKS        = ['bach/bwv84.5', 'bach/bwv269', 'bach/bwv347', 'bach/bwv153.1', 'leadSheet/fosterBrownHair',
+                       'demos/multiple-verses', 'trecento/Fava_Dicant_nunc_iudei', 'haydn/opus74no1/movement3']
+
+SYNTHETIC_SCORES    = 4
+
+# The extractors of x_load_data.analyze_entry() which do not need the metadata, in its order.
+EXTRACTORS          = [other_data.number_of_parts, other_data.measure_length, other_data.repeats, other_data.lyrics,
+                       other_data.chords_symbols, other_data.slurs, pitch_data.find_clef, pitch_data.melody_range,
+                       pitch_data.letter_names, pitch_data.solfege_names, pitch_data.intervals, rhythm_data.meter,
+                       rhythm_data.value_list, rhythm_data.anacrusis, rhythm_data.ties]
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def synthetic_score(number):
+    """
+    Write a synthetic score with every feature the fast path reads into the Score Library (the extractors parse through its
+    corpus), and return its path.
+    """
+    settings = CorpusSettings(parts=2, measures=16, ties=0.2, slurs=0.2, chords=0.6, lyrics=0.6, repeats=0.2, seed=number)
+    score_path = CORPUS_FILEPATH.joinpath(f'Fast Path {number:04d}.musicxml')
+    os.makedirs(CORPUS_FILEPATH, exist_ok=True)
+    score_path.write_text(score_xml(random.Random(number), score_path.stem, settings), encoding='utf-8')
+    ensure_corpus()
+
+    return score_path
+#
+#-----------------------------------------------------------------------------------------------
+@pytest.fixture
+def library_score(request):
+    """
+    synthetic_score(), removed from the Score Library after the test.
+    """
+    score_path = synthetic_score(getattr(request, 'param', 1))
+    yield score_path
+    score_path.unlink(missing_ok=True)
+#
+#-----------------------------------------------------------------------------------------------
+@pytest.mark.parametrize('work', CORPUS_WORKS)
+def test_fast_walk_matches_music21_on_corpus(work):
+    differences = walk_differences(str(corpus.getWork(work)))
+
+    assert differences is not None, f'the fast path no longer reads {work}'
+    assert differences == []
+    assert field_differences(str(corpus.getWork(work))) == []
+#
+#-----------------------------------------------------------------------------------------------
+@pytest.mark.parametrize('library_score', range(1, SYNTHETIC_SCORES + 1), indirect=True)
+def test_fast_walk_matches_music21_on_synthetic_scores(library_score):
+    assert walk_differences(str(library_score)) == []
+    assert field_differences(str(library_score)) == []
+#
+#-----------------------------------------------------------------------------------------------
+def test_fast_path_scores_are_never_parsed(library_score, monkeypatch):
+    def refuse(score_path):
+        raise AssertionError(f'{score_path} was parsed')
+
+    monkeypatch.setattr(stream_cache, 'parse_score', refuse)
+    one_score = {'Score': {'File Information': {'Path': str(library_score)}, 'Other': {},
+                           'Pitch': {'Key Signature': 'C major'}, 'Rhythm': {'Time Signature': [('4', '4')]}}}
+
+    for next_extractor in EXTRACTORS:
+        next_extractor(one_score, 'Score')
+
+    assert one_score['Score']['Other']['Lyrics']
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Song Search Incremental Update Tests
+written by: Song Search contributors
+created on: 18 October 2026
+
+An incremental update (update_metadata_cache(), and the corpus watcher's apply_batch() which calls it) has to leave the stores exactly
+as a fresh build of the same corpus would.  Each test builds a small synthetic library in this process, so its streams are in the
+in-process cache as they would be in a long-running watcher, edits a score, updates, and then compares the stored analysis with a
+build made from scratch in a new process.
+
+The library holds a byte-for-byte copy of one score.  One of the two shares the other's analysis (see duplicates.py); which one
+depends on the order of the metadata bundle.
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import io
+import os
+import re
+import sys
+import shutil
+import subprocess
+import contextlib
+
+import pytest
+
+pytest.importorskip('music21')
+
+from conftest           import ROOT_PATH
+from synthetic_corpus   import CorpusSettings
+from synthetic_corpus   import generate_corpus
+
+import x_load_data
+import music21_globals
+
+from score_paths        import CORPUS_FILEPATH
+from score_paths        import SCORE_DATAPATH
+from score_paths        import SCORE_LOGPATH
+from score_paths        import CACHE_FILEPATH
+from shard_store        import unpickle_shards
+from stream_cache       import clear_stream_cache
+from metadata_cache     import ensure_corpus
+from corpus_watcher     import CorpusBatch
+from corpus_watcher     import apply_batch
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+SETTINGS            = CorpusSettings(scores=3, parts=2, measures=8, seed=7)
+
+ANALYSIS_SECTIONS   = ('Other', 'Pitch', 'Rhythm')
+
+COPIED_SCORE        = 'Synthetic 0001'
+LONE_SCORE          = 'Synthetic 0002'
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def quietly(function, *args, **kwargs):
+    """
+    Call function with its printing and Music21's warnings thrown away.
+    """
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        return function(*args, **kwargs)
+#
+#-----------------------------------------------------------------------------------------------
+def plain(value):
+    """
+    A stored value as plain lists, dicts, and strings, so two builds can be compared.
+    """
+    if isinstance(value, dict):
+        return {str(k): plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)) or type(value).__name__ == 'CodedSequence':
+        return [plain(v) for v in value]
+    if isinstance(value, (int, float, str)) or value is None:
+        return value
+    return str(value)
+#
+#-----------------------------------------------------------------------------------------------
+def stored_analysis():
+    """
+    {title: the analyzed sections and Duplicate Of} of every score in the shard store.
+    """
+    score_dictionary = unpickle_shards()
+
+    return {next_title: dict({next_section: plain(entry[next_section]) for next_section in ANALYSIS_SECTIONS if next_section in entry},
+                             **{'Duplicate Of': entry['File Information'].get('Duplicate Of')})
+            for next_title, entry in score_dictionary.items()}
+#
+#-----------------------------------------------------------------------------------------------
+def fresh_analysis():
+    """
+    The stored analysis after building the whole library again in a new process, which has nothing cached in memory.
+    """
+    subprocess.run([sys.executable, '-c', 'import x_load_data; x_load_data.score_dictionary(workers=1)'],
+                   cwd=ROOT_PATH, env=os.environ, capture_output=True, check=True)
+
+    return stored_analysis()
+#
+#-----------------------------------------------------------------------------------------------
+def raise_octaves(score_path):
+    """
+    Edit a score: every note an octave higher.  The file keeps its size, so only its modification time tells the edit apart.
+    """
+    text = re.sub(r'<octave>(\d)</octave>', lambda match: f'<octave>{int(match.group(1)) + 1}</octave>', score_path.read_text(encoding='utf-8'))
+    old_stat = score_path.stat()
+    score_path.write_text(text, encoding='utf-8')
+    os.utime(score_path, ns=(old_stat.st_atime_ns, old_stat.st_mtime_ns + 10**9))
+#
+#-----------------------------------------------------------------------------------------------
+@pytest.fixture
+def library():
+    """
+    A freshly built synthetic library, analyzed in this process.  Returns the corpus directory and the titles of the duplicate and
+    of the score whose analysis it shares.
+    """
+    shutil.rmtree(CORPUS_FILEPATH, ignore_errors=True)
+    shutil.rmtree(SCORE_DATAPATH.parent.parent, ignore_errors=True)
+    for next_directory in (SCORE_DATAPATH.parent, SCORE_LOGPATH.parent, CACHE_FILEPATH):
+        os.makedirs(next_directory, exist_ok=True)
+
+    generate_corpus(CORPUS_FILEPATH, SETTINGS)
+    shutil.copyfile(CORPUS_FILEPATH.joinpath(f'{COPIED_SCORE}.musicxml'), CORPUS_FILEPATH.joinpath(f'{COPIED_SCORE} copy.musicxml'))
+
+    clear_stream_cache()
+    quietly(ensure_corpus)
+    quietly(music21_globals.build_metadata_cache)
+    quietly(x_load_data.score_dictionary, workers=1)
+
+    duplicates = {next_title: entry['Duplicate Of'] for next_title, entry in stored_analysis().items() if entry['Duplicate Of']}
+    assert len(duplicates) == 1
+
+    return CORPUS_FILEPATH, *duplicates.popitem()
+#
+#-----------------------------------------------------------------------------------------------
+def test_watched_edit_of_a_score_with_a_duplicate(library):
+    corpus_path, duplicate, original = library
+    score_path = corpus_path.joinpath(f'{original}.musicxml')
+    raise_octaves(score_path)
+
+    added, deleted, modified = quietly(music21_globals.update_metadata_cache, paths=[str(score_path)])
+    updated = stored_analysis()
+
+    # The duplicate keeps the old music, so it no longer shares anything and has its own analysis.
+    assert modified == {original, duplicate}
+    assert updated[duplicate]['Duplicate Of'] is None
+    assert updated == fresh_analysis()
+#
+#-----------------------------------------------------------------------------------------------
+def test_watched_edit_is_not_analyzed_from_a_stale_stream(library):
+    corpus_path, duplicate, original = library
+    before = stored_analysis()
+    score_path = corpus_path.joinpath(f'{LONE_SCORE}.musicxml')
+    raise_octaves(score_path)
+
+    quietly(apply_batch, CorpusBatch(added=set(), modified={str(score_path)}, deleted=set(), renamed={}))
+    updated = stored_analysis()
+
+    assert updated[LONE_SCORE]['Pitch']['Range'] != before[LONE_SCORE]['Pitch']['Range']
+    assert updated == fresh_analysis()
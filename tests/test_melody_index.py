@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Song Search Melody Index Tests
+written by: Song Search contributors
+created on: 18 October 2026
+
+An exact search through the suffix array (melody_index.build_suffix_array()) has to find what the n-gram search finds, for queries
+shorter and longer than SUFFIX_WINDOW.
+
+    python -m pytest tests/test_melody_index.py
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+import random
+
+import pytest
+
+from melody_index       import SUFFIX_WINDOW
+from melody_index       import build_melody_index
+from melody_index       import search_field
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+INTERVALS           = ['m2', 'M2', 'm3', 'M3', 'P4', 'P5', '-m2', '-M2', '-m3', '-P4']
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def score_dictionary(sequences):
+    """
+    A Score Dictionary with one single-part title per interval sequence.
+    """
+    return {f'Song {number:02d}': {'Pitch': {'Intervals': {'All': {'P1': sequence}}}} for number, sequence in enumerate(sequences)}
+#
+#-----------------------------------------------------------------------------------------------
+def shared_prefix_sequences(count=20, seed=11):
+    """
+    count sequences which share their first SUFFIX_WINDOW + 1 intervals and differ after that.
+    """
+    rng = random.Random(seed)
+    prefix = [rng.choice(INTERVALS) for _ in range(SUFFIX_WINDOW + 1)]
+
+    return [prefix + [rng.choice(INTERVALS) for _ in range(8)] for _ in range(count)]
+#
+#-----------------------------------------------------------------------------------------------
+@pytest.mark.parametrize('length', [SUFFIX_WINDOW - 2, SUFFIX_WINDOW, SUFFIX_WINDOW + 2, SUFFIX_WINDOW + 6])
+def test_suffix_search_matches_ngram_search(length):
+    sequences = shared_prefix_sequences()
+    plain = build_melody_index(score_dictionary(sequences))
+    suffixed = build_melody_index(score_dictionary(sequences), suffix_array=True)
+
+    for next_sequence in sequences:
+        for start in (0, 3):
+            query = next_sequence[start:start + length]
+            expected = search_field(plain, 'Intervals', query)
+
+            assert expected
+            assert search_field(suffixed, 'Intervals', query) == expected
+            assert search_field(suffixed, 'Intervals', query, incipit=True) == search_field(plain, 'Intervals', query, incipit=True)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Song Search Mongo Store Tests
+written by: Song Search contributors
+created on: 18 October 2026
+
+load_mongo() against a FileCollection: a full load clears the collection and inserts every score, an incremental load upserts and
+deletes only what changed, a retried batch skips the documents which got in before the failure, and the file is written once per
+load.
+
+    python -m pytest tests/test_mongo_store.py
+"""
+#                                           IMPORTS
+#-----------------------------------------------------------------------------------------------
+from fractions          import Fraction
+
+import pytest
+
+import mongo_store
+
+from mongo_store        import FileCollection
+from mongo_store        import ConnectionFailure
+from mongo_store        import load_mongo
+
+#                                           VARIABLES
+#-----------------------------------------------------------------------------------------------
+
+TITLES              = ['Song 01', 'Song 02', 'Song 03', 'Song 04', 'Song 05']
+
+#                                            CLASSES
+#-----------------------------------------------------------------------------------------------
+class RecordedCollection(FileCollection):
+    """
+    A FileCollection which records the writes made to it, and how often its file is written.
+    """
+    def __init__(self, path):
+        super().__init__(path)
+        self.calls, self.saves = [], 0
+
+    def insert_many(self, documents, ordered=True):
+        self.calls.append(('insert_many', [d['_id'] for d in documents], ordered))
+        super().insert_many(documents, ordered=ordered)
+
+    def bulk_write(self, requests, ordered=True):
+        self.calls.append(('bulk_write', len(requests), ordered))
+        super().bulk_write(requests, ordered=ordered)
+
+    def delete_many(self, filter):
+        self.calls.append(('delete_many', filter))
+        super().delete_many(filter)
+
+    def save(self):
+        self.saves += self._changed
+        super().save()
+#
+#-----------------------------------------------------------------------------------------------
+class DroppedCollection(RecordedCollection):
+    """
+    A RecordedCollection whose first insert_many loses its connection after the first document got in.
+    """
+    def insert_many(self, documents, ordered=True):
+        if not any(call[0] == 'insert_many' for call in self.calls):
+            self.calls.append(('insert_many', [d['_id'] for d in documents], ordered))
+            FileCollection.insert_many(self, documents[:1], ordered=ordered)
+            raise ConnectionFailure('connection closed')
+        super().insert_many(documents, ordered=ordered)
+
+#                                            METHODS
+#-----------------------------------------------------------------------------------------------
+def score_dictionary(titles, key='C major'):
+    """
+    A small Score Dictionary, with the Stream which load_mongo() leaves out.
+    """
+    return {next_title: {'File Information': {'Path': f'/corpus/{next_title}.musicxml', 'Stream': object()},
+                         'Pitch': {'Key Signature': key, 'Intervals': {'All': {'P1': ('M2', 'm3')}}},
+                         'Rhythm': {'Anacrusis': Fraction(1, 2)}}
+            for next_title in titles}
+#
+#-----------------------------------------------------------------------------------------------
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(mongo_store, 'MONGO_RETRY_DELAY', 0)
+#
+#-----------------------------------------------------------------------------------------------
+def test_full_load_clears_then_inserts_unordered(tmp_path):
+    collection = RecordedCollection(tmp_path.joinpath('scores.json'))
+    collection.insert_many([{'_id': 'Old Song'}])
+    collection.save()
+    collection.calls, collection.saves = [], 0
+
+    assert load_mongo(score_dictionary(TITLES), collection, batch_size=2) == len(TITLES)
+
+    assert collection.calls == [('delete_many', {}), ('insert_many', TITLES[0:2], False), ('insert_many', TITLES[2:4], False),
+                                ('insert_many', TITLES[4:], False)]
+    assert collection.saves == 1
+
+    stored = FileCollection(collection.path)
+    assert sorted(d['_id'] for d in stored.find()) == TITLES
+    assert 'Stream' not in stored.find_one({'_id': 'Song 01'})['File Information']
+    assert stored.find_one({'_id': 'Song 01'})['Rhythm']['Anacrusis'] == 0.5
+#
+#-----------------------------------------------------------------------------------------------
+def test_incremental_load_upserts_and_deletes(tmp_path):
+    collection = RecordedCollection(tmp_path.joinpath('scores.json'))
+    load_mongo(score_dictionary(TITLES), collection)
+
+    changed = score_dictionary(['Song 02', 'Song 06'], key='G major')
+    changed.update({next_title: entry for next_title, entry in score_dictionary(TITLES).items() if next_title != 'Song 02'})
+    del changed['Song 05']
+    collection.calls, collection.saves = [], 0
+
+    assert load_mongo(changed, collection, titles=['Song 02', 'Song 06', 'Song 05'], deleted=['Song 05']) == 2
+
+    assert [call[0] for call in collection.calls] == ['bulk_write', 'bulk_write', 'delete_many']
+    assert collection.saves == 1
+
+    stored = FileCollection(collection.path)
+    assert sorted(d['_id'] for d in stored.find()) == ['Song 01', 'Song 02', 'Song 03', 'Song 04', 'Song 06']
+    assert [d['_id'] for d in stored.find() if d['Pitch']['Key Signature'] == 'G major'] == ['Song 02', 'Song 06']
+#
+#-----------------------------------------------------------------------------------------------
+def test_retried_batch_skips_documents_already_in(tmp_path):
+    collection = DroppedCollection(tmp_path.joinpath('scores.json'))
+
+    assert load_mongo(score_dictionary(TITLES), collection) == len(TITLES)
+
+    # The retry inserts the whole batch again: the first document comes back as a duplicate key, which is not an error.
+    assert [call[1] for call in collection.calls if call[0] == 'insert_many'] == [TITLES, TITLES]
+    assert sorted(d['_id'] for d in FileCollection(collection.path).find()) == TITLES
+#
+#-----------------------------------------------------------------------------------------------
+def test_other_write_errors_are_retried_on_their_own():
+    documents = [{'_id': next_title} for next_title in TITLES]
+    failures = [[{'index': 0, 'code': mongo_store.DUPLICATE_KEY}, {'index': 3, 'code': 121}]]
+    writes = []
+
+    def write(batch):
+        writes.append([d['_id'] for d in batch])
+        if failures:
+            raise mongo_store.BulkWriteError({'writeErrors': failures.pop()})
+
+    mongo_store._with_retries(write, documents)
+
+    assert writes == [TITLES, ['Song 04']]
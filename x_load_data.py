@@ -6,6 +6,25 @@ created on: 14 February 2022
 clean: 0
 
 Driving code which builds the Score Dictionary, and loads it into the database.
+
+Family variants (" - " files such as a Student or Recorder version) are analyzed along with their lead sheet, in the same worker pool.
+Their results go in the entry's Family section:
+
+    { Family:
+        { Variant Name:
+            { Path:           file path,
+              Fingerprint:    see fingerprint.py,
+              Musical Hash:   see fingerprint.musical_hash(),
+              Same As:        None, 'Lead Sheet', or the earlier variant with the same music, whose analysis is reused
+              Other:          the same sections as the lead sheet's
+              Pitch:
+              Rhythm:
+            }
+        }
+    }
+
+Scores which duplicate another score's file or music are not analyzed at all: they share the analysis of the first (see
+duplicates.py), and the build writes a duplicate report to DUPLICATE_REPORTPATH.
 """
 #                                           IMPORTS
 #-----------------------------------------------------------------------------------------------
@@ -16,63 +35,251 @@ from other_data         import *
 from pitch_data         import *
 from rhythm_data        import *
 
+from score_index        import refresh_score_index
+from melody_index       import refresh_melody_index
+from sqlite_store       import refresh_sqlite
+from mongo_store        import refresh_mongo
+from fingerprint        import musical_hash
+from duplicates         import score_hashes
+from duplicates         import plan_duplicates
+from duplicates         import link_duplicates
+from duplicates         import write_duplicate_report
+from profiling          import enable_profiling
+from profiling          import profiling_enabled
+from profiling          import profiling_state
+from profiling          import take_stats
+from profiling          import merge_stats
+from profiling          import write_profile_report
+from score_paths        import PROFILE_REPORTPATH
+
+from concurrent.futures import ProcessPoolExecutor
+
+import os
+import sys
+
 
 #                                           VARIABLES
 #-----------------------------------------------------------------------------------------------
 
+# Number of worker processes for score_dictionary().  1 = build in this process, None = one worker per CPU.
+BUILD_WORKERS           = 1
 
+# The Score Dictionary sections the workers send back.  The Music21 streams stay in the worker.
+ANALYSIS_SECTIONS       = ('Other', 'Pitch', 'Rhythm')
 
+# Each worker process reads the metadata bundle once and keeps it here.
+_WORKER_METADATA        = None
 
 
 #                                            METHODS
 #-----------------------------------------------------------------------------------------------
-def score_dictionary():
+def analyze_entry(a_dictionary, the_metadata, next_entry):
     """
-    Take the score dictionary with only file information entries, iterate through it to create a full entry.
+    Run every extractor on one entry of the Score Dictionary.  A score the fast path reads (see fast_xml.py) is never parsed; any other
+    score is parsed through the stream cache when the first extractor needs it.
     
-    Most of processing time is for generating the pretty print statement.
+    The order matters: the pitch extractors read the Key Signature, and meter() reads the Time Signature.
+    """
+    # Other musical elements
+    a_dictionary[next_entry]['Other'] = {}
     
-    TODO:
-        1) Figure out a way of parsing the scores here rather than in the individual functions.
+    number_of_parts(a_dictionary, next_entry)
+    measure_length(a_dictionary, next_entry)
+    repeats(a_dictionary, next_entry)
+    lyrics(a_dictionary, next_entry)
+    chords_symbols(a_dictionary, next_entry)
+    slurs(a_dictionary, next_entry)
+    
+    # Pitch elements
+    a_dictionary[next_entry]['Pitch'] = {}
+    
+    key_signature(a_dictionary, the_metadata, next_entry)
+    find_clef(a_dictionary, next_entry)
+    melody_range(a_dictionary, next_entry)
+    letter_names(a_dictionary, next_entry)
+    solfege_names(a_dictionary, next_entry)
+    intervals(a_dictionary, next_entry)
+    
+    # Rhythm elements
+    a_dictionary[next_entry]['Rhythm'] = {}
+    
+    time_signature(a_dictionary, the_metadata, next_entry)
+    meter(a_dictionary, next_entry)
+    value_list(a_dictionary, next_entry)
+    anacrusis(a_dictionary, next_entry)
+    ties(a_dictionary, next_entry)
+    
+    # About elements
+    # will be added at a later time
+    
+    return a_dictionary
+#
+#-----------------------------------------------------------------------------------------------
+def start_worker(profile_state=None):
     """
-    dictionary = score_file_info()
-    my_metadata = access_metadata()
+    Initializer for each worker process in the parallel build.  Read and index the metadata bundle once per process, not once per score.
+    The worker profiles its extractors if the parent does (profile_state, see profiling.py).
+    """
+    global _WORKER_METADATA
+    _WORKER_METADATA = metadata_index()
     
-    for next_entry in dictionary:
-        
-        # Other musical elements
-        dictionary[next_entry]['Other'] = {}
-        
-        number_of_parts(dictionary, next_entry)
-        measure_length(dictionary, next_entry)
-        repeats(dictionary, next_entry)
-        lyrics(dictionary, next_entry)
-        chords_symbols(dictionary, next_entry)
-        slurs(dictionary, next_entry)
+    if profile_state:
+        enable_profiling(state=profile_state)
+#
+#-----------------------------------------------------------------------------------------------
+def analyze_score(next_entry, file_information, the_metadata=None):
+    """
+    Worker for the parallel build.  Parse one score, run every extractor on it, and return only the plain-data sections.
+    next_entry is a title, or (title, variant name) for a Family variant.
+    
+    Music21 streams are expensive to pickle across processes, so they are parsed here and never leave the worker.
+    """
+    # Build a one-entry Score Dictionary so the extractors run exactly as they do in the serial build.
+    one_score = {next_entry: {'File Information': dict(file_information)}}
+    one_score[next_entry]['File Information']['Stream'] = StreamHandle(file_information['Path'])
+    
+    analyze_entry(one_score, _WORKER_METADATA if the_metadata is None else the_metadata, next_entry)
+    
+    return next_entry, {next_section: one_score[next_entry][next_section] for next_section in ANALYSIS_SECTIONS}
+#
+#-----------------------------------------------------------------------------------------------
+def analyze_score_job(next_entry, file_information):
+    """
+    analyze_score() in a worker process.  The worker's profile of the score (empty unless profiling is on) comes back with its sections.
+    """
+    return analyze_score(next_entry, file_information) + (take_stats(),)
+#
+#-----------------------------------------------------------------------------------------------
+def plan_family(a_dictionary, next_entry):
+    """
+    Start the Family section of an entry from File Information -> Family.  Variants with the same music (see
+    fingerprint.musical_hash()) as the lead sheet or an earlier variant are marked Same As it.  Returns the names of the variants which
+    have to be analyzed.
+    """
+    family = a_dictionary[next_entry]['File Information'].get('Family') or {}
+    a_dictionary[next_entry]['Family'] = {}
+    
+    if not family:
+        return []
+    
+    # Each piece of music is analyzed once: the lead sheet's, then the first variant with any other.
+    lead_information = a_dictionary[next_entry]['File Information']
+    seen = {lead_information.get('Musical Hash') or musical_hash(lead_information['Path']): 'Lead Sheet'}
+    to_analyze = []
+    
+    for next_variant, next_path in family.items():
+        the_hash = musical_hash(next_path)
+        same_as = seen.get(the_hash) if the_hash is not None else None
         
-        # Pitch elements
-        dictionary[next_entry]['Pitch'] = {}
+        a_dictionary[next_entry]['Family'][next_variant] = {'Path': next_path,
+                                                            'Fingerprint': file_fingerprint(next_path, with_hash=True),
+                                                            'Musical Hash': the_hash,
+                                                            'Same As': same_as}
+        if same_as is None:
+            seen.setdefault(the_hash, next_variant)
+            to_analyze.append(next_variant)
+    
+    return to_analyze
+#
+#-----------------------------------------------------------------------------------------------
+def finish_family(a_dictionary, next_entry):
+    """
+    Give every Family variant which is Same As the lead sheet or another variant that score's sections.  The sections are shared, not
+    copied.
+    """
+    the_family = a_dictionary[next_entry].get('Family') or {}
+    
+    for next_variant, the_variant in the_family.items():
+        if the_variant['Same As'] is None:
+            continue
         
-        key_signature(dictionary, my_metadata, next_entry)
-        find_clef(dictionary, next_entry)
-        melody_range(dictionary, next_entry)
-        letter_names(dictionary, next_entry)
-        solfege_names(dictionary, next_entry)
-        intervals(dictionary, next_entry)
+        source = a_dictionary[next_entry] if the_variant['Same As'] == 'Lead Sheet' else the_family[the_variant['Same As']]
+        the_variant.update({next_section: source[next_section] for next_section in ANALYSIS_SECTIONS})
+#
+#-----------------------------------------------------------------------------------------------
+def analyze_scores(dictionary, titles, workers=BUILD_WORKERS):
+    """
+    Parse and analyze the given titles of a Score Dictionary which already holds their File Information, and their Family variants.
+    Every other entry is left alone.
+    
+    workers:    1 runs every extractor in this process.  More than 1 (or None for one per CPU) parses and analyzes the scores and
+                variants in a process pool and merges the returned sections into the Score Dictionary.  The result is identical
+                either way.
+    """
+    titles = list(titles)
+    
+    if workers == 1:
+        my_metadata = metadata_index()
         
-        # Rhythm elements
-        dictionary[next_entry]['Rhythm'] = {}
+        # Duplicates of a score, or of one analyzed earlier, are linked to it below instead of being analyzed.
+        score_hashes(dictionary, titles)
+        originals = plan_duplicates(dictionary, titles)
+        variants = [(next_entry, next_variant) for next_entry in titles for next_variant in plan_family(dictionary, next_entry)]
         
-        time_signature(dictionary, my_metadata, next_entry)
-        meter(dictionary, next_entry)
-        value_list(dictionary, next_entry)
-        anacrusis(dictionary, next_entry)
-        ties(dictionary, next_entry)
+        for next_entry in originals:
+            analyze_entry(dictionary, my_metadata, next_entry)
         
-        # About elements
-        # will be added at a later time
+        for next_entry, next_variant in variants:
+            the_variant = dictionary[next_entry]['Family'][next_variant]
+            the_variant.update(analyze_score((next_entry, next_variant), {'Path': the_variant['Path']}, my_metadata)[1])
+    
+    elif titles:
+        with ProcessPoolExecutor(max_workers=workers, initializer=start_worker, initargs=(profiling_state(),)) as pool:
+            score_hashes(dictionary, titles, pool.map)
+            originals = plan_duplicates(dictionary, titles)
+            
+            # The variants to analyze, as (title, variant name).  The rest reuse an analysis.
+            variants = [(next_entry, next_variant) for next_entry in titles for next_variant in plan_family(dictionary, next_entry)]
+            
+            # Hand each worker a title (or variant) and a copy of its File Information.  map() returns the results in submission order.
+            jobs = originals + variants
+            file_info = [dictionary[next_job]['File Information'] for next_job in originals]
+            file_info += [{'Path': dictionary[next_entry]['Family'][next_variant]['Path']} for next_entry, next_variant in variants]
+            chunk = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+            
+            for next_job, sections, stats in pool.map(analyze_score_job, jobs, file_info, chunksize=chunk):
+                merge_stats(stats)
+                if isinstance(next_job, tuple):
+                    dictionary[next_job[0]]['Family'][next_job[1]].update(sections)
+                else:
+                    dictionary[next_job].update(sections)
+    
+    link_duplicates(dictionary, titles)
+    
+    for next_entry in titles:
+        finish_family(dictionary, next_entry)
+    
+    return dictionary
+#
+#-----------------------------------------------------------------------------------------------
+def score_dictionary(workers=BUILD_WORKERS, profile=False):
+    """
+    Take the score dictionary with only file information entries, iterate through it to create a full entry.
+    
+    Most of processing time is for generating the pretty print statement.
+    
+    workers:    see analyze_scores().
+    profile:    time every extractor and parse, and write the report to PROFILE_REPORTPATH.  Also on if SCORE_PROFILE is set
+                (see profiling.py).
+    
+    TODO:
+        1) Figure out a way of parsing the scores here rather than in the individual functions.
+    """
+    if profile:
+        enable_profiling()
+    
+    dictionary = score_file_info()
+    analyze_scores(dictionary, list(dictionary), workers=workers)
+    
+    if profiling_enabled():
+        write_profile_report(PROFILE_REPORTPATH)
         
-    pickle_it(dictionary, pickle_path=SCORE_DATAPATH, text_path=SCORE_LOGPATH)
+    pickle_shards(dictionary, text_path=SCORE_LOGPATH)
+    write_duplicate_report(dictionary)
+    refresh_score_index(dictionary)
+    refresh_melody_index(dictionary)
+    refresh_sqlite(dictionary)
+    refresh_mongo(dictionary)
     pprint(dictionary)
     return dictionary
 
@@ -82,7 +289,7 @@ def score_dictionary():
 #-----------------------------------------------------------------------------------------------
 if __name__ == '__main__':
     
-    score_dictionary()
+    score_dictionary(profile='--profile' in sys.argv[1:])
     
 
     
\ No newline at end of file